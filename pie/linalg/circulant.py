@@ -0,0 +1,160 @@
+r"""
+`Circulant matrices <https://en.wikipedia.org/wiki/Circulant_matrix>`_ on Wikipedia.
+
+A circulant matrix is diagonalised by the discrete Fourier transform, its eigenvalues being the transform of its first
+column. The products, the linear solves and the matrix functions are then computed in O(n log(n)) with the FFT.
+Likewise, a block circulant matrix is block diagonalised by the discrete Fourier transform over its blocks.
+"""
+
+import numpy as np
+import scipy.linalg
+import scipy.sparse
+
+from .phi import phi_functions
+from .sparse import to_dense
+
+
+class Circulant:
+    r"""
+    A real circulant matrix :math:`A`, stored by its eigenvalues
+
+    The vectors given to the methods may also be stacks of vectors of shape (m, n), processed at once.
+
+    :param array_like column: The first column of the matrix, of size n
+
+    :ivar numpy.ndarray eigenvalues: The eigenvalues of the matrix, in the order of the discrete Fourier transform
+    """
+
+    def __init__(self, column):
+        self.eigenvalues = np.fft.fft(column)
+
+    @classmethod
+    def from_matrix(cls, a):
+        """
+        :param a: A circulant matrix
+        :type a: array_like or scipy.sparse.spmatrix
+        :return: pie.linalg.circulant.Circulant
+        """
+        return cls(to_dense(scipy.sparse.csc_matrix(a)[:, 0]).ravel())
+
+    @property
+    def shape(self):
+        return len(self.eigenvalues), len(self.eigenvalues)
+
+    def dot(self, v):
+        """
+        :param array_like v:
+        :return: numpy.ndarray - :math:`Av`
+        """
+        return np.fft.ifft(self.eigenvalues * np.fft.fft(v)).real
+
+    def phi(self, h, w):
+        r"""
+        :param float h:
+        :param array_like w: The vectors :math:`w_k`, of shape (K + 1, n)
+        :return: numpy.ndarray - :math:`\sum_{k=0}^{K}h^k\varphi_k\left(hA\right)w_k`
+        """
+        w = np.asarray(w)
+        phi = phi_functions(h * self.eigenvalues, len(w) - 1)
+        scale = h ** np.arange(len(w))
+        return np.fft.ifft(np.sum(scale[:, None] * phi * np.fft.fft(w), axis=0)).real
+
+    def solve_shifted(self, gamma, v):
+        r"""
+        :param float gamma:
+        :param array_like v:
+        :return: numpy.ndarray - :math:`\left(I - \gamma A\right)^{-1}v`
+        """
+        return np.fft.ifft(np.fft.fft(v) / (1 - gamma * self.eigenvalues)).real
+
+    def spectral_radius(self):
+        """
+        :return: float - the spectral radius of the matrix
+        """
+        return np.max(abs(self.eigenvalues))
+
+
+class BlockCirculant:
+    r"""
+    A real block circulant matrix :math:`A` of n x n blocks of size p x p, whose block :math:`(i, j)` only depends on
+    :math:`(i - j) \bmod n`, stored by the discrete Fourier transform of its first block column
+
+    The FFT over the blocks reduces :math:`A` to n independent p x p matrices :math:`\hat{A}_k`, so that the products,
+    the linear solves and the matrix functions cost O(n p^3 + n p log(n)).
+    The vectors given to the methods may also be stacks of vectors of shape (m, n p), processed at once.
+
+    :param array_like blocks: The first block column of the matrix, of shape (n, p, p)
+
+    :ivar numpy.ndarray blocks: The matrices :math:`\hat{A}_k`, of shape (n, p, p)
+    """
+
+    def __init__(self, blocks):
+        self.blocks = np.fft.fft(blocks, axis=0)
+
+    @classmethod
+    def from_matrix(cls, a, p):
+        """
+        :param a: A block circulant matrix
+        :type a: array_like or scipy.sparse.spmatrix
+        :param int p: The size of the blocks
+        :return: pie.linalg.circulant.BlockCirculant
+        """
+        column = to_dense(scipy.sparse.csc_matrix(a)[:, :p])
+        return cls(column.reshape((-1, p, p)))
+
+    @property
+    def shape(self):
+        n, p = self.blocks.shape[:2]
+        return n * p, n * p
+
+    def _fft(self, v):
+        v = np.asarray(v)
+        return np.fft.fft(v.reshape(v.shape[:-1] + self.blocks.shape[:2]), axis=-2)
+
+    def _ifft(self, v_hat):
+        return np.fft.ifft(v_hat, axis=-2).real.reshape(v_hat.shape[:-2] + (-1,))
+
+    def dot(self, v):
+        """
+        :param array_like v:
+        :return: numpy.ndarray - :math:`Av`
+        """
+        return self._ifft(np.einsum('kij,...kj->...ki', self.blocks, self._fft(v)))
+
+    def phi(self, h, w):
+        r"""
+        Each :math:`\sum_{k=0}^{K}h^k\varphi_k\left(h\hat{A}_k\right)\hat{w}_k` is computed as the exponential of
+        an expanded matrix of size p + K, as in :func:`pie.linalg.phi.phi_action`
+
+        :param float h:
+        :param array_like w: The vectors :math:`w_k`, of shape (K + 1, n p)
+        :return: numpy.ndarray - :math:`\sum_{k=0}^{K}h^k\varphi_k\left(hA\right)w_k`
+        """
+        w_hat = self._fft(w)
+        k = len(w_hat) - 1
+        n, p = self.blocks.shape[:2]
+        expanded_matrix = np.zeros((n, p + k, p + k), dtype=complex)
+        expanded_matrix[:, :p, :p] = self.blocks
+        expanded_matrix[:, :p, p:] = w_hat[:0:-1].transpose((1, 2, 0))
+        expanded_vector = np.zeros((n, p + k), dtype=complex)
+        expanded_vector[:, :p] = w_hat[0]
+        if k > 0:
+            expanded_matrix[:, p:-1, p + 1:] = np.eye(k - 1)
+            expanded_vector[:, -1] = 1
+        result = np.einsum('kij,kj->ki', scipy.linalg.expm(h * expanded_matrix), expanded_vector)
+        return self._ifft(result[:, :p])
+
+    def solve_shifted(self, gamma, v):
+        r"""
+        :param float gamma:
+        :param array_like v:
+        :return: numpy.ndarray - :math:`\left(I - \gamma A\right)^{-1}v`
+        """
+        shifted = np.eye(self.blocks.shape[1]) - gamma * self.blocks
+        return self._ifft(np.linalg.solve(shifted, self._fft(v)[..., None])[..., 0])
+
+    def spectral_radius(self):
+        """
+        :return: float - the spectral radius of the matrix
+        """
+        return np.max(abs(np.linalg.eigvals(self.blocks)))
@@ -2,21 +2,62 @@ r"""
 The Krylov subspace approximation is detailed in
 `Analysis of some Krylov subspace approximations to the matrix exponential operator` from Y. Saad
 in `SIAM Journal on Numerical Analysis, Vol. 29, No. 1`.
+
+The adaptive time stepping follows `Roger B. Sidje - Expokit: a software package for computing matrix exponentials`
+in `ACM Transactions on Mathematical Software, Vol. 24, No. 1`.
 """
 
 import numpy as np
+import scipy.sparse
 from scipy.linalg import expm as expm_sp
 
 
-def expm_krylov(a, b, k, eps=1E-12):
+KRYLOV_MAX_DIM = 30
+"""Default maximal dimension of the Krylov subspaces of ``expm_krylov_adaptive``"""
+
+
+def _arnoldi_step(a, v, h, j, reorthogonalize):
+    """
+    Computes the basis vector ``v[j + 1]`` and the column ``h[:, j]`` of the Hessenberg matrix
+    with the modified Gram - Schmidt process
+
+    :param a:
+    :param numpy.ndarray v: The basis, of shape (k + 1, d), filled up to ``v[j]``
+    :param numpy.ndarray h: The Hessenberg matrix, of shape (k + 1, k), filled up to ``h[:, j - 1]``
+    :param int j:
+    :param bool reorthogonalize: If True, the orthogonalization is done twice
+    :return: float - ``h[j + 1, j]``, the norm of the new vector before its normalization
+    """
+    w = a.dot(v[j])
+    for i in range(j + 1):
+        h[i, j] = np.dot(w, v[i])
+        w = w - h[i, j] * v[i]
+    if reorthogonalize:
+        for i in range(j + 1):
+            correction = np.dot(w, v[i])
+            h[i, j] += correction
+            w = w - correction * v[i]
+    h[j + 1, j] = np.linalg.norm(w)
+    if h[j + 1, j] > 0:
+        v[j + 1] = w / h[j + 1, j]
+    return h[j + 1, j]
+
+
+def expm_krylov(a, b, k, eps=1E-12, reorthogonalize=False):
     r"""
     Compute :math:`e^{a}\cdot b` using the Krylov subspace of dimension ``k``
 
-    :param array_like a:
+    The basis and the projected Hessenberg matrix are built together by the Arnoldi iterations, so that the matrix is
+    only used through ``k`` products with vectors: it may be sparse or matrix-free.
+
+    :param a:
+    :type a: array_like or scipy.sparse.spmatrix or scipy.sparse.linalg.LinearOperator
     :param array_like b:
     :param int k:
     :param eps: If the norm of the new computed Krylov basis vector is lower than ``eps``, it is assumed to be null
     :type eps: float, optional
+    :param reorthogonalize: If True, the Gram - Schmidt orthogonalization is done twice
+    :type reorthogonalize: bool, optional
     :return: numpy.ndarray
     """
     try:
@@ -24,18 +65,120 @@ def expm_krylov(a, b, k, eps=1E-12):
     except TypeError:
         d = 1
     k = min(k, d)
+    if not hasattr(a, 'dot'):
+        a = np.asarray(a)
 
-    v_k = np.zeros((k, d))
+    v = np.zeros((k + 1, d))
+    h = np.zeros((k + 1, k))
     norm_0 = np.linalg.norm(b)
-    v_k[0] = b / norm_0
-    for i in range(1, k):
-        v_new = np.dot(a, v_k[i - 1])
-        for j in range(i):
-            v_new = v_new - np.dot(v_new, v_k[j]) * v_k[j]
-        norm = np.linalg.norm(v_new)
-        if norm < eps:
+    v[0] = b / norm_0
+    m = k
+    for j in range(k):
+        if _arnoldi_step(a, v, h, j, reorthogonalize) < eps:
+            m = j + 1
             break
-        v_k[i] = v_new / norm
+    return norm_0 * np.dot(v[:m].T, expm_sp(h[:m, :m])[:, 0])
+
+
+def _norm_inf(a):
+    """
+    The infinity norm of the matrix, or None if it is matrix-free
+
+    :param a:
+    :type a: numpy.ndarray or scipy.sparse.spmatrix or scipy.sparse.linalg.LinearOperator
+    :return: float or None
+    """
+    if scipy.sparse.issparse(a):
+        return abs(a).sum(axis=1).max()
+    if isinstance(a, np.ndarray):
+        return np.max(np.sum(abs(np.atleast_2d(a)), axis=1))
+    return None
+
+
+def _first_step(norm_a, tol, m):
+    r"""
+    The first sub-step of Expokit, :math:`\frac{1}{\left\|a\right\|}\left(\frac{\left((m + 1) / e\right)^{m + 1}
+    \sqrt{2\pi(m + 1)}tol}{4\left\|a\right\|}\right)^{1/m}`, computed with logarithms to avoid overflows
+
+    :param float norm_a: The norm of the matrix
+    :param float tol: The relative tolerance
+    :param int m: The maximal dimension of the Krylov subspaces
+    :return: float - The first sub-step, at most 1
+    """
+    if norm_a == 0:
+        return 1.
+    log_fact = (m + 1) * (np.log(m + 1) - 1) + np.log(2 * np.pi * (m + 1)) / 2
+    return min(1., np.exp((log_fact + np.log(tol / (4 * norm_a))) / m) / norm_a)
+
+
+def expm_krylov_adaptive(a, b, tol=1E-8, k_max=KRYLOV_MAX_DIM, eps=1E-12, reorthogonalize=False):
+    r"""
+    Compute :math:`e^{a}\cdot b` with Krylov subspaces of adaptive dimensions, and time stepping
+
+    The product is computed as :math:`e^{\tau_p a}\cdots e^{\tau_1 a}b`, with :math:`\sum_i\tau_i=1`.
+    For each sub-step, the Arnoldi iterations stop as soon as the a posteriori error estimate
+    :math:`\beta h_{m+1,m}\tau\left|e_m^T\varphi_1\left(\tau H_m\right)e_1\right|` is lower than
+    :math:`\tau` ``tol`` :math:`\left\|b\right\|`. Unlike :math:`\left(e^{\tau H_m}\right)_{m,1}`, this estimate
+    does not underflow for stiff matrices: it is the last row of the exponential of the augmented Hessenberg matrix
+    :math:`\begin{pmatrix}\tau H_m & 0\\ \tau h_{m+1,m}e_m^T & 0\end{pmatrix}`, whose upper left block gives the
+    sub-step.
+    If it is still too large with a subspace of dimension ``k_max``, the sub-step :math:`\tau` is reduced and the
+    Arnoldi iterations restart from the result of the sub-step.
+    The first sub-step is chosen from the norm of ``a`` as in Expokit, the norm of a matrix-free ``a`` being estimated
+    with the first column of the Hessenberg matrix.
+
+    :param a:
+    :type a: array_like or scipy.sparse.spmatrix or scipy.sparse.linalg.LinearOperator
+    :param array_like b:
+    :param tol: The relative tolerance
+    :type tol: float, optional
+    :param k_max: The maximal dimension of the Krylov subspaces
+    :type k_max: int, optional
+    :param eps: If the norm of the new computed Krylov basis vector is lower than ``eps``, it is assumed to be null:
+     the subspace is then invariant and the sub-step is exact
+    :type eps: float, optional
+    :param reorthogonalize: If True, the Gram - Schmidt orthogonalization is done twice
+    :type reorthogonalize: bool, optional
+    :return: numpy.ndarray
+    """
+    b = np.atleast_1d(np.array(b, dtype=float))
+    d = len(b)
+    k_max = min(k_max, d)
+    if not hasattr(a, 'dot'):
+        a = np.asarray(a)
 
-    h_k = np.dot(v_k, np.dot(a, v_k.T))
-    return norm_0 * np.dot(v_k.T, expm_sp(h_k)[:, 0])
+    result = b
+    norm_b = np.linalg.norm(b)
+    if norm_b == 0:
+        return result
+    norm_a = _norm_inf(a)
+    tau = None if norm_a is None else _first_step(norm_a, tol, k_max)
+    v = np.zeros((k_max + 1, d))
+    h = np.zeros((k_max + 1, k_max + 1))
+    s = 0.
+    while s < 1:
+        beta = np.linalg.norm(result)
+        v[0] = result / beta
+        h[:] = 0
+        for j in range(k_max):
+            h_next = _arnoldi_step(a, v, h, j, reorthogonalize)
+            m = j + 1
+            if tau is None:
+                tau = _first_step(np.sum(abs(h[:2, 0])), tol, k_max)
+            tau = min(tau, 1 - s)
+            if h_next < eps:
+                tau = 1 - s
+                exp_h = expm_sp(tau * h[:m, :m])
+                break
+            # The column m of h is still null: h[:m + 1, :m + 1] is the augmented Hessenberg matrix
+            exp_h = expm_sp(tau * h[:m + 1, :m + 1])
+            if beta * abs(exp_h[m, 0]) <= tol * tau * norm_b:
+                break
+        else:
+            while beta * abs(exp_h[m, 0]) > tol * tau * norm_b:
+                tau /= 2
+                exp_h = expm_sp(tau * h[:m + 1, :m + 1])
+        result = beta * np.dot(v[:m].T, exp_h[:m, 0])
+        s = 1. if 1 - s - tau < 1E-12 else s + tau
+        tau *= 2
+    return result
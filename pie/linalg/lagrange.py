@@ -40,18 +40,63 @@ def d_lagrange(x, interpolation_points, i):
     return val / np.prod(interpolation_points[i] - foo)
 
 
-def lagrange_extrapolation_matrix(x, x_new):
+def barycentric_weights(x):
+    r"""
+    Returns the barycentric weights of the points ``x``,
+    :math:`w_j = \frac{1}{\prod_{k \neq j}\left(x_j - x_k\right)}` up to a constant factor
+
+    The differences are rescaled by the length of the interval and the weights are normalised,
+    to avoid overflows and underflows for a large number of points.
+
+    :param array_like x:
+    :return: numpy.ndarray
     """
+    x = np.asarray(x, dtype=float)
+    diff = (x[:, None] - x[None, :]) * (4 / (np.max(x) - np.min(x)) if len(x) > 1 else 1)
+    np.fill_diagonal(diff, 1)
+    w = 1 / np.prod(diff, axis=1)
+    return w / np.max(abs(w))
+
+
+def lagrange_extrapolation_matrix(x, x_new):
+    r"""
     Returns the change of basis matrix from the Lagrange interpolation polynomial on the points ``x``
     to the Lagrange interpolation polynomial on the points ``x_new``
 
+    Uses the barycentric formula :math:`L_j\left(\xi\right) = \frac{w_j}{\xi - x_j} / \sum_k\frac{w_k}{\xi - x_k}`,
+    which is numerically stable.
+
     :param array_like x:
     :param array_like x_new:
-    :return: numpy.ndarray
+    :return: numpy.ndarray - the matrix :math:`\left(L_j\left(x\_new_i\right)\right)_{ij}`
+    """
+    x = np.asarray(x, dtype=float)
+    x_new = np.asarray(x_new, dtype=float)
+    diff = x_new[:, None] - x[None, :]
+    exact = diff == 0
+    diff[exact] = 1
+    foo = barycentric_weights(x) / diff
+    foo /= np.sum(foo, axis=1)[:, None]
+    on_node = np.any(exact, axis=1)
+    foo[on_node] = exact[on_node]
+    return foo
+
+
+def lagrange_derivative_matrix(x):
+    r"""
+    Returns the differentiation matrix of the Lagrange interpolation polynomial on the points ``x``
+
+    With :math:`w` the barycentric weights,
+    :math:`D_{ij} = \frac{w_j / w_i}{x_i - x_j}` if :math:`i \neq j` and :math:`D_{ii} = -\sum_{j \neq i}D_{ij}`.
+
+    :param array_like x:
+    :return: numpy.ndarray - the matrix :math:`\left(\frac{\mathrm{d}L_j}{\mathrm{d}x}\left(x_i\right)\right)_{ij}`
     """
-    a, b = len(x), len(x_new)
-    foo = np.zeros((b, a))
-    for i in range(a):
-        for j in range(b):
-            foo[j, i] = eval_lagrange(x_new[j], x, i)
+    x = np.asarray(x, dtype=float)
+    w = barycentric_weights(x)
+    diff = x[:, None] - x[None, :]
+    np.fill_diagonal(diff, 1)
+    foo = w[None, :] / w[:, None] / diff
+    np.fill_diagonal(foo, 0)
+    np.fill_diagonal(foo, -np.sum(foo, axis=1))
     return foo
@@ -0,0 +1,231 @@
+r"""
+The :math:`\varphi` functions used by the exponential integrators:
+
+.. math::
+   \varphi_0\left(z\right) = e^z, \quad
+   \varphi_{k+1}\left(z\right) = \frac{\varphi_k\left(z\right) - \frac{1}{k!}}{z}
+   = \sum_{j=0}^{\infty}\frac{z^j}{\left(j + k + 1\right)!}
+
+so that the solution of :math:`\dot{y} = Jy + \sum_{k=1}^{K}\frac{t^{k-1}}{\left(k-1\right)!}w_k`,
+:math:`y\left(0\right) = w_0` is :math:`y\left(h\right) = \sum_{k=0}^{K}h^k\varphi_k\left(hJ\right)w_k`.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import scipy.sparse.linalg
+from scipy.linalg import expm as expm_sp
+
+from .krylov import KRYLOV_MAX_DIM, expm_krylov, expm_krylov_adaptive
+from .sparse import to_dense
+
+TAYLOR_RADIUS = 1
+"""Below this modulus, the functions are evaluated with their Taylor series rather than with the recurrence"""
+
+TAYLOR_TERMS = 25
+"""The number of terms of the Taylor series, enough for a machine precision result below ``TAYLOR_RADIUS``"""
+
+PHI_CACHE_SIZE = 4
+"""The number of step sizes whose matrices are kept by a ``PhiCache``"""
+
+
+def phi_functions(z, k):
+    r"""
+    Evaluates the :math:`\varphi` functions elementwise
+
+    :param array_like z: Real or complex values
+    :param int k: The highest :math:`\varphi` function index
+    :return: numpy.ndarray - :math:`\left(\varphi_0\left(z\right), \dots, \varphi_k\left(z\right)\right)`,
+     of shape (k + 1,) + z.shape
+    """
+    z = np.asarray(z)
+    phi = np.zeros((k + 1,) + z.shape, dtype=np.result_type(z, float))
+    phi[0] = np.exp(z)
+    small = abs(z) < TAYLOR_RADIUS
+    z_large = np.where(small, 1, z)
+    z_small = np.where(small, z, 0)
+    factorial = 1.
+    for i in range(1, k + 1):
+        factorial *= i
+        phi[i] = (phi[i - 1] - i / factorial) / z_large
+
+        # Horner evaluation of sum_j z^j / (j + i)!
+        series = np.zeros(z.shape, dtype=phi.dtype)
+        for j in range(TAYLOR_TERMS - 1, -1, -1):
+            series = series * z_small / (j + i + 1) + 1
+        phi[i] = np.where(small, series / factorial, phi[i])
+    return phi
+
+
+def phi_matrices(a, h, k):
+    r"""
+    Computes the dense matrices :math:`\varphi_0\left(ha\right), \dots, \varphi_k\left(ha\right)`
+    as the first block row of the exponential of the block matrix of size d (k + 1)
+
+    .. math::
+       \begin{pmatrix} ha & I & & \\ & 0 & \ddots & \\ & & \ddots & I \\ & & & 0 \end{pmatrix}
+
+    :param a: The matrix, of shape (d, d)
+    :type a: array_like or scipy.sparse.spmatrix or scipy.sparse.linalg.LinearOperator
+    :param float h:
+    :param int k: The highest :math:`\varphi` function index
+    :return: numpy.ndarray - of shape (k + 1, d, d)
+    """
+    a = to_dense(a)
+    d = a.shape[0]
+    block_matrix = np.zeros((d * (k + 1), d * (k + 1)))
+    block_matrix[:d, :d] = h * a
+    block_matrix[:-d, d:] = np.eye(d * k)
+    return expm_sp(block_matrix)[:d].reshape((d, k + 1, d)).transpose((1, 0, 2))
+
+
+class PhiCache(object):
+    r"""
+    Computes :math:`\sum_{k=0}^{K}h^k\varphi_k\left(ha\right)w_k` for a constant matrix ``a``, keeping the matrices
+    of :func:`phi_matrices` for the last used step sizes, so that a step with a known step size only costs K + 1
+    matrix - vector products.
+
+    As the matrices cost about :math:`(K + 1)^3` times the :func:`phi_action` of a single step, they are only computed
+    once a step size repeats: the first step with a new step size uses :func:`phi_action`.
+
+    :param a: The matrix, of shape (d, d)
+    :type a: array_like or scipy.sparse.spmatrix or scipy.sparse.linalg.LinearOperator
+    :param int k: The number K of vectors :math:`w_k`, minus one
+    :param max_size: The number of step sizes kept, the least recently used being dropped first
+    :type max_size: int, optional
+    :param rtol: Step sizes closer than this relative tolerance share their matrices,
+     so that the rounding errors of a uniform time grid still hit the cache
+    :type rtol: float, optional
+    """
+
+    def __init__(self, a, k, max_size=PHI_CACHE_SIZE, rtol=1E-12):
+        self.a = to_dense(a)
+        self.k = k
+        self.max_size = max_size
+        self.rtol = rtol
+        self._cache = OrderedDict()
+        self._seen = OrderedDict()
+
+    def _find(self, step_sizes, h):
+        """
+
+        :param collections.OrderedDict step_sizes:
+        :param float h:
+        :return: float or None - the step size of ``step_sizes`` within the tolerance of ``h``, if any
+        """
+        for key in step_sizes:
+            if abs(key - h) <= self.rtol * abs(h):
+                step_sizes.move_to_end(key)
+                return key
+        return None
+
+    def matrices(self, h):
+        """
+
+        :param float h:
+        :return: numpy.ndarray - the matrices :math:`\varphi_k\left(ha\right)`, of shape (K + 1, d, d)
+        """
+        key = self._find(self._cache, h)
+        if key is not None:
+            return self._cache[key]
+        self._cache[h] = phi_matrices(self.a, h, self.k)
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+        return self._cache[h]
+
+    def state(self):
+        """
+
+        :return: (list, list) - the step sizes with cached matrices and those only used once,
+         from the least recently used ones
+        """
+        return list(self._cache), list(self._seen)
+
+    def restore(self, state):
+        """
+        Builds the cache again, from the step sizes given by ``state``
+
+        :param (list, list) state:
+        """
+        cached, seen = state
+        self._cache = OrderedDict((h, phi_matrices(self.a, h, self.k)) for h in cached)
+        self._seen = OrderedDict((h, None) for h in seen)
+
+    def __call__(self, h, w):
+        """
+
+        :param float h:
+        :param array_like w: The vectors :math:`w_k`, of shape (K + 1, d)
+        :return: numpy.ndarray - of shape (d,)
+        """
+        if self._find(self._cache, h) is None:
+            key = self._find(self._seen, h)
+            if key is None:
+                self._seen[h] = None
+                if len(self._seen) > self.max_size:
+                    self._seen.popitem(last=False)
+                return phi_action(self.a, h, w)
+            del self._seen[key]
+        phi = self.matrices(h)
+        return sum(h ** i * np.dot(phi[i], w[i]) for i in range(self.k + 1))
+
+
+def expanded_operator(a, w):
+    r"""
+    The expanded matrix of :func:`phi_action` as a matrix-free operator, never forming the d x d matrix ``a``
+
+    :param a: The matrix, of shape (d, d), only used through its products ``a.dot(v)``
+    :type a: array_like or scipy.sparse.spmatrix or scipy.sparse.linalg.LinearOperator
+    :param numpy.ndarray w: The vectors :math:`w_k`, of shape (K + 1, d)
+    :return: scipy.sparse.linalg.LinearOperator - of shape (d + K, d + K)
+    """
+    k, d = len(w) - 1, w.shape[1]
+
+    def matvec(x):
+        x = np.ravel(x)
+        result = np.zeros((d + k,))
+        result[:d] = a.dot(x[:d]) + np.dot(x[d:], w[:0:-1])
+        result[d:-1] = x[d + 1:]
+        return result
+
+    return scipy.sparse.linalg.LinearOperator((d + k, d + k), matvec=matvec, dtype=float)
+
+
+def phi_action(a, h, w, krylov_subspace_dim=None, krylov_tol=None):
+    r"""
+    Computes :math:`\sum_{k=0}^{K}h^k\varphi_k\left(ha\right)w_k` as the exponential of an expanded matrix
+    of size d + K, see
+    `Antti Koskela, Alexander Ostermann - Exponential Taylor methods: Analysis and implementation`
+
+    With ``krylov_subspace_dim`` or ``krylov_tol``, the expanded matrix is a matrix-free operator
+    (see :func:`expanded_operator`), so that ``a`` is only used through its products with vectors.
+
+    :param a: The matrix, of shape (d, d)
+    :type a: array_like or scipy.sparse.spmatrix or scipy.sparse.linalg.LinearOperator
+    :param float h:
+    :param array_like w: The vectors :math:`w_k`, of shape (K + 1, d)
+    :param krylov_subspace_dim: If given, uses the Krylov subspace approximation method of this dimension
+     or, with ``krylov_tol``, the maximal dimension of the adaptive Krylov subspaces
+    :type krylov_subspace_dim: None or int, optional
+    :param krylov_tol: If given, uses the adaptive Krylov subspace approximation method with this relative tolerance
+    :type krylov_tol: None or float, optional
+    :return: numpy.ndarray - of shape (d,)
+    """
+    w = np.asarray(w)
+    k, d = len(w) - 1, w.shape[1]
+    expanded_vector = np.zeros((d + k,))
+    expanded_vector[:d] = w[0]
+    if k > 0:
+        expanded_vector[-1] = 1
+    if krylov_tol is not None:
+        k_max = KRYLOV_MAX_DIM if krylov_subspace_dim is None else krylov_subspace_dim
+        return expm_krylov_adaptive(h * expanded_operator(a, w), expanded_vector, krylov_tol, k_max)[:d]
+    if krylov_subspace_dim is not None:
+        return expm_krylov(h * expanded_operator(a, w), expanded_vector, krylov_subspace_dim)[:d]
+
+    expanded_matrix = np.zeros((d + k, d + k))
+    expanded_matrix[:d, :d] = to_dense(a)
+    expanded_matrix[:d, d:] = w[:0:-1].T
+    if k > 0:
+        expanded_matrix[d:-1, d + 1:] = np.eye(k - 1)
+    return np.dot(expm_sp(h * expanded_matrix), expanded_vector)[:d]
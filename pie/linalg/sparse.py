@@ -0,0 +1,66 @@
+r"""
+Helpers used to handle indifferently dense arrays,
+`scipy sparse matrices <https://docs.scipy.org/doc/scipy/reference/sparse.html>`_
+and matrix-free ``scipy.sparse.linalg.LinearOperator``.
+"""
+
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+
+
+def to_dense(a):
+    """
+    Returns ``a`` as a dense array. A ``LinearOperator`` is applied to the identity matrix
+
+    :param a:
+    :type a: array_like or scipy.sparse.spmatrix or scipy.sparse.linalg.LinearOperator
+    :return: numpy.ndarray
+    """
+    if scipy.sparse.issparse(a):
+        return a.toarray()
+    if isinstance(a, scipy.sparse.linalg.LinearOperator):
+        return a.matmat(np.eye(a.shape[1]))
+    return np.asarray(a)
+
+
+def matvec(a, y):
+    """
+    Returns the product of the matrix ``a`` with ``y``, which is either a single vector of shape (d,)
+    or a stack of m vectors of shape (m, d). In the latter case, all the products are done at once.
+
+    :param a: A matrix of shape (d, d)
+    :type a: array_like or scipy.sparse.spmatrix or scipy.sparse.linalg.LinearOperator
+    :param array_like y:
+    :return: numpy.ndarray - the product(s), with the shape of ``y``
+    """
+    return a.dot(np.transpose(y)).T
+
+
+def periodic_stencil(coefficients, offsets):
+    r"""
+    Assemble the sparse periodic matrix :math:`A` of shape (n, n) such that
+    :math:`A_{i, (i + o_k) \bmod n} = c_k\left[i\right]`, with :math:`c` the coefficients and :math:`o` the offsets
+
+    :param array_like coefficients: The stencil coefficients, of shape (s, n)
+    :param array_like offsets: The stencil offsets, of shape (s,)
+    :return: scipy.sparse.csr_matrix
+    """
+    coefficients = np.asarray(coefficients, dtype=float)
+    n = coefficients.shape[1]
+    rows = np.tile(np.arange(n), len(offsets))
+    cols = ((np.arange(n)[None, :] + np.asarray(offsets)[:, None]) % n).ravel()
+    return scipy.sparse.csr_matrix((coefficients.ravel(), (rows, cols)), shape=(n, n))
+
+
+def shifted_solver(a, gamma):
+    r"""
+    Factorizes :math:`I - \gamma A` with a sparse LU decomposition
+
+    :param a: A matrix of shape (d, d)
+    :type a: array_like or scipy.sparse.spmatrix
+    :param float gamma:
+    :return: func - the solver :math:`v \mapsto \left(I - \gamma A\right)^{-1}v`
+    """
+    shifted = scipy.sparse.identity(a.shape[0], format='csc') - gamma * scipy.sparse.csc_matrix(a)
+    return scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(shifted)).solve
@@ -4,3 +4,4 @@ Miscellaneous
 from . import counter
 from . import initial_condition
 from . import ode_problem
+from . import store
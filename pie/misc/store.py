@@ -0,0 +1,145 @@
+r"""
+Chunked on-disk store of a solution, for the trajectories larger than the memory.
+
+A store is a directory holding the metadata in a json file, and the solution in ``.npy`` chunks of ``chunk_size``
+time steps. It is written time step by time step with a ``SolutionWriter``, each chunk being flushed on disk as soon
+as it is full, and read lazily with a ``SolutionStore``, which only loads the chunk of the requested time step.
+
+Example:
+   >>> with SolutionWriter('run', method='rk_4', dt=dt) as writer:
+   ...     pie.temporal.stream.solve_into(writer, pie.temporal.rk_4, y0, t, f, save_every=100)
+   >>> store = SolutionStore('run')
+   >>> store.metadata['method'], store.t[-1], store[-1]  # Only the last chunk is loaded
+   >>>
+"""
+
+import json
+import os
+
+import numpy as np
+
+STORE_CHUNK_SIZE = 100
+"""The default number of time steps in a chunk"""
+
+_METADATA_FILE = 'metadata.json'
+
+_CHUNK_FILE = '{0}_{1:06d}.npy'
+"""The name of a chunk file, formatted with 't' or 'y' and the index of the chunk"""
+
+
+def _to_json(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class SolutionWriter:
+    """
+    Writes a solution time step by time step in a chunked store
+
+    :param str path: The store directory, created if needed
+    :param chunk_size: The number of time steps in a chunk
+    :type chunk_size: int, optional
+    :param metadata: The metadata of the solution, such as the temporal method name, the time step, the mesh, ``p``,
+     the convection and diffusion parameters or the CFL. Numpy arrays are stored as lists
+    """
+
+    def __init__(self, path, chunk_size=STORE_CHUNK_SIZE, **metadata):
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.metadata = dict((key, _to_json(value)) for key, value in metadata.items())
+        self.n = 0
+        self._n_chunks = 0
+        self._t = []
+        self._y = []
+        self._write_metadata()
+
+    def _write_metadata(self):
+        with open(os.path.join(self.path, _METADATA_FILE), 'w') as file:
+            json.dump({'chunk_size': self.chunk_size, 'n': self.n, 'metadata': self.metadata}, file, indent=2)
+
+    def write(self, t_i, y_i):
+        """
+        Appends a time step, flushing the chunk if it is full
+
+        :param float t_i:
+        :param array_like y_i:
+        """
+        self._t.append(t_i)
+        self._y.append(np.array(y_i, dtype=float))
+        if len(self._t) == self.chunk_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._t:
+            return
+        np.save(os.path.join(self.path, _CHUNK_FILE.format('t', self._n_chunks)), np.array(self._t))
+        np.save(os.path.join(self.path, _CHUNK_FILE.format('y', self._n_chunks)), np.array(self._y))
+        self.n += len(self._t)
+        self._n_chunks += 1
+        self._t, self._y = [], []
+        self._write_metadata()
+
+    def close(self):
+        """
+        Writes the last time steps on disk, as a last partial chunk
+        """
+        self._flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class SolutionStore:
+    """
+    Reads lazily a chunked store: ``store[i]`` only loads, as a read-only memory map, the chunk holding the time step
+    ``i``, so that it can be given to ``pie.plot.Animation`` as a solution
+
+    :param str path: The store directory
+
+    :ivar dict metadata: The metadata of the solution
+    :ivar int chunk_size: The number of time steps in a chunk
+    :ivar int n: The number of time steps
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, _METADATA_FILE)) as file:
+            content = json.load(file)
+        self.metadata = content['metadata']
+        self.chunk_size = content['chunk_size']
+        self.n = content['n']
+        self._t = None
+        self._chunk_index, self._chunk = None, None
+
+    @property
+    def t(self):
+        """
+        numpy.ndarray - The times, of size n
+        """
+        if self._t is None:
+            n_chunks = -(-self.n // self.chunk_size)
+            self._t = np.concatenate([np.load(os.path.join(self.path, _CHUNK_FILE.format('t', k)))
+                                      for k in range(n_chunks)] + [np.zeros((0,))])
+        return self._t
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError('Time step {0} out of a store of {1} time steps'.format(i, self.n))
+        chunk_index = i // self.chunk_size
+        if chunk_index != self._chunk_index:
+            self._chunk = np.load(os.path.join(self.path, _CHUNK_FILE.format('y', chunk_index)), mmap_mode='r')
+            self._chunk_index = chunk_index
+        return self._chunk[i % self.chunk_size]
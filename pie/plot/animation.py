@@ -1,5 +1,7 @@
 import matplotlib.pyplot as plt
 
+from ..misc.store import SolutionStore
+
 if plt.get_backend() != 'TkAgg':
     plt.switch_backend('TkAgg')
 
@@ -19,7 +21,8 @@ class Animation:
 
     :param array_like t:
     :param array_like x:
-    :param array_like list_y:
+    :param array_like list_y: The solutions, each of shape (n, d), or the path of a ``pie.misc.store`` chunked store,
+     then read lazily frame by frame
     :param list_label:
     :type list_label: array_like, optional
     :param list_fmt:
@@ -53,7 +56,7 @@ class Animation:
                  repeat=True, speed=1):
         self.t = t
         self.x = x
-        self.list_y = list_y
+        self.list_y = [SolutionStore(y) if isinstance(y, str) else y for y in list_y]
         self.list_line = len(list_y) * [None]
         self.repeat = repeat
         self.speed = speed
@@ -81,7 +84,8 @@ class Animation:
             list_lw = len(list_y) * [1]
 
         for i in range(len(self.list_y)):
-            self.list_line[i], = self.ax.plot(self.x, list_y[i][0], list_fmt[i], lw=list_lw[i], label=list_label[i])
+            self.list_line[i], = self.ax.plot(self.x, self.list_y[i][0], list_fmt[i], lw=list_lw[i],
+                                              label=list_label[i])
 
         self.ax.legend(loc='upper right', ncol=2, fontsize='x-large')
         self.fig.suptitle(title, fontsize='xx-large')
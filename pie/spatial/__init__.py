@@ -7,9 +7,11 @@ This package implement a 1D convection - diffusion scheme, and therefore:
 :math:`RHS\left(y, t\right) = -c\frac{\partial y}{\partial x} + d\frac{\partial^2y}{\partial x^2}`
 
 Inside a cell of the mesh, the points are placed at the
-`Chebyshev nodes <https://en.wikipedia.org/wiki/Chebyshev_nodes>`_.
+`Chebyshev nodes <https://en.wikipedia.org/wiki/Chebyshev_nodes>`_,
+except for the Fourier pseudo-spectral methods which use evenly spaced points.
 """
 
 from . import burgers
 from .fd import FiniteDifferenceMethod
+from .fourier import FourierMethod
 from .sd import SpectralDifferenceMethod
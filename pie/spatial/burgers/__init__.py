@@ -5,3 +5,4 @@ This subpackage implements a 1D viscous Burger's equation scheme:
 
 from .fd_burg import FiniteDifferenceMethodBurgers
 from .sd_burg import SpectralDifferenceMethodBurgers
+from .fourier_burg import FourierMethodBurgers
@@ -1,5 +1,7 @@
 import numpy as np
+import scipy.sparse
 
+from ...linalg.sparse import matvec, periodic_stencil, shifted_solver
 from ..method import _SpatialMethod
 
 
@@ -7,22 +9,30 @@ class FiniteDifferenceMethodBurgers(_SpatialMethod):
     r"""
     1D scheme for viscous Burgers' equation with a periodic boundary condition.
 
-    :ivar array_like _j1: The constant jacobian for left convection
-    :ivar array_like _j2: The constant jacobian for right convection
-    :ivar array_like _jac_diff: The constant jacobian for the diffusion part
+    The convection uses, in each point, the upwind derivative given by ``j1`` or ``j2``.
+    All the three points stencils are stored as sparse matrices.
+
+    :ivar scipy.sparse.csr_matrix j1: The constant jacobian for left convection
+    :ivar scipy.sparse.csr_matrix j2: The constant jacobian for right convection
+    :ivar scipy.sparse.csr_matrix _jac_diff: The constant jacobian for the diffusion part
     """
 
+    _OPERATORS = ('j1', 'j2', '_jac_diff')
+
     def __init__(self, mesh, p, diff):
         super(FiniteDifferenceMethodBurgers, self).__init__(mesh, p, 0, diff)
+        self._load_or_assemble()
 
+    def _assemble(self):
         x = np.append(self.x, self.mesh[-1] + self.x[0] - self.mesh[0])
         dx1 = np.roll((x - np.roll(x, 1))[1:], 1)
         dx2 = (np.roll(x, -1) - x)[:-1]
-        self.j1 = np.diagflat(1 / dx1) - np.diagflat(1 / dx1[1:], -1)
-        self.j1[0, -1] = -1 / dx1[0]
-        self.j2 = np.diagflat(1 / dx2[:-1], 1) - np.diagflat(1 / dx2)
-        self.j2[-1, 0] = 1 / dx2[-1]
-        self._jac_diff = self.d * 2 * (self.j2 - self.j1) / (dx1[:, None] + dx2[:, None])
+        zero = np.zeros(self.n_pts)
+        j1 = np.array([-1 / dx1, 1 / dx1, zero])
+        j2 = np.array([zero, -1 / dx2, 1 / dx2])
+        self.j1 = periodic_stencil(j1, (-1, 0, 1))
+        self.j2 = periodic_stencil(j2, (-1, 0, 1))
+        self._jac_diff = periodic_stencil(self.d * 2 * (j2 - j1) / (dx1 + dx2), (-1, 0, 1))
 
     def rhs(self, y, t):
         """
@@ -52,22 +62,74 @@ class FiniteDifferenceMethodBurgers(_SpatialMethod):
             rhs[-1] += -y[-1] * a
         rhs[-1] += self.d * 2 * (a - b) / (self.mesh[-1] + self.x[0] - self.x[-2])
         """
-        j = self.j1 * (y > 0)[:, None] + self.j2 * (y < 0)[:, None]
-        return np.dot(self._jac_diff, y) - y * np.dot(j, y)
+        return self.rhs_stiff(y, t) + self.rhs_nonstiff(y, t)
+
+    def rhs_stiff(self, y, t):
+        """
+        The diffusion part of the right hand side
+        """
+        return matvec(self._jac_diff, y)
+
+    def rhs_nonstiff(self, y, t):
+        """
+        The upwind convection part of the right hand side
+        """
+        return -y * self._upwind_dot(y, y)
 
     def jac(self, y, t):
-        j = self.j1 * (y > 0)[:, None] + self.j2 * (y < 0)[:, None]
-        return self._jac_diff - (y[:, None] * j + np.diagflat(np.dot(j, y)))
+        j = self._upwind(y)
+        return self._jac_diff - (scipy.sparse.diags(y).dot(j) + scipy.sparse.diags(j.dot(y)))
+
+    def jvp(self, y, t, v):
+        return matvec(self._jac_diff, v) - (y * self._upwind_dot(y, v) + v * self._upwind_dot(y, y))
+
+    def preconditioner(self, gamma):
+        """
+        The solver of the diffusion part of the jacobian, see ``stiff_solver``
+
+        :param float gamma:
+        :return: func - :math:`v \\mapsto \\left(I - \\gamma J_{diff}\\right)^{-1}v`
+        """
+        return self.stiff_solver(gamma)
+
+    def stiff_solver(self, gamma):
+        """
+        The solver of the diffusion part of the jacobian, factorized with a sparse LU decomposition
+
+        :param float gamma:
+        :return: func - :math:`v \\mapsto \\left(I - \\gamma J_{diff}\\right)^{-1}v`
+        """
+        return shifted_solver(self._jac_diff, gamma)
 
     def hess(self, y, t):
-        # TODO: check this
-        j = self.j1 * (y > 0)[:, None] + self.j2 * (y < 0)[:, None]
+        j = self._upwind(y).toarray()
         hess = np.zeros((self.n_pts, self.n_pts, self.n_pts))
-        for k in range(self.n_pts):
-            for l in range(self.n_pts):
-                for m in range(self.n_pts):
-                    hess[k, l, m] = -j[k, l]
+        diag = np.arange(self.n_pts)
+        hess[diag, diag, :] -= j
+        hess[diag, :, diag] -= j
         return hess
 
+    def hess_vec(self, y, t, u, v):
+        return -(u * self._upwind_dot(y, v) + v * self._upwind_dot(y, u))
+
+    def _upwind(self, y):
+        """
+
+        :param array_like y:
+        :return: scipy.sparse.csr_matrix - the upwind derivative matrix, taking the rows of ``j1`` where ``y > 0``
+         and the rows of ``j2`` where ``y < 0``
+        """
+        return scipy.sparse.diags((y > 0).astype(float)).dot(self.j1) \
+            + scipy.sparse.diags((y < 0).astype(float)).dot(self.j2)
+
+    def _upwind_dot(self, y, u):
+        """
+
+        :param array_like y: A state of shape (n_pts,), or a stack of m states of shape (m, n_pts)
+        :param array_like u: The vector(s) to multiply, with the shape of ``y``
+        :return: numpy.ndarray - ``_upwind(y)`` @ ``u``, computed without forming the upwind matrix
+        """
+        return np.where(y > 0, matvec(self.j1, u), np.where(y < 0, matvec(self.j2, u), 0))
+
     def __repr__(self):
         return "Finite difference for Burgers' equation " + super(FiniteDifferenceMethodBurgers, self).__repr__()
@@ -0,0 +1,94 @@
+import numpy as np
+import scipy.sparse.linalg
+
+from ..fourier import _FourierSpatialMethod
+
+
+class FourierMethodBurgers(_FourierSpatialMethod):
+    r"""
+    Pseudo-spectral Fourier scheme for viscous Burgers' equation with a periodic boundary condition.
+
+    The right hand side is computed in O(n_pts log(n_pts)) with the real FFT, and the jacobian is a matrix-free
+    ``scipy.sparse.linalg.LinearOperator``.
+    The quadratic term is dealiased with the 2/3 rule: the modes above 2/3 of the highest wave number are removed from
+    the states before their product, and from the product.
+
+    :ivar numpy.ndarray dealias: The mask of the kept modes of the real FFT
+    """
+
+    def __init__(self, mesh, p, diff):
+        super(FourierMethodBurgers, self).__init__(mesh, p, 0, diff)
+        self.dealias = np.arange(self.n_pts // 2 + 1) < self.n_pts / 3
+
+    def _filter(self, y):
+        """
+
+        :param array_like y: A state of shape (n_pts,), or a stack of m states of shape (m, n_pts)
+        :return: numpy.ndarray - the state(s) without the aliased modes
+        """
+        return np.fft.irfft(self.dealias * np.fft.rfft(y), self.n_pts)
+
+    def _product_derivative(self, u, v):
+        """
+
+        :param array_like u: Filtered state(s)
+        :param array_like v: Filtered state(s), with the shape of ``u``
+        :return: numpy.ndarray - the dealiased derivative of ``u * v``
+        """
+        return self._derivative(self.dealias * np.fft.rfft(u * v))
+
+    def rhs(self, y, t):
+        return self.rhs_nonstiff(y, t) + self.rhs_stiff(y, t)
+
+    def rhs_stiff(self, y, t):
+        """
+        The diffusion part of the right hand side
+        """
+        return self.d * self._second_derivative(np.fft.rfft(y))
+
+    def rhs_nonstiff(self, y, t):
+        """
+        The dealiased convection part of the right hand side
+        """
+        y_filtered = self._filter(y)
+        return -self._product_derivative(y_filtered, y_filtered) / 2
+
+    def jac(self, y, t):
+        return scipy.sparse.linalg.LinearOperator((self.n_pts, self.n_pts),
+                                                  matvec=lambda v: self.jvp(y, t, np.ravel(v)),
+                                                  matmat=lambda v: self.jvp(y, t, v.T).T, dtype=float)
+
+    def jvp(self, y, t, v):
+        return -self._product_derivative(self._filter(y), self._filter(v)) \
+            + self.d * self._second_derivative(np.fft.rfft(v))
+
+    def preconditioner(self, gamma):
+        """
+        The exact solver of the diffusion part of the jacobian, see ``stiff_solver``
+
+        :param float gamma:
+        :return: func - :math:`v \\mapsto \\left(I - \\gamma J_{diff}\\right)^{-1}v`
+        """
+        return self.stiff_solver(gamma)
+
+    def stiff_solver(self, gamma):
+        """
+        The exact solver of the diffusion part of the jacobian, diagonalised by the FFT
+
+        :param float gamma:
+        :return: func - :math:`v \\mapsto \\left(I - \\gamma J_{diff}\\right)^{-1}v`
+        """
+        shift = 1 + gamma * self.d * self.k2
+        return lambda v: np.fft.irfft(np.fft.rfft(v) / shift, self.n_pts)
+
+    def hess(self, y, t):
+        identity = np.eye(self.n_pts)
+        filtered = self._filter(identity).T
+        derivative = self._derivative(self.dealias * np.fft.rfft(identity)).T
+        return -np.einsum('kj,jl,jm->klm', derivative, filtered, filtered)
+
+    def hess_vec(self, y, t, u, v):
+        return -self._product_derivative(self._filter(u), self._filter(v))
+
+    def __repr__(self):
+        return "Fourier pseudo-spectral for Burgers' equation " + super(FourierMethodBurgers, self).__repr__()
@@ -1,7 +1,10 @@
 import numpy as np
+import scipy.sparse
 
 from ...linalg import lagrange
+from ...linalg.sparse import matvec, shifted_solver
 from ..method import _SpatialMethod
+from ..sd import interface_matrix
 
 
 class SpectralDifferenceMethodBurgers(_SpatialMethod):
@@ -12,45 +15,49 @@ class SpectralDifferenceMethodBurgers(_SpatialMethod):
     This method uses p + 1 flux points in the [-1, 1] cell, computed as the Legendre polynomial roots.
 
     :ivar array_like flux_pts: The repartition of the flux points inside a [-1, 1] cell
-    :ivar array_like _sol_to_flux_conv_full: A needed matrix,
-     ``_sol_to_flux_conv_full`` @ ``y`` is the flux expressed in the flux points
-    :ivar array_like _d_in_flux_to_sol_full: A needed matrix,
+    :ivar scipy.sparse.csr_matrix _sol_to_flux_full: A needed matrix,
+     ``_sol_to_flux_full`` @ ``y`` is the solution expressed in the flux points
+    :ivar scipy.sparse.csr_matrix _d_in_flux_to_sol_full: A needed matrix,
      ``_d_in_flux_to_sol_full`` @ ``f`` is the derivative of ``f`` expressed in the solution points,
      with ``f`` given in the flux points
-    :ivar array_like _jac_diff: The constant jacobian for the diffusion part
+    :ivar scipy.sparse.bsr_matrix _jac_diff: The constant jacobian for the diffusion part
+    :ivar numpy.ndarray _interface_l: The index of the flux point on the left of each interface
+    :ivar numpy.ndarray _interface_r: The index of the flux point on the right of each interface
     """
 
+    _OPERATORS = ('_sol_to_flux_full', '_d_in_flux_to_sol_full', '_jac_diff')
+
     def __init__(self, mesh, p, diff):
         super(SpectralDifferenceMethodBurgers, self).__init__(mesh, p, 0, diff)
 
         # Setting the solution points in a [-1, 1] cell as the Legendre roots
         self.flux_pts = np.append(-1, np.append(np.polynomial.legendre.legroots((self.p - 1) * [0] + [1]), 1))
 
+        # Indices of the flux points on the left and on the right of each interface
+        self._interface_r = np.arange(self.n_cell) * (self.p + 1)
+        self._interface_l = (self._interface_r - 1) % (self.n_cell * (self.p + 1))
+
+        self._load_or_assemble()
+
+    def _assemble(self):
         # Setting the needed matrices
         sol_to_flux = lagrange.lagrange_extrapolation_matrix(self.cell, self.flux_pts)
         flux_to_sol = lagrange.lagrange_extrapolation_matrix(self.flux_pts, self.cell)
-        d_in_flux = np.zeros((self.p + 1, self.p + 1))
-        for i in range(self.p + 1):
-            for j in range(self.p + 1):
-                d_in_flux[i, j] = lagrange.d_lagrange(self.flux_pts[i], self.flux_pts, j)
+        d_in_flux = lagrange.lagrange_derivative_matrix(self.flux_pts)
 
-        # Working with full size matrices
-        isoparametric_scale = 2 / (np.roll(self.mesh, -1) - self.mesh)[:-1]
-        self._sol_to_flux_full = np.kron(np.eye(self.n_cell), sol_to_flux)
-        d_in_flux_full = np.kron(np.diagflat(isoparametric_scale), d_in_flux)
-        self._d_in_flux_to_sol_full = np.kron(np.diagflat(isoparametric_scale), np.dot(flux_to_sol, d_in_flux))
+        # Working with block sparse full size matrices, built from the per-cell matrices
+        isoparametric_scale = 2 / np.diff(self.mesh)
+        self._sol_to_flux_full = scipy.sparse.kron(scipy.sparse.identity(self.n_cell), sol_to_flux, format='csr')
+        d_in_flux_full = scipy.sparse.kron(scipy.sparse.diags(isoparametric_scale), d_in_flux, format='csr')
+        self._d_in_flux_to_sol_full = scipy.sparse.kron(scipy.sparse.diags(isoparametric_scale),
+                                                        np.dot(flux_to_sol, d_in_flux), format='csr')
 
         # Continuity between cells
-        riemann_d = np.eye(self.n_cell * (self.p + 1))
-        for i in range(self.n_cell):
-            riemann_d[i * (self.p + 1), i * (self.p + 1)] = 0.5
-            riemann_d[i * (self.p + 1), i * (self.p + 1) - 1] = 0.5
-            riemann_d[i * (self.p + 1) - 1, i * (self.p + 1)] = 0.5
-            riemann_d[i * (self.p + 1) - 1, i * (self.p + 1) - 1] = 0.5
+        riemann_d = interface_matrix(self.n_cell, self.p + 1, 'centered')
 
-        self._jac_diff = self.d * np.dot(self._d_in_flux_to_sol_full,
-                                         np.dot(riemann_d, np.dot(d_in_flux_full,
-                                                                  np.dot(riemann_d, self._sol_to_flux_full))))
+        self._jac_diff = self.d * self._d_in_flux_to_sol_full.dot(
+            riemann_d.dot(d_in_flux_full.dot(riemann_d.dot(self._sol_to_flux_full)))
+        ).tobsr(blocksize=(self.p, self.p))
 
     def rhs(self, y, t):
         """
@@ -119,49 +126,104 @@ class SpectralDifferenceMethodBurgers(_SpatialMethod):
 
         return rhs_in_sol_point.reshape(y.shape)
         """
-        rhs = np.dot(self._riemann_solver(y), np.dot(self._sol_to_flux_full, y))
-        rhs = np.dot(self._d_in_flux_to_sol_full, -rhs * rhs / 2) + np.dot(self._jac_diff, y)
-        return rhs
+        return self.rhs_nonstiff(y, t) + self.rhs_stiff(y, t)
+
+    def rhs_stiff(self, y, t):
+        """
+        The diffusion part of the right hand side
+        """
+        return matvec(self._jac_diff, y)
+
+    def rhs_nonstiff(self, y, t):
+        """
+        The convection part of the right hand side, with the fluxes given by the Riemann solver at the interfaces
+        """
+        y_in_fp = self._to_continuous_flux(y, *self._riemann_solver(y))
+        return matvec(self._d_in_flux_to_sol_full, -y_in_fp * y_in_fp / 2)
 
     def jac(self, y, t):
-        foo = np.dot(self._riemann_solver(y), self._sol_to_flux_full)
-        jac_conv = -np.dot(self._d_in_flux_to_sol_full, foo * (np.dot(foo, y)[:, None]))
+        foo = self._riemann_matrix(y).dot(self._sol_to_flux_full)
+        jac_conv = -self._d_in_flux_to_sol_full.dot(scipy.sparse.diags(foo.dot(y)).dot(foo))
         return self._jac_diff + jac_conv
 
+    def jvp(self, y, t, v):
+        src, keep = self._riemann_solver(y)
+        y_in_fp = self._to_continuous_flux(y, src, keep)
+        v_in_fp = self._to_continuous_flux(v, src, keep)
+        return matvec(self._jac_diff, v) - matvec(self._d_in_flux_to_sol_full, y_in_fp * v_in_fp)
+
+    def preconditioner(self, gamma):
+        """
+        The solver of the diffusion part of the jacobian, see ``stiff_solver``
+
+        :param float gamma:
+        :return: func - :math:`v \\mapsto \\left(I - \\gamma J_{diff}\\right)^{-1}v`
+        """
+        return self.stiff_solver(gamma)
+
+    def stiff_solver(self, gamma):
+        """
+        The solver of the diffusion part of the jacobian, factorized with a sparse LU decomposition
+
+        :param float gamma:
+        :return: func - :math:`v \\mapsto \\left(I - \\gamma J_{diff}\\right)^{-1}v`
+        """
+        return shifted_solver(self._jac_diff, gamma)
+
     def hess(self, y, t):
-        # TODO: check this
-        foo = np.dot(self._riemann_solver(y), self._sol_to_flux_full)
-        hess_conv = -np.dot(self._d_in_flux_to_sol_full, foo * foo[:, None])
-        return hess_conv
+        foo = self._riemann_matrix(y).dot(self._sol_to_flux_full).toarray()
+        hess_conv = -self._d_in_flux_to_sol_full.dot((foo[:, :, None] * foo[:, None, :]).reshape(len(foo), -1))
+        return hess_conv.reshape((self.n_pts, self.n_pts, self.n_pts))
+
+    def hess_vec(self, y, t, u, v):
+        src, keep = self._riemann_solver(y)
+        u_in_fp = self._to_continuous_flux(u, src, keep)
+        v_in_fp = self._to_continuous_flux(v, src, keep)
+        return -matvec(self._d_in_flux_to_sol_full, u_in_fp * v_in_fp)
 
     def _riemann_solver(self, y):
         """
+        Solves the Riemann problem at every interface at once.
+        The continuity is expressed as a gather on the solution extrapolated in the flux points ``y_in_fp``:
+        the continuous solution in the flux points is ``keep * y_in_fp[src]``.
+
+        :param array_like y: A state of shape (n_pts,), or a stack of m states of shape (m, n_pts)
+        :return: (numpy.ndarray, numpy.ndarray) - the ``src`` indices and the ``keep`` weights,
+         of shape (n_flux_pts,) or (m, n_flux_pts)
+        """
+        y_in_fp = matvec(self._sol_to_flux_full, y)
+        yl, yr = y_in_fp[..., self._interface_l], y_in_fp[..., self._interface_r]
+        shock, rarefaction = yl > yr, yl < yr
+        left = (shock & (yl + yr > 0)) | (rarefaction & (yl > 0))
+        right = (shock & (yl + yr <= 0)) | (rarefaction & (yr < 0))
+        sonic = rarefaction & (yl <= 0) & (yr >= 0)
+
+        src = np.zeros(y_in_fp.shape, dtype=int) + np.arange(y_in_fp.shape[-1])
+        src[..., self._interface_r] = np.where(left, self._interface_l, self._interface_r)
+        src[..., self._interface_l] = np.where(right, self._interface_r, self._interface_l)
+        keep = np.ones(y_in_fp.shape)
+        keep[..., self._interface_r] = ~sonic
+        keep[..., self._interface_l] = ~sonic
+        return src, keep
+
+    def _to_continuous_flux(self, y, src, keep):
+        """
+
+        :param array_like y: A state of shape (n_pts,), or a stack of m states of shape (m, n_pts)
+        :param numpy.ndarray src: The gather indices given by ``_riemann_solver``
+        :param numpy.ndarray keep: The gather weights given by ``_riemann_solver``
+        :return: numpy.ndarray - ``y`` expressed in the flux points, continuous across the interfaces
+        """
+        return keep * np.take_along_axis(matvec(self._sol_to_flux_full, y), src, axis=-1)
+
+    def _riemann_matrix(self, y):
+        """
 
         :param array_like y:
-        :return: numpy.ndarray - the continuity matrix expressed in the flux points
+        :return: scipy.sparse.csr_matrix - the continuity matrix expressed in the flux points
         """
-        y_in_fp = np.dot(self._sol_to_flux_full, y)
-        riemann_c = np.eye(self.n_cell * (self.p + 1))
-        for i in range(self.n_cell):
-            yl, yr = y_in_fp[i * (self.p + 1) - 1], y_in_fp[i * (self.p + 1)]
-            if yl > yr:  # shock
-                if yl + yr > 0:
-                    riemann_c[i * (self.p + 1), i * (self.p + 1)] = 0
-                    riemann_c[i * (self.p + 1), i * (self.p + 1) - 1] = 1
-                else:
-                    riemann_c[i * (self.p + 1) - 1, i * (self.p + 1) - 1] = 0
-                    riemann_c[i * (self.p + 1) - 1, i * (self.p + 1)] = 1
-            elif yl < yr:  # rarefaction
-                if yl > 0:
-                    riemann_c[i * (self.p + 1), i * (self.p + 1)] = 0
-                    riemann_c[i * (self.p + 1), i * (self.p + 1) - 1] = 1
-                elif yr < 0:
-                    riemann_c[i * (self.p + 1) - 1, i * (self.p + 1) - 1] = 0
-                    riemann_c[i * (self.p + 1) - 1, i * (self.p + 1)] = 1
-                else:
-                    riemann_c[i * (self.p + 1), i * (self.p + 1)] = 0
-                    riemann_c[i * (self.p + 1) - 1, i * (self.p + 1) - 1] = 0
-        return riemann_c
+        src, keep = self._riemann_solver(y)
+        return scipy.sparse.csr_matrix((keep, (np.arange(len(src)), src)), shape=(len(src), len(src)))
 
     def __repr__(self):
         foo = "Spectral difference for Burger's equation " + super(SpectralDifferenceMethodBurgers, self).__repr__()
@@ -0,0 +1,127 @@
+r"""
+Persistent on-disk cache of the operators assembled by the spatial methods.
+
+The operators of a spatial method only depend on its class, its mesh, ``p`` and the convection and diffusion
+parameters, and on the code assembling them. When ``CACHE_DIR`` is set, they are stored in a sub-directory of
+``CACHE_DIR`` named after a hash of these parameters and of the sources of the ``spatial`` and ``linalg`` packages,
+so that building the same spatial method again only loads them, until the assembly code changes:
+sparse matrices are stored with ``scipy.sparse.save_npz`` and dense arrays as ``.npy`` files,
+opened as read-only memory maps.
+
+Example:
+   >>> pie.spatial.cache.CACHE_DIR = '/tmp/pie_cache'
+   >>> method = pie.spatial.SpectralDifferenceMethod(mesh, p, conv, diff)  # Assembles and saves the operators
+   >>> method = pie.spatial.SpectralDifferenceMethod(mesh, p, conv, diff)  # Only loads them
+"""
+
+import functools
+import hashlib
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import scipy.sparse
+
+CACHE_DIR = os.environ.get('PIE_CACHE_DIR')
+"""The cache directory, initialised with the ``PIE_CACHE_DIR`` environment variable. If None, nothing is cached"""
+
+_FORMAT = 2
+"""Version of the storage format, part of the key so that a format change invalidates the previous entries"""
+
+_ASSEMBLY_PACKAGES = ('spatial', 'linalg')
+"""The packages of ``pie`` whose sources assemble the operators"""
+
+
+@functools.lru_cache(maxsize=None)
+def _assembly_hash():
+    """
+    Returns a hash of the sources of ``_ASSEMBLY_PACKAGES``, computed once
+
+    :return: str
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sha = hashlib.sha1()
+    for package in _ASSEMBLY_PACKAGES:
+        for folder, folders, files in os.walk(os.path.join(root, package)):
+            folders.sort()
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    path = os.path.join(folder, name)
+                    sha.update(os.path.relpath(path, root).replace(os.sep, '/').encode())
+                    with open(path, 'rb') as file:
+                        sha.update(file.read())
+    return sha.hexdigest()
+
+
+def key(method):
+    """
+    Returns the content-addressed key of a spatial method
+
+    :param pie.spatial._SpatialMethod method:
+    :return: str - a hash of the method class, mesh, ``p``, convection and diffusion parameters,
+     and of the assembly code
+    """
+    sha = hashlib.sha1()
+    sha.update('{0}.{1}/{2}'.format(type(method).__module__, type(method).__name__, _FORMAT).encode())
+    sha.update(_assembly_hash().encode())
+    sha.update(np.ascontiguousarray(method.mesh, dtype=float).tobytes())
+    sha.update(np.array([method.p, method.c, method.d], dtype=float).tobytes())
+    return sha.hexdigest()
+
+
+def load(method):
+    """
+    Sets the operators of ``method`` from the cache, if they are available.
+
+    An entry with a missing or unreadable file, left by a partial deletion of the cache, is a cache miss: it is removed,
+    so that the assembled operators are stored again.
+
+    :param pie.spatial._SpatialMethod method:
+    :return: bool - True if the operators were loaded
+    """
+    if CACHE_DIR is None:
+        return False
+    folder = os.path.join(CACHE_DIR, key(method))
+    if not os.path.isdir(folder):
+        return False
+    operators = {}
+    try:
+        for name in method._OPERATORS:
+            path = os.path.join(folder, name)
+            if os.path.isfile(path + '.npz'):
+                operators[name] = scipy.sparse.load_npz(path + '.npz')
+            else:
+                operators[name] = np.load(path + '.npy', mmap_mode='r')
+    except (OSError, ValueError):
+        shutil.rmtree(folder, ignore_errors=True)
+        return False
+    for name in operators:
+        setattr(method, name, operators[name])
+    return True
+
+
+def save(method):
+    """
+    Stores the operators of ``method`` in the cache. Does nothing if ``CACHE_DIR`` is None.
+
+    The entry is written in a temporary directory and then renamed, so that concurrent runs never see a partial entry.
+
+    :param pie.spatial._SpatialMethod method:
+    """
+    if CACHE_DIR is None:
+        return
+    if not os.path.isdir(CACHE_DIR):
+        os.makedirs(CACHE_DIR)
+    folder = os.path.join(CACHE_DIR, key(method))
+    tmp = tempfile.mkdtemp(dir=CACHE_DIR)
+    for name in method._OPERATORS:
+        operator = getattr(method, name)
+        if scipy.sparse.issparse(operator):
+            scipy.sparse.save_npz(os.path.join(tmp, name + '.npz'), operator, compressed=False)
+        else:
+            np.save(os.path.join(tmp, name + '.npy'), operator)
+    try:
+        os.rename(tmp, folder)
+    except OSError:  # Already stored by a concurrent run
+        shutil.rmtree(tmp)
@@ -1,5 +1,6 @@
 import numpy as np
 
+from ..linalg.sparse import matvec, periodic_stencil, shifted_solver
 from .method import _SpatialMethod
 
 
@@ -20,26 +21,38 @@ class FiniteDifferenceMethod(_SpatialMethod):
        \frac{2}{x_{i+1} - x_{i-1}}\left(\frac{y_{i+1} - y_i}{x_{i+1} - x_i} - \frac{y_i - y_{i-1}}{x_i - x_{i-1}}\right)
 
     This method gives a linear right hand side so it has a constant jacobian, stored as a private attribute.
+    This three points stencil jacobian is stored as a sparse matrix, so that ``rhs`` and ``jac`` run in O(n_pts).
 
-    :ivar array_like _jac: The constant jacobian
+    On a uniform mesh, the jacobian is block circulant, and even circulant with ``p == 1``: it is then diagonalised by
+    the FFT, which gives the exact ``jac_phi``, ``jac_solve`` and ``spectral_radius`` in O(n_pts log(n_pts)).
+
+    :ivar scipy.sparse.csr_matrix _jac: The constant jacobian
+    :ivar _circulant: The diagonalised jacobian on a uniform mesh, None otherwise
+    :vartype _circulant: pie.linalg.circulant.Circulant or pie.linalg.circulant.BlockCirculant or None
     """
 
+    _OPERATORS = ('_jac',)
+
     def __init__(self, mesh, p, conv, diff):
         super(FiniteDifferenceMethod, self).__init__(mesh, p, conv, diff)
+        self._load_or_assemble()
+
+        self._diagonalise(self._jac)
 
+    def _assemble(self):
         # Setting the RHS jacobian, constant here
         x = np.append(self.x, self.mesh[-1] + self.x[0] - self.mesh[0])
         dx1 = np.roll((x - np.roll(x, 1))[1:], 1)
         dx2 = (np.roll(x, -1) - x)[:-1]
-        j1 = np.diagflat(1 / dx1) - np.diagflat(1 / dx1[1:], -1)
-        j1[0, -1] = -1 / dx1[0]
-        j2 = np.diagflat(1 / dx2[:-1], 1) - np.diagflat(1 / dx2)
-        j2[-1, 0] = 1 / dx2[-1]
+        zero = np.zeros(self.n_pts)
+        j1 = np.array([-1 / dx1, 1 / dx1, zero])
+        j2 = np.array([zero, -1 / dx2, 1 / dx2])
         if self.c < 0:
-            self._jac = -self.c * j2
+            stencil = -self.c * j2
         else:
-            self._jac = -self.c * j1
-        self._jac += self.d * 2 * (j2 - j1) / (dx1[:, None] + dx2[:, None])
+            stencil = -self.c * j1
+        stencil += self.d * 2 * (j2 - j1) / (dx1 + dx2)
+        self._jac = periodic_stencil(stencil, (-1, 0, 1))
 
     def rhs(self, y, t):
         """
@@ -70,13 +83,28 @@ class FiniteDifferenceMethod(_SpatialMethod):
         rhs[-1] += self.d * (a - b) * 2 / (self.mesh[-1] + self.x[0] - self.x[-2])
         return rhs
         """
-        return np.dot(self._jac, y)
+        return matvec(self._jac, y)
 
     def jac(self, y, t):
         return self._jac
 
+    def jvp(self, y, t, v):
+        return matvec(self._jac, v)
+
+    def preconditioner(self, gamma):
+        """
+        The exact solver of the constant jacobian, factorized with a sparse LU decomposition
+
+        :param float gamma:
+        :return: func - :math:`v \\mapsto \\left(I - \\gamma J\\right)^{-1}v`
+        """
+        return shifted_solver(self._jac, gamma)
+
     def hess(self, y, t):
         return np.zeros((self.n_pts, self.n_pts, self.n_pts))
 
+    def hess_vec(self, y, t, u, v):
+        return np.zeros(np.shape(u))
+
     def __repr__(self):
         return "Finite difference " + super(FiniteDifferenceMethod, self).__repr__()
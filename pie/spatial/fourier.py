@@ -0,0 +1,99 @@
+import numpy as np
+import scipy.sparse.linalg
+
+from ..linalg.circulant import Circulant
+from .method import _SpatialMethod
+
+
+class _FourierSpatialMethod(_SpatialMethod):
+    r"""
+    Generic structure for the pseudo-spectral Fourier methods.
+
+    The mesh must be uniform, and the p points of a cell are evenly spaced, so that the n_pts solution points are evenly
+    spaced on the periodic domain. The derivatives are then computed with the real FFT in O(n_pts log(n_pts)).
+
+    :ivar numpy.ndarray k: The wave numbers of the real FFT, of size n_pts // 2 + 1. For an even number of points, the
+     Nyquist wave number is set to zero in the odd derivatives, so that they stay real
+    :ivar numpy.ndarray k2: The squared wave numbers, used in the second derivative
+    """
+
+    def __init__(self, mesh, p, conv, diff):
+        super(_FourierSpatialMethod, self).__init__(mesh, p, conv, diff)
+        scale = np.diff(self.mesh)
+        if np.max(abs(scale - scale[0])) > 1E-10 * abs(scale[0]):
+            raise ValueError('{0} needs a uniform mesh'.format(type(self).__name__))
+
+        # Setting the solution points evenly spaced in a [-1, 1] cell
+        self.cell = -1 + (2 * np.arange(self.p) + 1) / self.p
+        self.x = (self.mesh[:-1, None] + scale[:, None] * (self.cell + 1) / 2).ravel()
+        self.dx = ((self.mesh[-1] - self.mesh[0]) / self.n_pts,)
+
+        length = self.mesh[-1] - self.mesh[0]
+        self.k2 = (2 * np.pi / length * np.arange(self.n_pts // 2 + 1)) ** 2
+        self.k = np.sqrt(self.k2)
+        if self.n_pts % 2 == 0:
+            self.k[-1] = 0
+
+    def _derivative(self, y_hat):
+        """
+
+        :param numpy.ndarray y_hat: The real FFT of the state(s), along the last axis
+        :return: numpy.ndarray - the first derivative of the state(s), with the shape of the state(s)
+        """
+        return np.fft.irfft(1j * self.k * y_hat, self.n_pts)
+
+    def _second_derivative(self, y_hat):
+        """
+
+        :param numpy.ndarray y_hat: The real FFT of the state(s), along the last axis
+        :return: numpy.ndarray - the second derivative of the state(s), with the shape of the state(s)
+        """
+        return np.fft.irfft(-self.k2 * y_hat, self.n_pts)
+
+
+class FourierMethod(_FourierSpatialMethod):
+    r"""
+    Pseudo-spectral Fourier scheme for 1D convection - diffusion flux, with a periodic boundary condition.
+
+    The right hand side is computed in O(n_pts log(n_pts)) with the real FFT, and the jacobian is a matrix-free
+    ``scipy.sparse.linalg.LinearOperator``.
+    The jacobian is constant and diagonalised by the FFT, which gives the exact ``jac_phi``, ``jac_solve`` and
+    ``spectral_radius``.
+
+    :ivar pie.linalg.circulant.Circulant _circulant: The diagonalised jacobian
+    """
+
+    def __init__(self, mesh, p, conv, diff):
+        super(FourierMethod, self).__init__(mesh, p, conv, diff)
+
+        # The Nyquist mode has no first derivative, as in _derivative, but keeps its second derivative, as in k2
+        k = np.fft.fftfreq(self.n_pts, 1 / self.n_pts) * 2 * np.pi / (self.mesh[-1] - self.mesh[0])
+        k_odd = k.copy()
+        if self.n_pts % 2 == 0:
+            k_odd[self.n_pts // 2] = 0
+        eigenvalues = -1j * self.c * k_odd - self.d * k * k
+        self._circulant = Circulant(np.fft.ifft(eigenvalues).real)
+        self.jac_phi = self._circulant.phi
+        self.jac_solve = self._circulant.solve_shifted
+        self.spectral_radius = self._circulant.spectral_radius
+
+    def rhs(self, y, t):
+        y_hat = np.fft.rfft(y)
+        return -self.c * self._derivative(y_hat) + self.d * self._second_derivative(y_hat)
+
+    def jac(self, y, t):
+        return scipy.sparse.linalg.LinearOperator((self.n_pts, self.n_pts),
+                                                  matvec=lambda v: self.rhs(np.ravel(v), t),
+                                                  matmat=lambda v: self.rhs(v.T, t).T, dtype=float)
+
+    def jvp(self, y, t, v):
+        return self.rhs(v, t)
+
+    def hess(self, y, t):
+        return np.zeros((self.n_pts, self.n_pts, self.n_pts))
+
+    def hess_vec(self, y, t, u, v):
+        return np.zeros(np.shape(u))
+
+    def __repr__(self):
+        return "Fourier pseudo-spectral " + super(FourierMethod, self).__repr__()
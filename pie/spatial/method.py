@@ -1,5 +1,8 @@
 import numpy as np
 
+from . import cache
+from ..linalg.circulant import BlockCirculant, Circulant
+
 
 class _SpatialMethod(object):
     r"""
@@ -19,10 +22,61 @@ class _SpatialMethod(object):
     :ivar numpy.ndarray cell: The repartition of the solution points inside a [-1, 1] cell
     :ivar numpy.ndarray x: The position of all the solution points
     :ivar tuple dx: The smallest and the biggest space steps. If they are the same, this tuple contains only one element
+
+    The subclasses assemble their operators in ``_assemble``, and list the assembled attributes in ``_OPERATORS``
+    so that they can be stored in the :doc:`operators cache<cache>`.
+    """
+
+    _OPERATORS = ()
+    """The names of the attributes set by ``_assemble``"""
+
+    jac_phi = None
+    r"""
+    If not None, a function ``jac_phi(h, w)`` computing exactly :math:`\sum_{k=0}^{K}h^k\varphi_k\left(hJ\right)w_k`
+    for the constant jacobian :math:`J` of a linear method, with ``w`` of shape (K + 1, n_pts)
+    (see :doc:`the phi functions<../linalg/phi>`)
+    """
+
+    jac_solve = None
+    r"""
+    If not None, a function ``jac_solve(gamma, v)`` computing exactly :math:`\left(I - \gamma J\right)^{-1}v`
+    for the constant jacobian :math:`J` of a linear method
+    """
+
+    preconditioner = None
+    r"""
+    If not None, a function ``preconditioner(gamma)`` returning a cheap approximation of the solver
+    :math:`v \mapsto \left(I - \gamma J\right)^{-1}v`, used to precondition the Krylov solvers
+    """
+
+    spectral_radius = None
+    """
+    If not None, a function ``spectral_radius()`` returning the spectral radius of the constant jacobian of a linear
+    method
+    """
+
+    rhs_stiff = None
+    r"""
+    If not None, a function ``rhs_stiff(y, t)`` computing the stiff part of the right hand side, linear in ``y``,
+    such as the diffusion, with ``rhs_nonstiff`` the rest of it, so that both sum to ``rhs``.
+    This split is used by the :doc:`IMEX methods<../temporal/imex>`
+    """
+
+    rhs_nonstiff = None
+    """
+    If not None, a function ``rhs_nonstiff(y, t)`` computing the non stiff part of the right hand side,
+    such as the convection
+    """
+
+    stiff_solver = None
+    r"""
+    If not None, a function ``stiff_solver(gamma)`` returning the exact solver
+    :math:`v \mapsto \left(I - \gamma J_{stiff}\right)^{-1}v`, for the constant jacobian :math:`J_{stiff}` of
+    ``rhs_stiff``
     """
 
     def __init__(self, mesh, p, conv, diff):
-        self.mesh = mesh
+        self.mesh = np.asarray(mesh)
         self.n_cell = len(mesh) - 1
         self.p = p
         self.n_pts = self.p * self.n_cell
@@ -33,32 +87,76 @@ class _SpatialMethod(object):
         self.cell = np.array([-np.cos(np.pi * (2 * i + 1) / (2 * self.p)) for i in range(self.p)])
 
         # Setting the coordinates of all solutions points
-        self.x = np.zeros(self.n_pts)
-        for i in range(self.n_cell):
-            scale = self.mesh[i + 1] - self.mesh[i]
-            self.x[i * self.p:(i + 1) * self.p] = self.mesh[i] + scale * (self.cell + 1) / 2
+        scale = np.diff(self.mesh)
+        self.x = (self.mesh[:-1, None] + scale[:, None] * (self.cell + 1) / 2).ravel()
 
         # Getting the space steps
         dx = (np.roll(self.x, -1) - self.x)[:-1]
-        dx_min = min(dx)
-        dx_max = max(dx)
+        dx_min = np.min(dx)
+        dx_max = np.max(dx)
         if abs(1 - dx_max / dx_min) < 1E-10:
             self.dx = (dx_min,)
         else:
             self.dx = (dx_min, dx_max)
 
+    def _assemble(self):
+        """
+        Assembles the operators named in ``_OPERATORS``
+        """
+
+    def _load_or_assemble(self):
+        """
+        Loads the operators from the cache if they are stored there, otherwise assembles and stores them
+        """
+        if not cache.load(self):
+            self._assemble()
+            cache.save(self)
+
+    def _diagonalise(self, jac):
+        """
+        On a uniform mesh, the constant jacobian ``jac`` of a linear method is block circulant with p x p blocks,
+        and circulant if ``p == 1``. It is then diagonalised with the FFT and stored in ``_circulant``,
+        which gives ``jac_phi``, ``jac_solve`` and ``spectral_radius``. Otherwise, ``_circulant`` is None.
+
+        :param jac: The constant jacobian
+        :type jac: numpy.ndarray or scipy.sparse.spmatrix
+        """
+        scale = np.diff(self.mesh)
+        if np.max(abs(scale - scale[0])) > 1E-10 * abs(scale[0]):
+            self._circulant = None
+            return
+        if self.p == 1:
+            self._circulant = Circulant.from_matrix(jac)
+        else:
+            self._circulant = BlockCirculant.from_matrix(jac, self.p)
+        self.jac_phi = self._circulant.phi
+        self.jac_solve = self._circulant.solve_shifted
+        self.spectral_radius = self._circulant.spectral_radius
+
     def rhs(self, y, t):
         r"""
-        :param array_like y:
+        :param array_like y: A state of shape (n_pts,), or a stack of m states of shape (m, n_pts)
         :param float t:
-        :return: numpy.ndarray - the right hand side :math:`RHS\left(y, t\right)`
+        :return: numpy.ndarray - the right hand side :math:`RHS\left(y, t\right)`, with the shape of ``y``
         """
 
     def jac(self, y, t):
         r"""
         :param array_like y:
         :param float t:
-        :return: numpy.ndarray - the jacobian :math:`\frac{\partial RHS}{\partial y}\left(y, t\right)`
+        :return: numpy.ndarray or scipy.sparse.spmatrix -
+         the jacobian :math:`\frac{\partial RHS}{\partial y}\left(y, t\right)`
+        """
+
+    def jvp(self, y, t, v):
+        r"""
+        The jacobian applied to a vector, computed without forming the jacobian
+
+        :param array_like y: A state of shape (n_pts,), or a stack of m states of shape (m, n_pts)
+        :param float t:
+        :param array_like v: The vector(s) to multiply, with the shape of ``y``
+        :return: numpy.ndarray - :math:`\frac{\partial RHS}{\partial y}\left(y, t\right)\cdot v`,
+         with the shape of ``y``
         """
 
     def hess(self, y, t):
@@ -68,6 +166,18 @@ class _SpatialMethod(object):
         :return: numpy.ndarray - the hessian :math:`\frac{\partial^2RHS}{\partial y^2}\left(y,t\right)`
         """
 
+    def hess_vec(self, y, t, u, v):
+        r"""
+        The hessian applied to two vectors, computed without forming the hessian
+
+        :param array_like y: A state of shape (n_pts,), or a stack of m states of shape (m, n_pts)
+        :param float t:
+        :param array_like u: A vector (or vectors) with the shape of ``y``
+        :param array_like v: A vector (or vectors) with the shape of ``y``
+        :return: numpy.ndarray - :math:`\left(\sum_{l,m}\frac{\partial^2RHS_k}{\partial y_l\partial y_m}
+         \left(y,t\right)u_lv_m\right)_k`
+        """
+
     def __repr__(self):
         foo = "Method, on [{0}, {1}] (periodic)".format(self.mesh[0], self.mesh[-1])
 
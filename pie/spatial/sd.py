@@ -1,9 +1,48 @@
 import numpy as np
+import scipy.sparse
 
 from ..linalg import lagrange
+from ..linalg.sparse import matvec, shifted_solver
 from .method import _SpatialMethod
 
 
+def interface_matrix(n_cell, n_flux, kind):
+    """
+    Returns the sparse continuity matrix applied to values given in the flux points of all the cells,
+    that sets the same value on both sides of each interface between two cells:
+
+    - with ``kind == 'left'``, the value of the left cell is used (upwind for a positive speed)
+    - with ``kind == 'right'``, the value of the right cell is used (upwind for a negative speed)
+    - with ``kind == 'centered'``, the mean of both values is used
+
+    :param int n_cell: The number of cells
+    :param int n_flux: The number of flux points in a cell
+    :param str kind: 'left', 'right' or 'centered'
+    :return: scipy.sparse.csr_matrix - the matrix, of shape (n_cell * n_flux, n_cell * n_flux)
+    """
+    n = n_cell * n_flux
+    first = np.arange(n_cell) * n_flux
+    last = (first - 1) % n
+    inner = np.ones(n, dtype=bool)
+    inner[first] = inner[last] = False
+    inner = np.flatnonzero(inner)
+    if kind == 'left':
+        rows = np.concatenate((inner, first, last))
+        cols = np.concatenate((inner, last, last))
+        vals = np.ones(len(rows))
+    elif kind == 'right':
+        rows = np.concatenate((inner, first, last))
+        cols = np.concatenate((inner, first, first))
+        vals = np.ones(len(rows))
+    elif kind == 'centered':
+        rows = np.concatenate((inner, first, first, last, last))
+        cols = np.concatenate((inner, first, last, first, last))
+        vals = np.concatenate((np.ones(len(inner)), 0.5 * np.ones(4 * n_cell)))
+    else:
+        raise ValueError("Unknown interface kind '{0}'".format(kind))
+    return scipy.sparse.csr_matrix((vals, (rows, cols)), shape=(n, n))
+
+
 class SpectralDifferenceMethod(_SpatialMethod):
     """
     Spatial scheme for 1D convection - diffusion flux,
@@ -11,49 +50,51 @@ class SpectralDifferenceMethod(_SpatialMethod):
 
     This method uses p + 1 flux points in the [-1, 1] cell, computed as the Legendre polynomial roots.
     This method gives a linear right hand side so it has a constant jacobian, stored as a private attribute.
+    As a cell is only coupled with its neighbours, this jacobian is stored as a block sparse matrix of p x p blocks,
+    assembled in O(n_cell * p^2) and applied in O(n_cell * p^2).
+
+    On a uniform mesh, the jacobian is block circulant: the FFT over the cells reduces it to n_cell independent p x p
+    matrices, which gives the exact ``jac_phi``, ``jac_solve`` and ``spectral_radius``
+    in O(n_cell * p^3 + n_pts * log(n_cell)).
 
     :ivar array_like flux_pts: The repartition of the flux points inside a [-1, 1] cell
-    :ivar array_like _jac: The constant jacobian
+    :ivar scipy.sparse.bsr_matrix _jac: The constant jacobian
+    :ivar _circulant: The diagonalised jacobian on a uniform mesh, None otherwise
+    :vartype _circulant: pie.linalg.circulant.Circulant or pie.linalg.circulant.BlockCirculant or None
     """
 
+    _OPERATORS = ('_jac',)
+
     def __init__(self, mesh, p, conv, diff):
         super(SpectralDifferenceMethod, self).__init__(mesh, p, conv, diff)
 
         # Setting the solution points in a [-1, 1] cell as the Legendre roots
         self.flux_pts = np.append(-1, np.append(np.polynomial.legendre.legroots((self.p - 1) * [0] + [1]), 1))
 
+        self._load_or_assemble()
+        self._diagonalise(self._jac)
+
+    def _assemble(self):
         # Setting the needed matrices
         sol_to_flux = lagrange.lagrange_extrapolation_matrix(self.cell, self.flux_pts)
         flux_to_sol = lagrange.lagrange_extrapolation_matrix(self.flux_pts, self.cell)
-        d_in_flux = np.zeros((self.p + 1, self.p + 1))
-        for i in range(self.p + 1):
-            for j in range(self.p + 1):
-                d_in_flux[i, j] = lagrange.d_lagrange(self.flux_pts[i], self.flux_pts, j)
+        d_in_flux = lagrange.lagrange_derivative_matrix(self.flux_pts)
 
-        # Working with full size matrices
-        isoparametric_scale = 2 / (np.roll(self.mesh, -1) - self.mesh)[:-1]
-        sol_to_flux_full = np.kron(np.eye(self.n_cell), sol_to_flux)
-        d_in_flux_full = np.kron(np.diagflat(isoparametric_scale), d_in_flux)
-        d_in_flux_to_sol_full = np.kron(np.diagflat(isoparametric_scale), np.dot(flux_to_sol, d_in_flux))
+        # Working with block sparse full size matrices, built from the per-cell matrices
+        isoparametric_scale = 2 / np.diff(self.mesh)
+        sol_to_flux_full = scipy.sparse.kron(scipy.sparse.identity(self.n_cell), sol_to_flux, format='csr')
+        d_in_flux_full = scipy.sparse.kron(scipy.sparse.diags(isoparametric_scale), d_in_flux, format='csr')
+        d_in_flux_to_sol_full = scipy.sparse.kron(scipy.sparse.diags(isoparametric_scale),
+                                                  np.dot(flux_to_sol, d_in_flux), format='csr')
 
         # Continuity between cells
-        riemann_c = np.eye(self.n_cell * (self.p + 1))
-        riemann_d = np.eye(self.n_cell * (self.p + 1))
-        for i in range(self.n_cell):
-            if self.c > 0:
-                riemann_c[i * (self.p + 1), i * (self.p + 1)] = 0
-                riemann_c[i * (self.p + 1), i * (self.p + 1) - 1] = 1
-            else:
-                riemann_c[i * (self.p + 1) - 1, i * (self.p + 1) - 1] = 0
-                riemann_c[i * (self.p + 1) - 1, i * (self.p + 1)] = 1
-            riemann_d[i * (self.p + 1), i * (self.p + 1)] = 0.5
-            riemann_d[i * (self.p + 1), i * (self.p + 1) - 1] = 0.5
-            riemann_d[i * (self.p + 1) - 1, i * (self.p + 1)] = 0.5
-            riemann_d[i * (self.p + 1) - 1, i * (self.p + 1) - 1] = 0.5
+        riemann_c = interface_matrix(self.n_cell, self.p + 1, 'left' if self.c > 0 else 'right')
+        riemann_d = interface_matrix(self.n_cell, self.p + 1, 'centered')
 
-        self._jac = np.dot(d_in_flux_to_sol_full,
-                           -self.c * np.dot(riemann_c, sol_to_flux_full)
-                           + self.d * np.dot(riemann_d, np.dot(d_in_flux_full, np.dot(riemann_d, sol_to_flux_full))))
+        self._jac = d_in_flux_to_sol_full.dot(
+            -self.c * riemann_c.dot(sol_to_flux_full)
+            + self.d * riemann_d.dot(d_in_flux_full.dot(riemann_d.dot(sol_to_flux_full)))
+        ).tobsr(blocksize=(self.p, self.p))
 
     def rhs(self, y, t):
         """
@@ -104,14 +145,29 @@ class SpectralDifferenceMethod(_SpatialMethod):
 
         return rhs_in_sol_point.reshape(y.shape)
         """
-        return np.dot(self._jac, y)
+        return matvec(self._jac, y)
 
     def jac(self, y, t):
         return self._jac
 
+    def jvp(self, y, t, v):
+        return matvec(self._jac, v)
+
+    def preconditioner(self, gamma):
+        """
+        The exact solver of the constant jacobian, factorized with a sparse LU decomposition
+
+        :param float gamma:
+        :return: func - :math:`v \\mapsto \\left(I - \\gamma J\\right)^{-1}v`
+        """
+        return shifted_solver(self._jac, gamma)
+
     def hess(self, y, t):
         return np.zeros((self.n_pts, self.n_pts, self.n_pts))
 
+    def hess_vec(self, y, t, u, v):
+        return np.zeros(np.shape(u))
+
     def __repr__(self):
         foo = "Spectral difference " + super(SpectralDifferenceMethod, self).__repr__()
 
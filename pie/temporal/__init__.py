@@ -18,9 +18,18 @@ The temporal method is a function used to solve the equation for a given right h
    :param \*\*kwargs: More optional keyword arguments that might be needed
    :return: numpy.ndarray - The solution, of shape (n, d)
 
+The solution can also be streamed with ``iter_solve``, without storing it whole,
+and a long integration can be checkpointed with a ``Checkpoint``,
+or solved in parallel in time with ``parareal``.
+
 """
 
-from .bdf import bdf_1, bdf_2, bdf_3, bdf_4, bdf_5, bdf_6
+from .bdf import bdf_1, bdf_2, bdf_3, bdf_4, bdf_5, bdf_6, bdf_vsvo
+from .checkpoint import Checkpoint
 from .exp_rosenbrock import rosen_exp_1, rosen_exp_2, rosen_exp_3
 from .exp_taylor import taylor_exp_1, taylor_exp_2, taylor_exp_3
-from .rk import rk_1, rk_2, rk_4
+from .imex import imex_rk_1, imex_rk_2, imex_rk_3, sbdf_1, sbdf_2, sbdf_3, sbdf_4
+from .parareal import parareal
+from .rk import rk_1, rk_2, rk_4, rk_bs32, rk_dp54
+from .rkc import rkc_1, rkc_2
+from .stream import iter_solve
@@ -1,28 +1,288 @@
 r"""
 `BDF methods <https://en.wikipedia.org/wiki/Backward_differentiation_formula>`_ on Wikipedia.
 
-Uses the `hybr` method of the
-`scipy root finding function <https://docs.scipy.org/doc/scipy/reference/generated/scipy.optimize.root.html>`_.
+The implicit equation of each step is solved with modified Newton iterations, reusing the factorization of its
+jacobian (``scipy.sparse.linalg.splu`` for a sparse jacobian) across the iterations and the steps,
+or the exact solver ``jac_solve`` if it is given for the constant jacobian.
+With ``jfnk``, the jacobian is never formed and the linear systems are solved with a preconditioned GMRES.
+
+The variable step size, variable order method ``bdf_vsvo`` chooses its own steps and orders from the tolerances.
+It is a separate engine: the fixed order methods ``bdf_1`` ... ``bdf_6`` still step on the given time steps, from a
+``rk_4`` start.
 
 """
 
 import warnings
 
 import numpy as np
-import scipy.optimize
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
 
+from .checkpoint import restore, saver
 from .rk import rk_4
+from ..linalg.sparse import to_dense
+from .stream import streaming
 from ..misc.counter import Counter
 
 
-def _bdf_i(i, y0, t, f, func_to_minimise, jac_func_to_minimise, verbose):
-    try:
-        n, d = len(t), len(y0)
-        y = np.zeros((n, d))
-    except TypeError:
-        n = len(t)
-        y = np.zeros((n,))
+NEWTON_TOL = 1.49012E-08
+"""Relative tolerance on the Newton iterations"""
+
+NEWTON_MAX_ITER = 10
+"""Maximum number of Newton iterations"""
+
+NEWTON_SLOW_RATE = 0.5
+"""Above this convergence rate of the Newton iterations, the jacobian is evaluated again for the next step"""
+
+KRYLOV_RTOL = 1E-3
+"""Relative tolerance of the GMRES linear solves of the Jacobian-free Newton-Krylov iterations"""
+
+KRYLOV_RESTART = 20
+"""Dimension of the Krylov subspace of the GMRES linear solves, before a restart"""
+
+
+def _rms(v):
+    return np.sqrt(np.mean(v * v))
+
+
+def _factorize(a):
+    """
+    Factorizes the square matrix ``a``
+
+    :param a:
+    :type a: numpy.ndarray or scipy.sparse.spmatrix
+    :return: func - solves a linear system with ``a``
+    """
+    if scipy.sparse.issparse(a):
+        return scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(a)).solve
+    lu = scipy.linalg.lu_factor(a)
+    return lambda v: scipy.linalg.lu_solve(lu, v)
+
+
+def _to_dense_or_sparse(a):
+    """
+    :param a:
+    :type a: array_like or scipy.sparse.spmatrix or scipy.sparse.linalg.LinearOperator
+    :return: numpy.ndarray or scipy.sparse.spmatrix - ``a`` if it is sparse, ``a`` as a dense array otherwise
+    """
+    if scipy.sparse.issparse(a):
+        return a
+    return to_dense(a)
+
+
+def _finite_difference_jacobian(f, u, s):
+    """
+    :param func f:
+    :param numpy.ndarray u:
+    :param float s:
+    :return: numpy.ndarray - the jacobian of ``f`` in ``(u, s)``, approximated with forward differences
+    """
+    f0 = f(u, s)
+    jacobian = np.zeros((len(u), len(u)))
+    for k in range(len(u)):
+        step = np.sqrt(np.finfo(float).eps) * max(abs(u[k]), 1)
+        u_k = u.copy()
+        u_k[k] += step
+        jacobian[:, k] = (f(u_k, s) - f0) / step
+    return jacobian
+
+
+class _ModifiedNewton(object):
+    r"""
+    Modified Newton iterations on the implicit equation of a BDF step, whose jacobian is :math:`I - \gamma J`
 
+    The factorization of :math:`I - \gamma J` is kept across the iterations and the steps: it is only computed again
+    when :math:`\gamma` changes, and the jacobian :math:`J` is only evaluated again when the iterations diverge or
+    converge slowly. On a linear problem, each step after the first one then costs a single solve.
+    With ``jac_solve``, the exact solver of the constant jacobian is used instead of a factorization.
+
+    :param func f: Function with well shaped input and output
+    :param jac: The Jacobian of f, approximated with finite differences if None
+    :type jac: func or None
+    :param jac_solve: ``jac_solve(gamma, v)`` computes :math:`\left(I - \gamma J\right)^{-1}v`
+    :type jac_solve: func or None
+    """
+
+    def __init__(self, f, jac, jac_solve):
+        if jac is None:
+            def jac(u, s): return _finite_difference_jacobian(f, u, s)
+        self.jac = jac
+        self.jac_solve = jac_solve
+        self.jacobian = None
+        self.gamma = None
+        self.solve = None
+        self.fresh = False
+
+    def _linear_solver(self, gamma, u, s):
+        if self.jac_solve is not None:
+            return lambda v: self.jac_solve(gamma, v)
+        if self.jacobian is None:
+            self.jacobian = _to_dense_or_sparse(self.jac(u, s))
+            self.fresh, self.solve = True, None
+        if self.solve is None or abs(gamma - self.gamma) > 1E-10 * abs(gamma):
+            self._factorize(gamma)
+        return self.solve
+
+    def _factorize(self, gamma):
+        if scipy.sparse.issparse(self.jacobian):
+            identity = scipy.sparse.identity(self.jacobian.shape[0], format='csc')
+        else:
+            identity = np.eye(self.jacobian.shape[0])
+        self.solve, self.gamma = _factorize(identity - gamma * self.jacobian), gamma
+
+    def state(self):
+        """
+        :return: dict - the jacobian and the factor of its factorization, from which the solver is built again
+        """
+        return dict(jacobian=self.jacobian, gamma=None if self.solve is None else self.gamma)
+
+    def restore(self, state):
+        """
+        :param dict state: A state given by ``state``
+        """
+        self.jacobian = state['jacobian']
+        if self.jacobian is not None and state['gamma'] is not None:
+            self._factorize(state['gamma'])
+
+    def __call__(self, func_to_minimise, u0, args, gamma, s):
+        """
+        :param func func_to_minimise: The implicit equation, ``func_to_minimise(u, *args) = 0``
+        :param array_like u0: The initial guess
+        :param tuple args:
+        :param float gamma: The factor of :math:`J` in the jacobian of ``func_to_minimise``
+        :param float s: The time of the step, where the jacobian is evaluated
+        :return: (numpy.ndarray, bool) - the solution, and True if the iterations converged
+        """
+        shape = np.shape(u0)
+        u0 = np.atleast_1d(np.array(u0, dtype=float))
+        self.fresh = False
+        while True:
+            solve = self._linear_solver(gamma, u0, s)
+            u, du_norm_old = u0.copy(), None
+            for _ in range(NEWTON_MAX_ITER):
+                residual = func_to_minimise(u, *args)
+                if np.linalg.norm(residual) <= NEWTON_TOL * (1 + np.linalg.norm(u)):
+                    return u.reshape(shape), True
+                du = solve(residual)
+                u -= du
+                du_norm = np.linalg.norm(du)
+                if du_norm <= NEWTON_TOL * (1 + np.linalg.norm(u)):
+                    return u.reshape(shape), True
+                if du_norm_old is not None and du_norm >= du_norm_old:
+                    break
+                if du_norm_old is not None and du_norm > NEWTON_SLOW_RATE * du_norm_old and not self.fresh:
+                    self.jacobian = None
+                du_norm_old = du_norm
+            if self.fresh or self.jac_solve is not None:
+                return u.reshape(shape), False
+            self.jacobian = None
+
+
+def _krylov_solver(f, jvp, u, s, gamma, precondition):
+    r"""
+    Returns the matrix-free GMRES solver of :math:`I - \gamma J`, with :math:`J` the jacobian of ``f`` in ``(u, s)``
+
+    :param func f:
+    :param jvp: If given, ``jvp(u, s, v)`` computes :math:`Jv`. Otherwise, it is approximated with a finite difference
+     of ``f``
+    :type jvp: func or None
+    :param numpy.ndarray u:
+    :param float s:
+    :param float gamma:
+    :param precondition: If given, an approximation of the solver of :math:`I - \gamma J`
+    :type precondition: func or None
+    :return: func - the solver
+    """
+    if jvp is None:
+        f_u, norm_u = f(u, s), np.linalg.norm(u)
+
+        def jvp_u(v):
+            norm_v = np.linalg.norm(v)
+            if norm_v == 0:
+                return np.zeros(len(v))
+            eps = np.sqrt(np.finfo(float).eps) * (1 + norm_u) / norm_v
+            return (f(u + eps * v, s) - f_u) / eps
+    else:
+        def jvp_u(v): return jvp(u, s, v)
+
+    shape = (len(u), len(u))
+    a = scipy.sparse.linalg.LinearOperator(shape, matvec=lambda v: np.ravel(v) - gamma * jvp_u(np.ravel(v)),
+                                           dtype=float)
+    m = None
+    if precondition is not None:
+        m = scipy.sparse.linalg.LinearOperator(shape, matvec=lambda v: precondition(np.ravel(v)), dtype=float)
+
+    def solve(v):
+        return scipy.sparse.linalg.gmres(a, v, rtol=KRYLOV_RTOL, atol=0, restart=KRYLOV_RESTART, M=m)[0]
+
+    return solve
+
+
+class _NewtonKrylov(object):
+    r"""
+    Jacobian-free Newton-Krylov iterations on the implicit equation of a BDF step, whose jacobian is
+    :math:`I - \gamma J`
+
+    The jacobian is never formed: each Newton iteration solves with GMRES, using only products with :math:`J` given by
+    ``jvp`` or by finite differences of ``f``, so that the memory is O(d * ``KRYLOV_RESTART``).
+
+    :param func f: Function with well shaped input and output
+    :param jvp: ``jvp(y, t, v)`` computes the Jacobian of f applied to v, approximated with finite differences if None
+    :type jvp: func or None
+    :param preconditioner: ``preconditioner(gamma)`` returns an approximation of the solver of :math:`I - \gamma J`
+    :type preconditioner: func or None
+    """
+
+    def __init__(self, f, jvp, preconditioner):
+        self.f = f
+        self.jvp = jvp
+        self.preconditioner = preconditioner
+        self.gamma = None
+        self.precondition = None
+
+    def __call__(self, func_to_minimise, u0, args, gamma, s):
+        """
+        :param func func_to_minimise: The implicit equation, ``func_to_minimise(u, *args) = 0``
+        :param array_like u0: The initial guess
+        :param tuple args:
+        :param float gamma: The factor of :math:`J` in the jacobian of ``func_to_minimise``
+        :param float s: The time of the step, where the jacobian is evaluated
+        :return: (numpy.ndarray, bool) - the solution, and True if the iterations converged
+        """
+        shape = np.shape(u0)
+        u = np.atleast_1d(np.array(u0, dtype=float))
+        if self.preconditioner is not None and (self.gamma is None or abs(gamma - self.gamma) > 1E-10 * abs(gamma)):
+            self.precondition, self.gamma = self.preconditioner(gamma), gamma
+        for _ in range(NEWTON_MAX_ITER):
+            residual = func_to_minimise(u, *args)
+            if np.linalg.norm(residual) <= NEWTON_TOL * (1 + np.linalg.norm(u)):
+                return u.reshape(shape), True
+            du = _krylov_solver(self.f, self.jvp, u, s, gamma, self.precondition)(residual)
+            u -= du
+            if np.linalg.norm(du) <= NEWTON_TOL * (1 + np.linalg.norm(u)):
+                return u.reshape(shape), True
+        return u.reshape(shape), False
+
+    def state(self):
+        """
+        :return: dict - the factor of the preconditioner, from which it is built again
+        """
+        return dict(gamma=self.gamma)
+
+    def restore(self, state):
+        """
+        :param dict state: A state given by ``state``
+        """
+        if self.preconditioner is not None and state['gamma'] is not None:
+            self.precondition, self.gamma = self.preconditioner(state['gamma']), state['gamma']
+
+
+def _bdf_i(i, beta, y0, t, f, func_to_minimise, jac, jac_solve, jfnk, jvp, preconditioner, verbose, checkpoint,
+           resume):
+    n = len(t)
+    name = 'bdf_{0}'.format(i)
+    save, resume = saver(checkpoint, name, t), restore(resume, name, t)
     if verbose is False:
         count = Counter('', 0)
     elif verbose is True:
@@ -30,136 +290,212 @@ def _bdf_i(i, y0, t, f, func_to_minimise, jac_func_to_minimise, verbose):
     else:
         count = Counter(verbose, n)
 
-    y[:i] = rk_4(y0, t[:i], f, verbose=False)
-    for k in range(n - i):
-        result = scipy.optimize.root(func_to_minimise, y[k + i - 1], jac=jac_func_to_minimise,
-                                     args=tuple([t[k + i - 1], t[k + i]] + [y[k + j] for j in range(i)]), method='hybr')
-        if not result.success:
-            warnings.warn('\rBDF{0} : '.format(i) + result.message, stacklevel=2)
-        y[k + i] = result.x
+    if jfnk:
+        newton = _NewtonKrylov(f, jvp, preconditioner)
+    else:
+        newton = _ModifiedNewton(f, jac, jac_solve)
+
+    # The history window of the last i states
+    if resume is None:
+        y, k0 = list(rk_4.steps(y0, t[:i], f, verbose=False)), 0
+        for y_k in y:
+            yield y_k
+    else:
+        y, k0 = resume['window'], resume['i'] - i + 1
+        newton.restore(resume['newton'])
+        yield y[-1]
+    for k in range(k0, n - i):
+        args = tuple([t[k + i - 1], t[k + i]] + y)
+        gamma = beta * (t[k + i] - t[k + i - 1])
+        y_new, success = newton(func_to_minimise, y[-1], args, gamma, t[k + i])
+        if not success:
+            warnings.warn('\rBDF{0} : The Newton iterations did not converge'.format(i), stacklevel=2)
+        y = y[1:] + [y_new]
         count(k + i)
-    return y
+        save(k + i, lambda: dict(window=y, newton=newton.state()))
+        yield y_new
 
 
-def bdf_1(y0, t, f, verbose=True, jac=None, **_):
+@streaming
+def bdf_1(y0, t, f, verbose=True, jac=None, jac_solve=None, jfnk=False, jvp=None, preconditioner=None,
+          checkpoint=None, resume=None, **_):
     """
     BDF1 or Implicit Euler method
 
     :param array_like y0: Initial value, may be multi-dimensional of size d
     :param 1D_array t: Array of time steps, of size n
     :param func f: Function with well shaped input and output
-    :param jac: If given, the Jacobian of f, must return an array
+    :param jac: If given, the Jacobian of f, must return an array or a sparse matrix
     :type jac: func or None, optional
+    :param jac_solve: If given, ``jac_solve(gamma, v)`` must compute :math:`\\left(I - \\gamma J\\right)^{-1}v`
+     for the jacobian :math:`J`, which must then be constant. It is used instead of a factorization of the jacobian
+    :type jac_solve: func or None, optional
+    :param jfnk: If True, the implicit equation is solved with Jacobian-free Newton-Krylov iterations,
+     using only ``jvp`` or evaluations of ``f``
+    :type jfnk: bool, optional
+    :param jvp: If given with ``jfnk``, ``jvp(y, t, v)`` must compute the Jacobian of f applied to v
+    :type jvp: func or None, optional
+    :param preconditioner: If given with ``jfnk``, ``preconditioner(gamma)`` must return an approximation of the
+     solver :math:`v \\mapsto \\left(I - \\gamma J\\right)^{-1}v`, used to precondition the Krylov solves
+    :type preconditioner: func or None, optional
     :param verbose: If True or a string, displays a progress bar
     :type verbose: bool or str, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
     :return: numpy.ndarray - The solution, of shape (n, d)
     """
 
     def func_to_minimise(u, t0, t1, u0):
         return u - u0 - (t1 - t0) * f(u, t1)
 
-    if jac is None:
-        jacobian = None
-    else:
-        def jacobian(u, t0, t1, *_):
-            foo = jac(u, t1)
-            return np.eye(*foo.shape) - (t1 - t0) * foo
-
-    return _bdf_i(1, y0, t, f, func_to_minimise, jacobian, verbose)
+    return _bdf_i(1, 1., y0, t, f, func_to_minimise, jac, jac_solve, jfnk, jvp, preconditioner, verbose,
+                  checkpoint, resume)
 
 
-def bdf_2(y0, t, f, verbose=True, jac=None, **_):
+@streaming
+def bdf_2(y0, t, f, verbose=True, jac=None, jac_solve=None, jfnk=False, jvp=None, preconditioner=None,
+          checkpoint=None, resume=None, **_):
     """
     BDF2 method
 
     :param array_like y0: Initial value, may be multi-dimensional of size d
     :param 1D_array t: Array of time steps, of size n
     :param func f: Function with well shaped input and output
-    :param jac: If given, the Jacobian of f, must return an array
+    :param jac: If given, the Jacobian of f, must return an array or a sparse matrix
     :type jac: func or None, optional
+    :param jac_solve: If given, ``jac_solve(gamma, v)`` must compute :math:`\\left(I - \\gamma J\\right)^{-1}v`
+     for the jacobian :math:`J`, which must then be constant. It is used instead of a factorization of the jacobian
+    :type jac_solve: func or None, optional
+    :param jfnk: If True, the implicit equation is solved with Jacobian-free Newton-Krylov iterations,
+     using only ``jvp`` or evaluations of ``f``
+    :type jfnk: bool, optional
+    :param jvp: If given with ``jfnk``, ``jvp(y, t, v)`` must compute the Jacobian of f applied to v
+    :type jvp: func or None, optional
+    :param preconditioner: If given with ``jfnk``, ``preconditioner(gamma)`` must return an approximation of the
+     solver :math:`v \\mapsto \\left(I - \\gamma J\\right)^{-1}v`, used to precondition the Krylov solves
+    :type preconditioner: func or None, optional
     :param verbose: If True or a string, displays a progress bar
     :type verbose: bool or str, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
     :return: numpy.ndarray - The solution, of shape (n, d)
     """
 
     def func_to_minimise(u, t1, t2, u0, u1):
         return u - 4. * u1 / 3. + u0 / 3. - 2. * (t2 - t1) * f(u, t2) / 3.
 
-    if jac is None:
-        jacobian = None
-    else:
-        def jacobian(u, t1, t2, *_):
-            foo = jac(u, t2)
-            return np.eye(*foo.shape) - 2 * (t2 - t1) * foo / 3
-
-    return _bdf_i(2, y0, t, f, func_to_minimise, jacobian, verbose)
+    return _bdf_i(2, 2. / 3., y0, t, f, func_to_minimise, jac, jac_solve, jfnk, jvp, preconditioner, verbose,
+                  checkpoint, resume)
 
 
-def bdf_3(y0, t, f, verbose=True, jac=None, **_):
+@streaming
+def bdf_3(y0, t, f, verbose=True, jac=None, jac_solve=None, jfnk=False, jvp=None, preconditioner=None,
+          checkpoint=None, resume=None, **_):
     """
     BDF3 method
 
     :param array_like y0: Initial value, may be multi-dimensional of size d
     :param 1D_array t: Array of time steps, of size n
     :param func f: Function with well shaped input and output
-    :param jac: If given, the Jacobian of f, must return an array
+    :param jac: If given, the Jacobian of f, must return an array or a sparse matrix
     :type jac: func or None, optional
+    :param jac_solve: If given, ``jac_solve(gamma, v)`` must compute :math:`\\left(I - \\gamma J\\right)^{-1}v`
+     for the jacobian :math:`J`, which must then be constant. It is used instead of a factorization of the jacobian
+    :type jac_solve: func or None, optional
+    :param jfnk: If True, the implicit equation is solved with Jacobian-free Newton-Krylov iterations,
+     using only ``jvp`` or evaluations of ``f``
+    :type jfnk: bool, optional
+    :param jvp: If given with ``jfnk``, ``jvp(y, t, v)`` must compute the Jacobian of f applied to v
+    :type jvp: func or None, optional
+    :param preconditioner: If given with ``jfnk``, ``preconditioner(gamma)`` must return an approximation of the
+     solver :math:`v \\mapsto \\left(I - \\gamma J\\right)^{-1}v`, used to precondition the Krylov solves
+    :type preconditioner: func or None, optional
     :param verbose: If True or a string, displays a progress bar
     :type verbose: bool or str, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
     :return: numpy.ndarray - The solution, of shape (n, d)
     """
 
     def func_to_minimise(u, t2, t3, u0, u1, u2):
         return u - 18. * u2 / 11. + 9. * u1 / 11. - 2. * u0 / 11. - 6 * (t3 - t2) * f(u, t3) / 11.
 
-    if jac is None:
-        jacobian = None
-    else:
-        def jacobian(u, t2, t3, *_):
-            foo = jac(u, t3)
-            return np.eye(*foo.shape) - 6 * (t3 - t2) * foo / 11
-
-    return _bdf_i(3, y0, t, f, func_to_minimise, jacobian, verbose)
+    return _bdf_i(3, 6. / 11., y0, t, f, func_to_minimise, jac, jac_solve, jfnk, jvp, preconditioner, verbose,
+                  checkpoint, resume)
 
 
-def bdf_4(y0, t, f, verbose=True, jac=None, **_):
+@streaming
+def bdf_4(y0, t, f, verbose=True, jac=None, jac_solve=None, jfnk=False, jvp=None, preconditioner=None,
+          checkpoint=None, resume=None, **_):
     """
     BDF4 method
 
     :param array_like y0: Initial value, may be multi-dimensional of size d
     :param 1D_array t: Array of time steps, of size n
     :param func f: Function with well shaped input and output
-    :param jac: If given, the Jacobian of f, must return an array
+    :param jac: If given, the Jacobian of f, must return an array or a sparse matrix
     :type jac: func or None, optional
+    :param jac_solve: If given, ``jac_solve(gamma, v)`` must compute :math:`\\left(I - \\gamma J\\right)^{-1}v`
+     for the jacobian :math:`J`, which must then be constant. It is used instead of a factorization of the jacobian
+    :type jac_solve: func or None, optional
+    :param jfnk: If True, the implicit equation is solved with Jacobian-free Newton-Krylov iterations,
+     using only ``jvp`` or evaluations of ``f``
+    :type jfnk: bool, optional
+    :param jvp: If given with ``jfnk``, ``jvp(y, t, v)`` must compute the Jacobian of f applied to v
+    :type jvp: func or None, optional
+    :param preconditioner: If given with ``jfnk``, ``preconditioner(gamma)`` must return an approximation of the
+     solver :math:`v \\mapsto \\left(I - \\gamma J\\right)^{-1}v`, used to precondition the Krylov solves
+    :type preconditioner: func or None, optional
     :param verbose: If True or a string, displays a progress bar
     :type verbose: bool or str, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
     :return: numpy.ndarray - The solution, of shape (n, d)
     """
 
     def func_to_minimise(u, t3, t4, u0, u1, u2, u3):
         return u - 48. * u3 / 25. + 36. * u2 / 25. - 16. * u1 / 25. + 3. * u0 / 25. - 12 * (t4 - t3) * f(u, t4) / 25.
 
-    if jac is None:
-        jacobian = None
-    else:
-        def jacobian(u, t3, t4, *_):
-            foo = jac(u, t4)
-            return np.eye(*foo.shape) - 12 * (t4 - t3) * foo / 25
-
-    return _bdf_i(4, y0, t, f, func_to_minimise, jacobian, verbose)
+    return _bdf_i(4, 12. / 25., y0, t, f, func_to_minimise, jac, jac_solve, jfnk, jvp, preconditioner, verbose,
+                  checkpoint, resume)
 
 
-def bdf_5(y0, t, f, verbose=True, jac=None, **_):
+@streaming
+def bdf_5(y0, t, f, verbose=True, jac=None, jac_solve=None, jfnk=False, jvp=None, preconditioner=None,
+          checkpoint=None, resume=None, **_):
     """
     BDF5 method
 
     :param array_like y0: Initial value, may be multi-dimensional of size d
     :param 1D_array t: Array of time steps, of size n
     :param func f: Function with well shaped input and output
-    :param jac: If given, the Jacobian of f, must return an array
+    :param jac: If given, the Jacobian of f, must return an array or a sparse matrix
     :type jac: func or None, optional
+    :param jac_solve: If given, ``jac_solve(gamma, v)`` must compute :math:`\\left(I - \\gamma J\\right)^{-1}v`
+     for the jacobian :math:`J`, which must then be constant. It is used instead of a factorization of the jacobian
+    :type jac_solve: func or None, optional
+    :param jfnk: If True, the implicit equation is solved with Jacobian-free Newton-Krylov iterations,
+     using only ``jvp`` or evaluations of ``f``
+    :type jfnk: bool, optional
+    :param jvp: If given with ``jfnk``, ``jvp(y, t, v)`` must compute the Jacobian of f applied to v
+    :type jvp: func or None, optional
+    :param preconditioner: If given with ``jfnk``, ``preconditioner(gamma)`` must return an approximation of the
+     solver :math:`v \\mapsto \\left(I - \\gamma J\\right)^{-1}v`, used to precondition the Krylov solves
+    :type preconditioner: func or None, optional
     :param verbose: If True or a string, displays a progress bar
     :type verbose: bool or str, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
     :return: numpy.ndarray - The solution, of shape (n, d)
     """
 
@@ -167,27 +503,38 @@ def bdf_5(y0, t, f, verbose=True, jac=None, **_):
         return u - 300. * u4 / 137. + 300. * u3 / 137. - 200. * u2 / 137. + 75. * u1 / 137. - 12. * u0 / 137. \
                - 60 * (t5 - t4) * f(u, t5) / 137.
 
-    if jac is None:
-        jacobian = None
-    else:
-        def jacobian(u, t4, t5, *_):
-            foo = jac(u, t5)
-            return np.eye(*foo.shape) - 60 * (t5 - t4) * foo / 137
-
-    return _bdf_i(5, y0, t, f, func_to_minimise, jacobian, verbose)
+    return _bdf_i(5, 60. / 137., y0, t, f, func_to_minimise, jac, jac_solve, jfnk, jvp, preconditioner, verbose,
+                  checkpoint, resume)
 
 
-def bdf_6(y0, t, f, verbose=True, jac=None, **_):
+@streaming
+def bdf_6(y0, t, f, verbose=True, jac=None, jac_solve=None, jfnk=False, jvp=None, preconditioner=None,
+          checkpoint=None, resume=None, **_):
     """
     BDF6 method
 
     :param array_like y0: Initial value, may be multi-dimensional of size d
     :param 1D_array t: Array of time steps, of size n
     :param func f: Function with well shaped input and output
-    :param jac: If given, the Jacobian of f, must return an array
+    :param jac: If given, the Jacobian of f, must return an array or a sparse matrix
     :type jac: func or None, optional
+    :param jac_solve: If given, ``jac_solve(gamma, v)`` must compute :math:`\\left(I - \\gamma J\\right)^{-1}v`
+     for the jacobian :math:`J`, which must then be constant. It is used instead of a factorization of the jacobian
+    :type jac_solve: func or None, optional
+    :param jfnk: If True, the implicit equation is solved with Jacobian-free Newton-Krylov iterations,
+     using only ``jvp`` or evaluations of ``f``
+    :type jfnk: bool, optional
+    :param jvp: If given with ``jfnk``, ``jvp(y, t, v)`` must compute the Jacobian of f applied to v
+    :type jvp: func or None, optional
+    :param preconditioner: If given with ``jfnk``, ``preconditioner(gamma)`` must return an approximation of the
+     solver :math:`v \\mapsto \\left(I - \\gamma J\\right)^{-1}v`, used to precondition the Krylov solves
+    :type preconditioner: func or None, optional
     :param verbose: If True or a string, displays a progress bar
     :type verbose: bool or str, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
     :return: numpy.ndarray - The solution, of shape (n, d)
     """
 
@@ -201,11 +548,262 @@ def bdf_6(y0, t, f, verbose=True, jac=None, **_):
                + 10. * u0 / 147. \
                - 60 * (t6 - t5) * f(u, t6) / 147.
 
-    if jac is None:
-        jacobian = None
+    return _bdf_i(6, 60. / 147., y0, t, f, func_to_minimise, jac, jac_solve, jfnk, jvp, preconditioner, verbose,
+                  checkpoint, resume)
+
+
+VSVO_MAX_ORDER = 5
+"""Highest order of the variable order BDF method"""
+
+VSVO_NEWTON_MAX_ITER = 4
+"""Maximum number of simplified Newton iterations in a step of the variable order BDF method"""
+
+VSVO_MIN_FACTOR = 0.2
+"""Minimal factor between two consecutive step sizes of the variable order BDF method"""
+
+VSVO_MAX_FACTOR = 10.
+"""Maximal factor between two consecutive step sizes of the variable order BDF method"""
+
+
+def _difference_update_matrix(order, factor):
+    """
+    Returns the matrix changing the backward differences of order ``order`` of a constant step size ``h`` to the
+    backward differences of the step size ``factor * h``
+
+    :param int order:
+    :param float factor:
+    :return: numpy.ndarray - of shape (order + 1, order + 1)
+    """
+    i = np.arange(1, order + 1)[:, None]
+    j = np.arange(1, order + 1)
+    m = np.zeros((order + 1, order + 1))
+    m[1:, 1:] = (i - 1 - factor * j) / i
+    m[0] = 1
+    return np.cumprod(m, axis=0)
+
+
+def _change_step(differences, order, factor):
+    """
+    Changes in place the backward differences for a new step size ``factor`` times the previous one
+
+    :param numpy.ndarray differences:
+    :param int order:
+    :param float factor:
+    """
+    r = np.dot(_difference_update_matrix(order, factor), _difference_update_matrix(order, 1))
+    differences[:order + 1] = np.dot(r.T, differences[:order + 1])
+
+
+def _newton_vsvo(f, t_new, y_predict, c, psi, solve, scale, tol):
+    """
+    Simplified Newton iterations of a step of the variable order BDF method
+
+    :return: (bool, int, numpy.ndarray, numpy.ndarray) - True if the iterations converged, the number of iterations,
+     the solution and its difference with the prediction
+    """
+    y_new = y_predict.copy()
+    correction = np.zeros(len(y_predict))
+    dy_norm_old = None
+    for k in range(VSVO_NEWTON_MAX_ITER):
+        f_new = f(y_new, t_new)
+        if not np.all(np.isfinite(f_new)):
+            break
+        dy = solve(c * f_new - psi - correction)
+        dy_norm = _rms(dy / scale)
+        rate = None if dy_norm_old is None else dy_norm / dy_norm_old
+        if rate is not None and (rate >= 1 or rate ** (VSVO_NEWTON_MAX_ITER - k) / (1 - rate) * dy_norm > tol):
+            break
+        y_new += dy
+        correction += dy
+        if dy_norm == 0 or (rate is not None and rate / (1 - rate) * dy_norm < tol):
+            return True, k + 1, y_new, correction
+        dy_norm_old = dy_norm
+    return False, k + 1, y_new, correction
+
+
+@streaming
+def bdf_vsvo(y0, t, f, verbose=True, jac=None, rtol=1E-3, atol=1E-6, h0=None, max_order=VSVO_MAX_ORDER, jfnk=False,
+             jvp=None, preconditioner=None, checkpoint=None, resume=None, **_):
+    r"""
+    Variable step size, variable order BDF method, of orders 1 to 5
+
+    The past of the solution is stored as the backward differences :math:`\nabla^k y_n`, rescaled when the step size
+    changes. Each step is solved with simplified Newton iterations, reusing the factorization of
+    :math:`I - \frac{h}{\gamma_k}J` as long as the step size and the order do not change and the iterations converge.
+    The local error is estimated from the difference between the solution and its prediction. After k + 1 steps of
+    the same size at order k, the step size and the order are changed to the ones allowing the biggest step within
+    the tolerances. The solution at the times of ``t`` is interpolated with the backward differences.
+
+    See `Lawrence F. Shampine, Mark W. Reichelt - The MATLAB ODE Suite`
+
+    :param array_like y0: Initial value, may be multi-dimensional of size d
+    :param 1D_array t: Array of output times, of size n
+    :param func f: Function with well shaped input and output
+    :param verbose: If True or a string, displays a progress bar
+    :type verbose: bool or str, optional
+    :param jac: If given, the Jacobian of f, must return an array or a sparse matrix.
+     Otherwise, it is approximated with finite differences
+    :type jac: func or None, optional
+    :param rtol: The relative tolerance on the local error
+    :type rtol: float, optional
+    :param atol: The absolute tolerance on the local error
+    :type atol: float, optional
+    :param h0: The first step size, estimated from ``f(y0, t[0])`` if not given
+    :type h0: float or None, optional
+    :param max_order: The highest order allowed, from 1 to ``VSVO_MAX_ORDER``
+    :type max_order: int, optional
+    :param jfnk: If True, the linear systems of the simplified Newton iterations are solved with GMRES,
+     using only ``jvp`` or evaluations of ``f``
+    :type jfnk: bool, optional
+    :param jvp: If given with ``jfnk``, ``jvp(y, t, v)`` must compute the Jacobian of f applied to v
+    :type jvp: func or None, optional
+    :param preconditioner: If given with ``jfnk``, ``preconditioner(gamma)`` must return an approximation of the
+     solver :math:`v \\mapsto \\left(I - \\gamma J\\right)^{-1}v`, used to precondition the Krylov solves
+    :type preconditioner: func or None, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
+    :return: numpy.ndarray - The solution, of shape (n, d)
+    """
+    if not 1 <= max_order <= VSVO_MAX_ORDER:
+        raise ValueError('The highest order of bdf_vsvo must be between 1 and {0}'.format(VSVO_MAX_ORDER))
+    n = len(t)
+    save, resume = saver(checkpoint, 'bdf_vsvo', t), restore(resume, 'bdf_vsvo', t)
+    y_i = np.atleast_1d(np.array(y0, dtype=float))
+    d = len(y_i)
+    if verbose is False:
+        count = Counter('', 0)
+    elif verbose is True:
+        count = Counter('BDF VSVO', n)
     else:
-        def jacobian(u, t5, t6, *_):
-            foo = jac(u, t6)
-            return np.eye(*foo.shape) - 60 * (t6 - t5) * foo / 147
+        count = Counter(verbose, n)
+
+    if jfnk:
+        def linearize(u, s): return u.copy(), s
 
-    return _bdf_i(6, y0, t, f, func_to_minimise, jacobian, verbose)
+        def factorize(c, linearization):
+            precondition = None if preconditioner is None else preconditioner(c)
+            return _krylov_solver(f, jvp, linearization[0], linearization[1], c, precondition)
+    else:
+        if jac is None:
+            def jac(u, s): return _finite_difference_jacobian(f, u, s)
+
+        def linearize(u, s): return _to_dense_or_sparse(jac(u, s))
+
+        def factorize(c, jacobian):
+            if scipy.sparse.issparse(jacobian):
+                return _factorize(scipy.sparse.identity(d, format='csc') - c * jacobian)
+            return _factorize(np.eye(d) - c * jacobian)
+
+    gamma = np.append(0, np.cumsum(1 / np.arange(1, VSVO_MAX_ORDER + 1)))
+    error_const = 1 / np.arange(1, VSVO_MAX_ORDER + 2)
+    newton_tol = max(10 * np.finfo(float).eps / rtol, min(0.03, rtol ** 0.5))
+
+    t_end = t[-1]
+    if resume is None:
+        y_out = y_i.reshape(np.shape(y0))
+        yield y_out
+        t_i, k_out = t[0], 1
+        f_i = f(y_i, t_i)
+        if h0 is None:
+            scale = atol + rtol * abs(y_i)
+            d0, d1 = _rms(y_i / scale), _rms(f_i / scale)
+            h0 = 1E-6 if d0 < 1E-5 or d1 < 1E-5 else 0.01 * d0 / d1
+        h = min(h0, t_end - t_i)
+
+        differences = np.zeros((VSVO_MAX_ORDER + 3, d))
+        differences[0] = y_i
+        differences[1] = h * f_i
+        order, n_equal_steps = 1, 0
+        jacobian, current_jac, solve, c_solve = linearize(y_i, t_i), True, None, None
+    else:
+        y_out = resume['y']
+        yield y_out
+        t_i, k_out, h, order, n_equal_steps = resume['t_i'], resume['i'] + 1, resume['h'], resume['order'], \
+            resume['n_equal_steps']
+        differences, jacobian, current_jac = resume['differences'], resume['jacobian'], resume['current_jac']
+        c_solve = resume['c_solve']
+        solve = None if c_solve is None else factorize(c_solve, jacobian)
+
+    while k_out < n:
+        h_min = 10 * abs(np.nextafter(t_i, np.inf) - t_i)
+        if h < h_min:
+            factor = h_min / h
+            _change_step(differences, order, factor)
+            h, solve = h_min, None
+            warnings.warn('\rBDF VSVO : The step size is too small to reach the tolerances', stacklevel=2)
+
+        while True:
+            t_new = t_i + h
+            if t_new > t_end:
+                t_new = t_end
+                _change_step(differences, order, (t_new - t_i) / h)
+                n_equal_steps, solve = 0, None
+            h = t_new - t_i
+
+            y_predict = np.sum(differences[:order + 1], axis=0)
+            scale = atol + rtol * abs(y_predict)
+            psi = np.dot(differences[1:order + 1].T, gamma[1:order + 1]) / gamma[order]
+            c = h / gamma[order]
+
+            # Simplified Newton iterations, with a fresh jacobian if they do not converge
+            while True:
+                if solve is None:
+                    solve, c_solve = factorize(c, jacobian), c
+                converged, n_iter, y_new, correction = _newton_vsvo(f, t_new, y_predict, c, psi, solve, scale,
+                                                                   newton_tol)
+                if converged or current_jac:
+                    break
+                jacobian, current_jac, solve = linearize(y_predict, t_new), True, None
+
+            if not converged:
+                h *= 0.5
+                _change_step(differences, order, 0.5)
+                n_equal_steps, solve = 0, None
+                continue
+
+            safety = 0.9 * (2 * VSVO_NEWTON_MAX_ITER + 1) / (2 * VSVO_NEWTON_MAX_ITER + n_iter)
+            scale = atol + rtol * abs(y_new)
+            error_norm = _rms(error_const[order] * correction / scale)
+            if error_norm <= 1:
+                break
+            factor = max(VSVO_MIN_FACTOR, safety * error_norm ** (-1 / (order + 1)))
+            h *= factor
+            _change_step(differences, order, factor)
+            n_equal_steps = 0
+
+        # Updating the backward differences
+        differences[order + 2] = correction - differences[order + 1]
+        differences[order + 1] = correction
+        for k in range(order, -1, -1):
+            differences[k] += differences[k + 1]
+
+        # Interpolating the output times
+        while k_out < n and t[k_out] <= t_new:
+            x = (t[k_out] - (t_new - h * np.arange(order))) / (h * (1 + np.arange(order)))
+            y_out = (differences[0] + np.dot(differences[1:order + 1].T, np.cumprod(x))).reshape(np.shape(y0))
+            count(k_out)
+            k_out += 1
+            yield y_out
+
+        t_i, current_jac = t_new, False
+        n_equal_steps += 1
+        if n_equal_steps >= order + 1:
+            # Choosing the order and the step size of the next steps
+            error_norms = np.full(3, np.inf)
+            error_norms[1] = error_norm
+            if order > 1:
+                error_norms[0] = _rms(error_const[order - 1] * differences[order] / scale)
+            if order < max_order:
+                error_norms[2] = _rms(error_const[order + 1] * differences[order + 2] / scale)
+            with np.errstate(divide='ignore'):
+                factors = error_norms ** (-1 / np.arange(order, order + 3))
+            order += np.argmax(factors) - 1
+            factor = min(VSVO_MAX_FACTOR, safety * np.max(factors))
+            h *= factor
+            _change_step(differences, order, factor)
+            n_equal_steps, solve = 0, None
+        save(k_out - 1, lambda: dict(y=y_out, t_i=t_i, h=h, order=order, n_equal_steps=n_equal_steps,
+                                     differences=differences.copy(), jacobian=jacobian, current_jac=current_jac,
+                                     c_solve=None if solve is None else c_solve))
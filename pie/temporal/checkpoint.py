@@ -0,0 +1,109 @@
+r"""
+Checkpoints of the temporal methods, so that a long integration can be resumed after an interruption.
+
+Given a ``Checkpoint`` as the ``checkpoint`` keyword argument, a temporal method periodically saves its whole state:
+the current solution, the time step index, the history window of the multistep methods, the jacobian their
+factorization is built from, the step size and order of the adaptive methods...
+Given the loaded state as the ``resume`` keyword argument, and called again with the same arguments, the temporal method
+continues from it, bit-identically: the factorizations and the :math:`\varphi` matrices are built again from the same
+data, which gives the same values.
+
+Example:
+   >>> y = pie.temporal.bdf_2(y0, t, f, jac=jac, checkpoint=Checkpoint('run.pkl', seconds=600))
+   >>> # After an interruption:
+   >>> y = pie.temporal.bdf_2(y0, t, f, jac=jac, resume=load('run.pkl'))  # Same solution, from the checkpoint on
+"""
+
+import os
+import pickle
+import time
+
+
+class Checkpoint(object):
+    """
+    Saves the state of a temporal method every ``every`` time steps and / or every ``seconds`` seconds of wall time.
+    The file is replaced atomically, so that an interruption during a save keeps the previous checkpoint
+
+    :param str path: The checkpoint file
+    :param every: The number of time steps between two checkpoints
+    :type every: int or None, optional
+    :param seconds: The wall time between two checkpoints
+    :type seconds: float or None, optional
+    """
+
+    def __init__(self, path, every=None, seconds=None):
+        if every is None and seconds is None:
+            raise ValueError('A checkpoint needs an interval, either every or seconds')
+        self.path = path
+        self.every = every
+        self.seconds = seconds
+        self._last_i = None
+        self._last_time = time.time()
+
+    def __call__(self, method, i, t_i, state):
+        """
+        Saves the state if a checkpoint is due
+
+        :param str method: The name of the temporal method
+        :param int i: The index of the last computed time of ``t``
+        :param float t_i: The last computed time of ``t``
+        :param func state: Returns the state, as a dictionary. Only called if a checkpoint is due
+        """
+        if self._last_i is None:
+            self._last_i = i - 1
+        due = self.every is not None and i - self._last_i >= self.every
+        due = due or self.seconds is not None and time.time() - self._last_time >= self.seconds
+        if not due:
+            return
+        content = dict(state(), method=method, i=i, t=t_i)
+        with open(self.path + '.tmp', 'wb') as file:
+            pickle.dump(content, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(self.path + '.tmp', self.path)
+        self._last_i, self._last_time = i, time.time()
+
+
+def load(path):
+    """
+    Loads a checkpoint, to be given as the ``resume`` keyword argument of the temporal method
+
+    :param str path: The checkpoint file
+    :return: dict - the state of the temporal method
+    """
+    with open(path, 'rb') as file:
+        return pickle.load(file)
+
+
+def saver(checkpoint, method, t):
+    """
+    Returns the function saving the state of a temporal method, doing nothing without ``checkpoint``
+
+    :param checkpoint:
+    :type checkpoint: Checkpoint or None
+    :param str method: The name of the temporal method
+    :param 1D_array t: The array of time steps
+    :return: func - ``save(i, state)``, with ``state`` returning the state as a dictionary
+    """
+    if checkpoint is None:
+        def save(*_): return None
+    else:
+        def save(i, state): return checkpoint(method, i, t[i], state)
+    return save
+
+
+def restore(resume, method, t):
+    """
+    Checks that a loaded state belongs to the temporal method and to the array of time steps
+
+    :param resume:
+    :type resume: dict or None
+    :param str method: The name of the temporal method
+    :param 1D_array t: The array of time steps
+    :return: dict or None - ``resume``
+    """
+    if resume is None:
+        return None
+    if resume['method'] != method:
+        raise ValueError('Cannot resume {0} from a checkpoint of {1}'.format(method, resume['method']))
+    if not resume['i'] < len(t) or t[resume['i']] != resume['t']:
+        raise ValueError('The checkpoint does not match the time steps')
+    return resume
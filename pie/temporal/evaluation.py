@@ -0,0 +1,89 @@
+import numpy as np
+
+
+class Evaluation(object):
+    """
+    The right hand side and its derivatives at a given state and time, lazily evaluated:
+    each function is called at most once, however many times its value is used during a step.
+    The derivatives that are not given evaluate to None, so that the temporal methods can skip their terms.
+
+    :param array_like y: The state
+    :param float t: The time
+    :param func f: Function with well shaped input and output
+    :param jac: The Jacobian of f
+    :type jac: func or None, optional
+    :param hess: The Hessian of f. Not used if ``hess_vec`` is given
+    :type hess: func or None, optional
+    :param hess_vec: The Hessian of f applied to two vectors, ``hess_vec(y, t, u, v)``
+    :type hess_vec: func or None, optional
+    :param df_dt: The f partial derivative with respect to time
+    :type df_dt: func or None, optional
+    :param d2f_dt2: The f second-order partial derivative with respect to time
+    :type d2f_dt2: func or None, optional
+    :param d2f_dtdu: The f crossed partial derivative
+    :type d2f_dtdu: func or None, optional
+
+    Example:
+       >>> e = Evaluation(y, t, f, jac)
+       >>> w = e.f - e.jac.dot(y)  # f and jac are called once
+       >>> v = e.jac.dot(e.f)  # no new call
+    """
+
+    def __init__(self, y, t, f, jac=None, hess=None, hess_vec=None, df_dt=None, d2f_dt2=None, d2f_dtdu=None):
+        self.y = y
+        self.t = t
+        self._hess_vec = hess_vec
+        self._functions = {'f': f, 'jac': jac, 'hess': hess, 'df_dt': df_dt, 'd2f_dt2': d2f_dt2, 'd2f_dtdu': d2f_dtdu}
+        self._values = {}
+
+    def _evaluate(self, name):
+        if name not in self._values:
+            function = self._functions[name]
+            self._values[name] = None if function is None else function(self.y, self.t)
+        return self._values[name]
+
+    @property
+    def f(self):
+        return self._evaluate('f')
+
+    @property
+    def jac(self):
+        return self._evaluate('jac')
+
+    @property
+    def hess(self):
+        return self._evaluate('hess')
+
+    @property
+    def df_dt(self):
+        return self._evaluate('df_dt')
+
+    @property
+    def d2f_dt2(self):
+        return self._evaluate('d2f_dt2')
+
+    @property
+    def d2f_dtdu(self):
+        return self._evaluate('d2f_dtdu')
+
+    def hess_dot(self, u, v):
+        """
+        The Hessian applied to two vectors, with ``hess_vec`` if given, otherwise with the Hessian
+
+        :param array_like u:
+        :param array_like v:
+        :return: numpy.ndarray
+        """
+        if self._hess_vec is not None:
+            return self._hess_vec(self.y, self.t, u, v)
+        return np.dot(np.dot(self.hess, v), u)
+
+    def d2f_dtdu_dot(self, v):
+        """
+
+        :param array_like v:
+        :return: numpy.ndarray or None - the crossed partial derivative applied to ``v``, or None if not given
+        """
+        if self.d2f_dtdu is None:
+            return None
+        return np.dot(self.d2f_dtdu, v)
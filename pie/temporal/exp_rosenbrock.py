@@ -1,118 +1,144 @@
 import numpy as np
-from scipy.linalg import expm as expm_sp
 
-from ..linalg.krylov import expm_krylov
+from ..linalg.phi import phi_action
 from ..misc.counter import Counter
+from .checkpoint import restore, saver
+from .evaluation import Evaluation
+from .stream import streaming
 
 
-def rosen_exp_1(y0, t, f, jac, verbose=True, krylov_subspace_dim=None, **_):
+@streaming
+def rosen_exp_1(y0, t, f, jac, verbose=True, krylov_subspace_dim=None, jac_phi=None, krylov_tol=None,
+                checkpoint=None, resume=None, **_):
     """
     Order 1 Rosenbrock exponential method
 
     :param array_like y0: Initial value, may be multi-dimensional of size d
     :param 1D_array t: Array of time steps, of size n
     :param func f: Function with well shaped input and output
-    :param func jac: The Jacobian of f, must return an array
+    :param func jac: The Jacobian of f, must return an array, a sparse matrix or a ``LinearOperator``
     :param verbose: If True or a string, displays a progress bar
     :type verbose: bool or str, optional
-    :param krylov_subspace_dim: If given, uses the Krylov subspace approximation method of this dimension
+    :param krylov_subspace_dim: If given, uses the Krylov subspace approximation method of this dimension,
+     which only uses the products of the jacobian with vectors
     :type krylov_subspace_dim: None or int, optional
+    :param jac_phi: If given, ``jac_phi(h, w)`` must compute exactly
+     :math:`\\sum_{k=0}^{K}h^k\\varphi_k\\left(hJ\\right)w_k` for the jacobian :math:`J`, which must then be constant.
+     It is used instead of the exponential of the expanded matrix
+    :type jac_phi: func or None, optional
+    :param krylov_tol: If given, uses the adaptive Krylov subspace approximation method with this relative tolerance,
+     so that the dimensions of the subspaces are chosen at each step, ``krylov_subspace_dim`` being their maximum
+    :type krylov_tol: None or float, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
     :return: numpy.ndarray - The solution, of shape (n, d)
     """
-    try:
-        n, d = len(t), len(y0)
-        y = np.zeros((n, d))
-    except TypeError:
-        n, d = len(t), 1
-        y = np.zeros((n,))
+    n = len(t)
+    save, resume = saver(checkpoint, 'rosen_exp_1', t), restore(resume, 'rosen_exp_1', t)
+    y = np.array(y0, dtype=float)
+    d = y.size
     if verbose is False:
         count = Counter('', 0)
     elif verbose is True:
         count = Counter('Rosenbrock Exp 1', n)
     else:
         count = Counter(verbose, n)
-    y[0] = y0
-    w = np.zeros((d, 1))
-    expanded_vector = np.zeros((d + 1,))
-    expanded_vector[-1] = 1
-    expanded_matrix = np.zeros((d + 1, d + 1))
-    for i in range(n - 1):
+    i0 = 0
+    if resume is not None:
+        i0, y = resume['i'], resume['y']
+    yield y
+    if jac_phi is None:
+        def jac_phi_at(j_, h_, w_): return phi_action(j_, h_, w_, krylov_subspace_dim, krylov_tol)
+    else:
+        def jac_phi_at(_, h_, w_): return jac_phi(h_, w_)
+    w = np.zeros((2, d))
+    for i in range(i0, n - 1):
         h = t[i + 1] - t[i]
-        j = jac(y[i], t[i])
-        expanded_matrix[:d, :d] = j
-        w[:, -1] = f(y[i], t[i]) - np.dot(j, y[i])
-        expanded_vector[:d] = y[i]
-        expanded_matrix[:d, -1:] = w
-        if krylov_subspace_dim is None:
-            y[i + 1] = np.dot(expm_sp(h * expanded_matrix), expanded_vector)[:d]
-        else:
-            y[i + 1] = expm_krylov(h * expanded_matrix, expanded_vector, krylov_subspace_dim)[:d]
+        j = jac(y, t[i])
+        w[0] = y
+        w[1] = f(y, t[i]) - j.dot(y)
+        y = jac_phi_at(j, h, w).reshape(y.shape)
         count(i + 1)
-    return y
+        save(i + 1, lambda: dict(y=y))
+        yield y
 
 
-def rosen_exp_2(y0, t, f, jac, df_dt=None, verbose=True, krylov_subspace_dim=None, **_):
+@streaming
+def rosen_exp_2(y0, t, f, jac, df_dt=None, verbose=True, krylov_subspace_dim=None, jac_phi=None,
+                krylov_tol=None, checkpoint=None, resume=None, **_):
     """
     Order 2 Rosenbrock exponential method
 
     :param array_like y0: Initial value, may be multi-dimensional of size d
     :param 1D_array t: Array of time steps, of size n
     :param func f: Function with well shaped input and output
-    :param func jac: The Jacobian of f, must return an array
+    :param func jac: The Jacobian of f, must return an array, a sparse matrix or a ``LinearOperator``
     :param df_dt: The f partial derivative with respect to time
     :type df_dt: func or None, optional
     :param verbose: If True or a string, displays a progress bar
     :type verbose: bool or str, optional
-    :param krylov_subspace_dim: If given, uses the Krylov subspace approximation method of this dimension
+    :param krylov_subspace_dim: If given, uses the Krylov subspace approximation method of this dimension,
+     which only uses the products of the jacobian with vectors
     :type krylov_subspace_dim: None or int, optional
+    :param jac_phi: If given, ``jac_phi(h, w)`` must compute exactly
+     :math:`\\sum_{k=0}^{K}h^k\\varphi_k\\left(hJ\\right)w_k` for the jacobian :math:`J`, which must then be constant.
+     It is used instead of the exponential of the expanded matrix
+    :type jac_phi: func or None, optional
+    :param krylov_tol: If given, uses the adaptive Krylov subspace approximation method with this relative tolerance,
+     so that the dimensions of the subspaces are chosen at each step, ``krylov_subspace_dim`` being their maximum
+    :type krylov_tol: None or float, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
     :return: numpy.ndarray - The solution, of shape (n, d)
     """
-    try:
-        n, d = len(t), len(y0)
-        y = np.zeros((n, d))
-    except TypeError:
-        n, d = len(t), 1
-        y = np.zeros((n,))
+    n = len(t)
+    save, resume = saver(checkpoint, 'rosen_exp_2', t), restore(resume, 'rosen_exp_2', t)
+    y = np.array(y0, dtype=float)
+    d = y.size
     if verbose is False:
         count = Counter('', 0)
     elif verbose is True:
         count = Counter('Rosenbrock Exp 2', n)
     else:
         count = Counter(verbose, n)
-    if df_dt is None:
-        def df_dt(*_): return np.zeros((d,))
-    y[0] = y0
-    w = np.zeros((d, 2))
-    expanded_vector = np.zeros((d + 2,))
-    expanded_vector[-1] = 1
-    expanded_matrix = np.zeros((d + 2, d + 2))
-    expanded_matrix[-2:-1, -1:] = 1
-    for i in range(n - 1):
+    i0 = 0
+    if resume is not None:
+        i0, y = resume['i'], resume['y']
+    yield y
+    if jac_phi is None:
+        def jac_phi_at(j_, h_, w_): return phi_action(j_, h_, w_, krylov_subspace_dim, krylov_tol)
+    else:
+        def jac_phi_at(_, h_, w_): return jac_phi(h_, w_)
+    w = np.zeros((3, d))
+    for i in range(i0, n - 1):
         h = t[i + 1] - t[i]
-        j = jac(y[i], t[i])
-        expanded_matrix[:d, :d] = j
-        w[:, -1] = f(y[i], t[i]) - np.dot(j, y[i])
-        w[:, -2] = np.dot(jac(y[i], t[i]) - j, f(y[i], t[i])) + df_dt(y[i], t[i])
-        expanded_vector[:d] = y[i]
-        expanded_matrix[:d, -2:] = w
-        if krylov_subspace_dim is None:
-            y[i + 1] = np.dot(expm_sp(h * expanded_matrix), expanded_vector)[:d]
-        else:
-            y[i + 1] = expm_krylov(h * expanded_matrix, expanded_vector, krylov_subspace_dim)[:d]
+        e = Evaluation(y, t[i], f, jac, df_dt=df_dt)
+        w[0] = y
+        w[1] = e.f - e.jac.dot(y)
+        w[2] = 0 if df_dt is None else e.df_dt
+        y = jac_phi_at(e.jac, h, w).reshape(y.shape)
         count(i + 1)
-    return y
+        save(i + 1, lambda: dict(y=y))
+        yield y
 
 
-def rosen_exp_3(y0, t, f, jac, hess, df_dt=None, d2f_dt2=None, d2f_dtdu=None, verbose=True, krylov_subspace_dim=None,
-                **_):
+@streaming
+def rosen_exp_3(y0, t, f, jac, hess=None, df_dt=None, d2f_dt2=None, d2f_dtdu=None, verbose=True,
+                krylov_subspace_dim=None, hess_vec=None, jac_phi=None, krylov_tol=None,
+                checkpoint=None, resume=None, **_):
     """
     Order 3 Rosenbrock exponential method
 
     :param array_like y0: Initial value, may be multi-dimensional of size d
     :param 1D_array t: Array of time steps, of size n
     :param func f: Function with well shaped input and output
-    :param func jac: The Jacobian of f, must return an array
-    :param func hess: The Hessian of f, must return an array
+    :param func jac: The Jacobian of f, must return an array, a sparse matrix or a ``LinearOperator``
+    :param hess: The Hessian of f, must return an array. Not used if ``hess_vec`` is given
+    :type hess: func or None, optional
     :param df_dt: The f partial derivative with respect to time
     :type df_dt: func or None, optional
     :param d2f_dt2: The f second-order partial derivative with respect to time
@@ -121,50 +147,58 @@ def rosen_exp_3(y0, t, f, jac, hess, df_dt=None, d2f_dt2=None, d2f_dtdu=None, ve
     :type d2f_dtdu: func or None, optional
     :param verbose: If True or a string, displays a progress bar
     :type verbose: bool or str, optional
-    :param krylov_subspace_dim: If given, uses the Krylov subspace approximation method of this dimension
+    :param krylov_subspace_dim: If given, uses the Krylov subspace approximation method of this dimension,
+     which only uses the products of the jacobian with vectors
     :type krylov_subspace_dim: None or int, optional
+    :param hess_vec: The Hessian of f applied to two vectors, ``hess_vec(y, t, u, v)``, must return an array.
+     If given, the Hessian is never formed
+    :type hess_vec: func or None, optional
+    :param jac_phi: If given, ``jac_phi(h, w)`` must compute exactly
+     :math:`\\sum_{k=0}^{K}h^k\\varphi_k\\left(hJ\\right)w_k` for the jacobian :math:`J`, which must then be constant.
+     It is used instead of the exponential of the expanded matrix
+    :type jac_phi: func or None, optional
+    :param krylov_tol: If given, uses the adaptive Krylov subspace approximation method with this relative tolerance,
+     so that the dimensions of the subspaces are chosen at each step, ``krylov_subspace_dim`` being their maximum
+    :type krylov_tol: None or float, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
     :return: numpy.ndarray - The solution, of shape (n, d)
     """
-    try:
-        n, d = len(t), len(y0)
-        y = np.zeros((n, d))
-    except TypeError:
-        n, d = len(t), 1
-        y = np.zeros((n,))
+    if hess is None and hess_vec is None:
+        raise ValueError('rosen_exp_3 needs either hess or hess_vec')
+    n = len(t)
+    save, resume = saver(checkpoint, 'rosen_exp_3', t), restore(resume, 'rosen_exp_3', t)
+    y = np.array(y0, dtype=float)
+    d = y.size
     if verbose is False:
         count = Counter('', 0)
     elif verbose is True:
         count = Counter('Rosenbrock Exp 3', n)
     else:
         count = Counter(verbose, n)
-    if df_dt is None:
-        def df_dt(*_): return np.zeros((d,))
-    if d2f_dt2 is None:
-        def d2f_dt2(*_): return np.zeros((d,))
-    if d2f_dtdu is None:
-        def d2f_dtdu(*_): return np.zeros((d, d))
-    y[0] = y0
-    w = np.zeros((d, 3))
-    expanded_vector = np.zeros((d + 3,))
-    expanded_vector[-1] = 1
-    expanded_matrix = np.zeros((d + 3, d + 3))
-    expanded_matrix[-3:-1, -2:] = np.eye(2)
-    for i in range(n - 1):
+    i0 = 0
+    if resume is not None:
+        i0, y = resume['i'], resume['y']
+    yield y
+    if jac_phi is None:
+        def jac_phi_at(j_, h_, w_): return phi_action(j_, h_, w_, krylov_subspace_dim, krylov_tol)
+    else:
+        def jac_phi_at(_, h_, w_): return jac_phi(h_, w_)
+    w = np.zeros((4, d))
+    for i in range(i0, n - 1):
         h = t[i + 1] - t[i]
-        j = jac(y[i], t[i])
-        expanded_matrix[:d, :d] = j
-        w[:, -1] = f(y[i], t[i]) - np.dot(j, y[i])
-        w[:, -2] = np.dot(jac(y[i], t[i]) - j, f(y[i], t[i])) + df_dt(y[i], t[i])
-        w[:, -3] = np.dot(np.dot(hess(y[i], t[i]), f(y[i], t[i])), f(y[i], t[i])) \
-                   + np.dot(jac(y[i], t[i]) - j, np.dot(jac(y[i], t[i]), y[i])) \
-                   + np.dot(jac(y[i], t[i]) - j, df_dt(y[i], t[i])) \
-                   + 2 * np.dot(d2f_dtdu(y[i], t[i]), f(y[i], t[i])) \
-                   + d2f_dt2(y[i], t[i])
-        expanded_vector[:d] = y[i]
-        expanded_matrix[:d, -3:] = w
-        if krylov_subspace_dim is None:
-            y[i + 1] = np.dot(expm_sp(h * expanded_matrix), expanded_vector)[:d]
-        else:
-            y[i + 1] = expm_krylov(h * expanded_matrix, expanded_vector, krylov_subspace_dim)[:d]
+        e = Evaluation(y, t[i], f, jac, hess, hess_vec, df_dt, d2f_dt2, d2f_dtdu)
+        w[0] = y
+        w[1] = e.f - e.jac.dot(y)
+        w[2] = 0 if df_dt is None else e.df_dt
+        w[3] = e.hess_dot(e.f, e.f)
+        if d2f_dtdu is not None:
+            w[3] += 2 * e.d2f_dtdu_dot(e.f)
+        if d2f_dt2 is not None:
+            w[3] += e.d2f_dt2
+        y = jac_phi_at(e.jac, h, w).reshape(y.shape)
         count(i + 1)
-    return y
+        save(i + 1, lambda: dict(y=y))
+        yield y
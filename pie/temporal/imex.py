@@ -0,0 +1,418 @@
+r"""
+IMEX (implicit - explicit) methods, for a right hand side split in a stiff part, linear in :math:`y`, and a non stiff
+part:
+
+.. math::
+   f\left(y, t\right) = f_{stiff}\left(y, t\right) + f_{nonstiff}\left(y, t\right)
+   = J_{stiff}y + f_{nonstiff}\left(y, t\right)
+
+The stiff part, such as the diffusion, is treated implicitly, and the non stiff part, such as the convection,
+explicitly. The implicit stages are all solved with the solver of :math:`I - \gamma J_{stiff}` given by
+``stiff_solver(gamma)``, which is only built again when :math:`\gamma` changes, that is once for constant time steps.
+The step size is then limited by the convection only.
+
+The spatial methods splitting their right hand side give ``rhs_stiff``, ``rhs_nonstiff`` and ``stiff_solver``.
+
+The IMEX RK methods are the ARS(1, 1, 1), ARS(2, 2, 2) and ARS(4, 4, 3) methods of Ascher, Ruuth and Spiteri
+(*Implicit-explicit Runge-Kutta methods for time-dependent partial differential equations*, 1997),
+whose implicit part is a singly diagonally implicit RK method. The SBDF methods are the IMEX BDF methods of Ascher,
+Ruuth and Wetton (*Implicit-explicit methods for time-dependent partial differential equations*, 1995), extrapolating
+the non stiff part from the previous steps. Their coefficients are those of constant time steps: they start with
+``imex_rk_3`` steps, and restart the same way after a change of the time step, such as a trimmed last step.
+"""
+
+import numpy as np
+
+from .checkpoint import restore, saver
+from .stream import streaming
+from ..misc.counter import Counter
+
+A_ARS111 = np.array([[0., 0.],
+                     [0., 1.]])
+"""The *a* array of the implicit part of the ARS(1, 1, 1) method"""
+
+B_ARS111 = np.array([0., 1.])
+"""The *b* array of the implicit part of the ARS(1, 1, 1) method"""
+
+A_HAT_ARS111 = np.array([[0., 0.],
+                         [1., 0.]])
+"""The *a* array of the explicit part of the ARS(1, 1, 1) method"""
+
+B_HAT_ARS111 = np.array([1., 0.])
+"""The *b* array of the explicit part of the ARS(1, 1, 1) method"""
+
+_GAMMA_ARS222 = 1 - np.sqrt(2) / 2
+_DELTA_ARS222 = 1 - 1 / (2 * _GAMMA_ARS222)
+
+A_ARS222 = np.array([[0., 0., 0.],
+                     [0., _GAMMA_ARS222, 0.],
+                     [0., 1 - _GAMMA_ARS222, _GAMMA_ARS222]])
+"""The *a* array of the implicit part of the ARS(2, 2, 2) method"""
+
+B_ARS222 = np.array([0., 1 - _GAMMA_ARS222, _GAMMA_ARS222])
+"""The *b* array of the implicit part of the ARS(2, 2, 2) method"""
+
+A_HAT_ARS222 = np.array([[0., 0., 0.],
+                         [_GAMMA_ARS222, 0., 0.],
+                         [_DELTA_ARS222, 1 - _DELTA_ARS222, 0.]])
+"""The *a* array of the explicit part of the ARS(2, 2, 2) method"""
+
+B_HAT_ARS222 = np.array([_DELTA_ARS222, 1 - _DELTA_ARS222, 0.])
+"""The *b* array of the explicit part of the ARS(2, 2, 2) method"""
+
+A_ARS443 = np.array([[0., 0., 0., 0., 0.],
+                     [0., 1. / 2, 0., 0., 0.],
+                     [0., 1. / 6, 1. / 2, 0., 0.],
+                     [0., -1. / 2, 1. / 2, 1. / 2, 0.],
+                     [0., 3. / 2, -3. / 2, 1. / 2, 1. / 2]])
+"""The *a* array of the implicit part of the ARS(4, 4, 3) method"""
+
+B_ARS443 = np.array([0., 3. / 2, -3. / 2, 1. / 2, 1. / 2])
+"""The *b* array of the implicit part of the ARS(4, 4, 3) method"""
+
+A_HAT_ARS443 = np.array([[0., 0., 0., 0., 0.],
+                         [1. / 2, 0., 0., 0., 0.],
+                         [11. / 18, 1. / 18, 0., 0., 0.],
+                         [5. / 6, -5. / 6, 1. / 2, 0., 0.],
+                         [1. / 4, 7. / 4, 3. / 4, -7. / 4, 0.]])
+"""The *a* array of the explicit part of the ARS(4, 4, 3) method"""
+
+B_HAT_ARS443 = np.array([1. / 4, 7. / 4, 3. / 4, -7. / 4, 0.])
+"""The *b* array of the explicit part of the ARS(4, 4, 3) method"""
+
+SBDF_STEP_RTOL = 1E-8
+"""Relative tolerance on the time steps of the history window of the SBDF methods, for it to be uniform"""
+
+
+class _StiffSolver(object):
+    r"""
+    Solves the linear systems with :math:`I - \gamma J_{stiff}`, keeping the solver given by ``stiff_solver`` until
+    :math:`\gamma` changes
+
+    :param func stiff_solver: ``stiff_solver(gamma)`` returns the solver :math:`v \mapsto
+     \left(I - \gamma J_{stiff}\right)^{-1}v`
+    """
+
+    def __init__(self, stiff_solver):
+        self.stiff_solver = stiff_solver
+        self.gamma = None
+        self.solve = None
+
+    def __call__(self, gamma, v):
+        if self.solve is None or abs(gamma - self.gamma) > 1E-10 * abs(gamma):
+            self.solve, self.gamma = self.stiff_solver(gamma), gamma
+        return self.solve(v)
+
+    def state(self):
+        """
+        :return: float or None - the factor of the current solver, from which it is built again
+        """
+        return self.gamma
+
+    def restore(self, gamma):
+        """
+        :param gamma: A factor given by ``state``
+        :type gamma: float or None
+        """
+        if gamma is not None:
+            self.solve, self.gamma = self.stiff_solver(gamma), gamma
+
+
+def _split(f, rhs_stiff, rhs_nonstiff, stiff_solver):
+    """
+    :return: func - the non stiff part of the right hand side, ``f - rhs_stiff`` if not given
+    """
+    if stiff_solver is None:
+        raise ValueError('The IMEX methods need the solver of the stiff part, stiff_solver')
+    if rhs_nonstiff is None:
+        if rhs_stiff is None:
+            raise ValueError('The IMEX methods need either the stiff or the non stiff part of the right hand side')
+
+        def rhs_nonstiff(y, t): return f(y, t) - rhs_stiff(y, t)
+    return rhs_nonstiff
+
+
+def _counter(verbose, text, n):
+    if verbose is False:
+        return Counter('', 0)
+    elif verbose is True:
+        return Counter(text, n)
+    return Counter(verbose, n)
+
+
+def _imex_rk(name, a, b, a_hat, b_hat, y0, t, f, rhs_stiff, rhs_nonstiff, stiff_solver, verbose, checkpoint, resume):
+    n = len(t)
+    save, resume = saver(checkpoint, name, t), restore(resume, name, t)
+    count = _counter(verbose, name.upper().replace('_', ' ', 1), n)
+    rhs_nonstiff = _split(f, rhs_stiff, rhs_nonstiff, stiff_solver)
+    solve = _StiffSolver(stiff_solver)
+
+    q = a.shape[0]
+    c = np.sum(a_hat, axis=1)
+
+    # The stages whose stiff and non stiff right hand sides are used by the next stages or by the step
+    needs_stiff = [a[j, j] == 0 and (np.any(a[j + 1:, j]) or b[j] != 0) for j in range(q)]
+    needs_nonstiff = [np.any(a_hat[j + 1:, j]) or b_hat[j] != 0 for j in range(q)]
+    if rhs_stiff is None and any(needs_stiff):
+        raise ValueError('The IMEX method {0} needs the stiff part of the right hand side, rhs_stiff'.format(name))
+
+    if resume is None:
+        i0, y = 0, np.array(y0, dtype=float)
+    else:
+        i0, y = resume['i'], resume['y']
+        solve.restore(resume['gamma'])
+    k_stiff, k_nonstiff = np.zeros((q,) + y.shape), np.zeros((q,) + y.shape)
+    yield y
+    for i in range(i0, n - 1):
+        h = t[i + 1] - t[i]
+        for j in range(q):
+            z = y + h * (np.tensordot(a_hat[j, :j], k_nonstiff[:j], axes=1)
+                         + np.tensordot(a[j, :j], k_stiff[:j], axes=1))
+            if a[j, j] == 0:
+                y_j = z
+                if needs_stiff[j]:
+                    k_stiff[j] = rhs_stiff(y_j, t[i] + h * c[j])
+            else:
+                y_j = solve(h * a[j, j], z)
+                k_stiff[j] = (y_j - z) / (h * a[j, j])
+            if needs_nonstiff[j]:
+                k_nonstiff[j] = rhs_nonstiff(y_j, t[i] + h * c[j])
+        y = y + h * (np.tensordot(b_hat, k_nonstiff, axes=1) + np.tensordot(b, k_stiff, axes=1))
+        count(i + 1)
+        save(i + 1, lambda: dict(y=y, gamma=solve.state()))
+        yield y
+
+
+@streaming
+def imex_rk_1(y0, t, f, verbose=True, rhs_stiff=None, rhs_nonstiff=None, stiff_solver=None, checkpoint=None,
+              resume=None, **_):
+    """
+    IMEX Euler method, or ARS(1, 1, 1): implicit Euler on the stiff part and explicit Euler on the non stiff part
+
+    :param array_like y0: Initial value, may be multi-dimensional of size d
+    :param 1D_array t: Array of time steps, of size n
+    :param func f: Function with well shaped input and output
+    :param verbose: If True or a string, displays a progress bar
+    :type verbose: bool or str, optional
+    :param rhs_stiff: ``rhs_stiff(y, t)`` computes the stiff part of f, which must be linear in y
+    :type rhs_stiff: func or None, optional
+    :param rhs_nonstiff: ``rhs_nonstiff(y, t)`` computes the non stiff part of f, ``f - rhs_stiff`` if not given
+    :type rhs_nonstiff: func or None, optional
+    :param stiff_solver: ``stiff_solver(gamma)`` must return the solver
+     :math:`v \\mapsto \\left(I - \\gamma J_{stiff}\\right)^{-1}v` for the constant jacobian of the stiff part
+    :type stiff_solver: func
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
+    :return: numpy.ndarray - The solution, of shape (n, d)
+    """
+    return _imex_rk('imex_rk_1', A_ARS111, B_ARS111, A_HAT_ARS111, B_HAT_ARS111, y0, t, f, rhs_stiff, rhs_nonstiff,
+                    stiff_solver, verbose, checkpoint, resume)
+
+
+@streaming
+def imex_rk_2(y0, t, f, verbose=True, rhs_stiff=None, rhs_nonstiff=None, stiff_solver=None, checkpoint=None,
+              resume=None, **_):
+    """
+    ARS(2, 2, 2) IMEX RK method, of order 2 and L-stable on the stiff part
+
+    :param array_like y0: Initial value, may be multi-dimensional of size d
+    :param 1D_array t: Array of time steps, of size n
+    :param func f: Function with well shaped input and output
+    :param verbose: If True or a string, displays a progress bar
+    :type verbose: bool or str, optional
+    :param rhs_stiff: ``rhs_stiff(y, t)`` computes the stiff part of f, which must be linear in y
+    :type rhs_stiff: func or None, optional
+    :param rhs_nonstiff: ``rhs_nonstiff(y, t)`` computes the non stiff part of f, ``f - rhs_stiff`` if not given
+    :type rhs_nonstiff: func or None, optional
+    :param stiff_solver: ``stiff_solver(gamma)`` must return the solver
+     :math:`v \\mapsto \\left(I - \\gamma J_{stiff}\\right)^{-1}v` for the constant jacobian of the stiff part
+    :type stiff_solver: func
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
+    :return: numpy.ndarray - The solution, of shape (n, d)
+    """
+    return _imex_rk('imex_rk_2', A_ARS222, B_ARS222, A_HAT_ARS222, B_HAT_ARS222, y0, t, f, rhs_stiff, rhs_nonstiff,
+                    stiff_solver, verbose, checkpoint, resume)
+
+
+@streaming
+def imex_rk_3(y0, t, f, verbose=True, rhs_stiff=None, rhs_nonstiff=None, stiff_solver=None, checkpoint=None,
+              resume=None, **_):
+    """
+    ARS(4, 4, 3) IMEX RK method, of order 3 and L-stable on the stiff part
+
+    :param array_like y0: Initial value, may be multi-dimensional of size d
+    :param 1D_array t: Array of time steps, of size n
+    :param func f: Function with well shaped input and output
+    :param verbose: If True or a string, displays a progress bar
+    :type verbose: bool or str, optional
+    :param rhs_stiff: ``rhs_stiff(y, t)`` computes the stiff part of f, which must be linear in y
+    :type rhs_stiff: func or None, optional
+    :param rhs_nonstiff: ``rhs_nonstiff(y, t)`` computes the non stiff part of f, ``f - rhs_stiff`` if not given
+    :type rhs_nonstiff: func or None, optional
+    :param stiff_solver: ``stiff_solver(gamma)`` must return the solver
+     :math:`v \\mapsto \\left(I - \\gamma J_{stiff}\\right)^{-1}v` for the constant jacobian of the stiff part
+    :type stiff_solver: func
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
+    :return: numpy.ndarray - The solution, of shape (n, d)
+    """
+    return _imex_rk('imex_rk_3', A_ARS443, B_ARS443, A_HAT_ARS443, B_HAT_ARS443, y0, t, f, rhs_stiff, rhs_nonstiff,
+                    stiff_solver, verbose, checkpoint, resume)
+
+
+def _sbdf_i(i, alpha, beta, gamma, y0, t, f, rhs_stiff, rhs_nonstiff, stiff_solver, verbose, checkpoint, resume):
+    r"""
+    The SBDF method of order ``i``, with constant time steps:
+    :math:`y_{k+1} = \sum_j\alpha_jy_{k-j} + \gamma h\left(\sum_j\beta_jf_{nonstiff}\left(y_{k-j}\right)
+    + f_{stiff}\left(y_{k+1}\right)\right)`,
+    the ``alpha`` and ``beta`` coefficients being given from the oldest to the newest state of the history window.
+    The steps whose history window is not uniform are ``imex_rk_3`` steps
+    """
+    n = len(t)
+    name = 'sbdf_{0}'.format(i)
+    save, resume = saver(checkpoint, name, t), restore(resume, name, t)
+    count = _counter(verbose, 'SBDF{0}'.format(i), n)
+    rhs_nonstiff = _split(f, rhs_stiff, rhs_nonstiff, stiff_solver)
+    solve = _StiffSolver(stiff_solver)
+
+    # The history windows of the last i states and of their non stiff right hand sides
+    if resume is None:
+        y = list(imex_rk_3.steps(y0, t[:i], f, verbose=False, rhs_stiff=rhs_stiff, rhs_nonstiff=rhs_nonstiff,
+                                 stiff_solver=stiff_solver))
+        g, k0 = [rhs_nonstiff(y_k, t_k) for y_k, t_k in zip(y, t)], 0
+        for y_k in y:
+            yield y_k
+    else:
+        y, g, k0 = resume['window'], resume['nonstiff_window'], resume['i'] - i + 1
+        solve.restore(resume['gamma'])
+        yield y[-1]
+    for k in range(k0, n - i):
+        h = t[k + i] - t[k + i - 1]
+        if np.max(abs(np.diff(t[k:k + i + 1]) - h)) <= SBDF_STEP_RTOL * abs(h):
+            y_new = solve(gamma * h, np.tensordot(alpha, y, axes=1) + gamma * h * np.tensordot(beta, g, axes=1))
+        else:
+            y_new = list(imex_rk_3.steps(y[-1], t[k + i - 1:k + i + 1], f, verbose=False, rhs_stiff=rhs_stiff,
+                                         rhs_nonstiff=rhs_nonstiff, stiff_solver=stiff_solver))[-1]
+        y, g = y[1:] + [y_new], g[1:] + [rhs_nonstiff(y_new, t[k + i])]
+        count(k + i)
+        save(k + i, lambda: dict(window=y, nonstiff_window=g, gamma=solve.state()))
+        yield y_new
+
+
+@streaming
+def sbdf_1(y0, t, f, verbose=True, rhs_stiff=None, rhs_nonstiff=None, stiff_solver=None, checkpoint=None,
+           resume=None, **_):
+    """
+    SBDF1 or IMEX Euler method, the same as ``imex_rk_1``
+
+    :param array_like y0: Initial value, may be multi-dimensional of size d
+    :param 1D_array t: Array of time steps, of size n, restarting with ``imex_rk_3`` when the time step changes
+    :param func f: Function with well shaped input and output
+    :param verbose: If True or a string, displays a progress bar
+    :type verbose: bool or str, optional
+    :param rhs_stiff: ``rhs_stiff(y, t)`` computes the stiff part of f, which must be linear in y
+    :type rhs_stiff: func or None, optional
+    :param rhs_nonstiff: ``rhs_nonstiff(y, t)`` computes the non stiff part of f, ``f - rhs_stiff`` if not given
+    :type rhs_nonstiff: func or None, optional
+    :param stiff_solver: ``stiff_solver(gamma)`` must return the solver
+     :math:`v \\mapsto \\left(I - \\gamma J_{stiff}\\right)^{-1}v` for the constant jacobian of the stiff part
+    :type stiff_solver: func
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
+    :return: numpy.ndarray - The solution, of shape (n, d)
+    """
+    return _sbdf_i(1, np.array([1.]), np.array([1.]), 1.,
+                   y0, t, f, rhs_stiff, rhs_nonstiff, stiff_solver, verbose, checkpoint, resume)
+
+
+@streaming
+def sbdf_2(y0, t, f, verbose=True, rhs_stiff=None, rhs_nonstiff=None, stiff_solver=None, checkpoint=None,
+           resume=None, **_):
+    """
+    SBDF2 method, BDF2 on the stiff part and a second order extrapolation of the non stiff part
+
+    :param array_like y0: Initial value, may be multi-dimensional of size d
+    :param 1D_array t: Array of time steps, of size n, restarting with ``imex_rk_3`` when the time step changes
+    :param func f: Function with well shaped input and output
+    :param verbose: If True or a string, displays a progress bar
+    :type verbose: bool or str, optional
+    :param rhs_stiff: ``rhs_stiff(y, t)`` computes the stiff part of f, which must be linear in y
+    :type rhs_stiff: func or None, optional
+    :param rhs_nonstiff: ``rhs_nonstiff(y, t)`` computes the non stiff part of f, ``f - rhs_stiff`` if not given
+    :type rhs_nonstiff: func or None, optional
+    :param stiff_solver: ``stiff_solver(gamma)`` must return the solver
+     :math:`v \\mapsto \\left(I - \\gamma J_{stiff}\\right)^{-1}v` for the constant jacobian of the stiff part
+    :type stiff_solver: func
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
+    :return: numpy.ndarray - The solution, of shape (n, d)
+    """
+    return _sbdf_i(2, np.array([-1. / 3, 4. / 3]), np.array([-1., 2.]), 2. / 3,
+                   y0, t, f, rhs_stiff, rhs_nonstiff, stiff_solver, verbose, checkpoint, resume)
+
+
+@streaming
+def sbdf_3(y0, t, f, verbose=True, rhs_stiff=None, rhs_nonstiff=None, stiff_solver=None, checkpoint=None,
+           resume=None, **_):
+    """
+    SBDF3 method, BDF3 on the stiff part and a third order extrapolation of the non stiff part
+
+    :param array_like y0: Initial value, may be multi-dimensional of size d
+    :param 1D_array t: Array of time steps, of size n, restarting with ``imex_rk_3`` when the time step changes
+    :param func f: Function with well shaped input and output
+    :param verbose: If True or a string, displays a progress bar
+    :type verbose: bool or str, optional
+    :param rhs_stiff: ``rhs_stiff(y, t)`` computes the stiff part of f, which must be linear in y
+    :type rhs_stiff: func or None, optional
+    :param rhs_nonstiff: ``rhs_nonstiff(y, t)`` computes the non stiff part of f, ``f - rhs_stiff`` if not given
+    :type rhs_nonstiff: func or None, optional
+    :param stiff_solver: ``stiff_solver(gamma)`` must return the solver
+     :math:`v \\mapsto \\left(I - \\gamma J_{stiff}\\right)^{-1}v` for the constant jacobian of the stiff part
+    :type stiff_solver: func
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
+    :return: numpy.ndarray - The solution, of shape (n, d)
+    """
+    return _sbdf_i(3, np.array([2. / 11, -9. / 11, 18. / 11]), np.array([1., -3., 3.]), 6. / 11,
+                   y0, t, f, rhs_stiff, rhs_nonstiff, stiff_solver, verbose, checkpoint, resume)
+
+
+@streaming
+def sbdf_4(y0, t, f, verbose=True, rhs_stiff=None, rhs_nonstiff=None, stiff_solver=None, checkpoint=None,
+           resume=None, **_):
+    """
+    SBDF4 method, BDF4 on the stiff part and a fourth order extrapolation of the non stiff part
+
+    :param array_like y0: Initial value, may be multi-dimensional of size d
+    :param 1D_array t: Array of time steps, of size n, restarting with ``imex_rk_3`` when the time step changes
+    :param func f: Function with well shaped input and output
+    :param verbose: If True or a string, displays a progress bar
+    :type verbose: bool or str, optional
+    :param rhs_stiff: ``rhs_stiff(y, t)`` computes the stiff part of f, which must be linear in y
+    :type rhs_stiff: func or None, optional
+    :param rhs_nonstiff: ``rhs_nonstiff(y, t)`` computes the non stiff part of f, ``f - rhs_stiff`` if not given
+    :type rhs_nonstiff: func or None, optional
+    :param stiff_solver: ``stiff_solver(gamma)`` must return the solver
+     :math:`v \\mapsto \\left(I - \\gamma J_{stiff}\\right)^{-1}v` for the constant jacobian of the stiff part
+    :type stiff_solver: func
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
+    :return: numpy.ndarray - The solution, of shape (n, d)
+    """
+    return _sbdf_i(4, np.array([-3. / 25, 16. / 25, -36. / 25, 48. / 25]), np.array([-1., 4., -6., 4.]), 12. / 25,
+                   y0, t, f, rhs_stiff, rhs_nonstiff, stiff_solver, verbose, checkpoint, resume)
@@ -0,0 +1,114 @@
+r"""
+`Parareal <https://en.wikipedia.org/wiki/Parareal>`_ on Wikipedia.
+
+The time steps are split into slices. A cheap coarse propagator :math:`\mathcal{G}` sweeps the slices sequentially,
+while an accurate fine propagator :math:`\mathcal{F}` solves all the slices concurrently, in separate processes.
+At the iteration k, the initial values of the slices are corrected with:
+
+.. math::
+   U_{s+1}^{k+1} = \mathcal{G}\left(U_s^{k+1}\right) + \mathcal{F}\left(U_s^k\right) - \mathcal{G}\left(U_s^k\right)
+
+so that after k iterations, the first k slices are exactly those of the fine propagator.
+The iterations stop when the largest correction is within the tolerance, relatively to the solution.
+
+The fine propagator, ``f`` and the keyword arguments are sent to the worker processes, and therefore must be
+picklable, as the temporal methods of :mod:`pie.temporal` and the bound methods of the spatial methods are.
+
+Example:
+   >>> y = parareal(y0, t, method.rhs, pie.temporal.rk_4, coarse=pie.temporal.bdf_1, n_slices=32, jac=method.jac)
+"""
+
+import concurrent.futures
+import os
+import warnings
+
+import numpy as np
+
+from .rk import rk_1
+from ..misc.counter import Counter
+
+
+def parareal(y0, t, f, fine, coarse=rk_1, n_slices=None, n_coarse=1, tol=1E-8, max_iter=None, max_workers=None,
+             verbose=True, **kwargs):
+    """
+    Parareal method, solving the time slices concurrently with a fine temporal method, corrected by the sequential
+    sweeps of a coarse one
+
+    :param array_like y0: Initial value, may be multi-dimensional of size d
+    :param 1D_array t: Array of time steps, of size n, on which the fine temporal method is run
+    :param func f: Function with well shaped input and output
+    :param func fine: The fine temporal method
+    :param coarse: The coarse temporal method
+    :type coarse: func, optional
+    :param n_slices: The number of time slices, the number of CPUs by default
+    :type n_slices: int or None, optional
+    :param n_coarse: The number of time steps of the coarse temporal method in a slice
+    :type n_coarse: int, optional
+    :param tol: The tolerance on the largest correction of an iteration, relatively to the solution
+    :type tol: float, optional
+    :param max_iter: The maximal number of iterations, ``n_slices`` by default, for which Parareal is exact
+    :type max_iter: int or None, optional
+    :param max_workers: The number of worker processes, the number of CPUs by default
+    :type max_workers: int or None, optional
+    :param verbose: If True or a string, displays a progress bar over the iterations
+    :type verbose: bool or str, optional
+    :param kwargs: The keyword arguments of the fine and of the coarse temporal methods
+    :return: numpy.ndarray - The solution, of shape (n, d)
+    """
+    n = len(t)
+    if n_slices is None:
+        n_slices = os.cpu_count() or 1
+    n_slices = max(1, min(n_slices, n - 1))
+    if max_iter is None:
+        max_iter = n_slices
+    if verbose is False:
+        count = Counter('', 0)
+    elif verbose is True:
+        count = Counter('Parareal', max_iter)
+    else:
+        count = Counter(verbose, max_iter)
+    name = verbose if verbose and verbose is not True else 'Parareal'
+
+    bounds = np.linspace(0, n - 1, n_slices + 1).astype(int)
+
+    def propagate_coarse(y, s):
+        return coarse(y, np.linspace(t[bounds[s]], t[bounds[s + 1]], n_coarse + 1), f, verbose=False, **kwargs)[-1]
+
+    u = [np.array(y0, dtype=float)]
+    for s in range(n_slices):
+        u.append(propagate_coarse(u[s], s))
+    g = u[1:]
+
+    y = np.zeros((n,) + u[0].shape)
+    y[0] = u[0]
+    count(-1)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for k in range(max_iter):
+            futures = [executor.submit(fine, u[s], t[bounds[s]:bounds[s + 1] + 1], f, verbose=False, **kwargs)
+                       for s in range(k, n_slices)]
+            for s, future in zip(range(k, n_slices), futures):
+                y[bounds[s] + 1:bounds[s + 1] + 1] = future.result()[1:]
+
+            # Sequential correction with the coarse propagator, the slice k being already exact
+            correction = 0.
+            for s in range(k, n_slices):
+                if s == k:
+                    u_new = y[bounds[s + 1]].copy()
+                else:
+                    g_new = propagate_coarse(u[s], s)
+                    u_new = g_new + y[bounds[s + 1]] - g[s]
+                    g[s] = g_new
+                if not np.all(np.isfinite(u_new)):
+                    warnings.warn('\r{0} : The solution is not finite at the iteration {1}'.format(name, k + 1),
+                                  stacklevel=2)
+                    return y
+                correction = np.maximum(correction, np.max(abs(u_new - u[s + 1])))
+                u[s + 1] = u_new
+            correction /= np.maximum(np.max([np.max(abs(u_s)) for u_s in u]), np.finfo(float).tiny)
+
+            if correction <= tol or k + 1 == n_slices:
+                count(max_iter - 1)
+                return y
+            count(k)
+    warnings.warn('\r{0} : The iterations did not converge'.format(name), stacklevel=2)
+    return y
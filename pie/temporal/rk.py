@@ -1,13 +1,27 @@
 r"""
 `RK methods <https://en.wikipedia.org/wiki/Runge%E2%80%93Kutta_methods>`_ on Wikipedia.
+
+Ensembles:
+   The fixed step methods advance a stack of m initial conditions ``y0`` of shape (m, d) all together, with a single
+   call of ``f`` per stage, as long as ``f`` is vectorized over the first axis, as the right hand sides of the
+   spatial methods are. The solution is then of shape (n, m, d).
+
+   Given ``ensemble=True``, the adaptive methods also control the step size of each member separately: the members
+   that still have to step are all advanced with a single call of ``f`` per stage, each with its own step size, so
+   that ``f`` is given a stack of states and an array of times of shape (m, 1, ...), broadcasting against the states.
 """
 
+import warnings
+
 import numpy as np
 
+from .checkpoint import restore, saver
+from .stream import streaming
 from ..misc.counter import Counter
 
 
-def rk_1(y0, t, f, verbose=True, **_):
+@streaming
+def rk_1(y0, t, f, verbose=True, checkpoint=None, resume=None, **_):
     """
     RK1 or Explicit Euler method
 
@@ -16,28 +30,31 @@ def rk_1(y0, t, f, verbose=True, **_):
     :param func f: Function with well shaped input and output
     :param verbose: If True or a string, displays a progress bar
     :type verbose: bool or str, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
     :return: numpy.ndarray - The solution, of shape (n, d)
     """
-    try:
-        n, d = len(t), len(y0)
-        y = np.zeros((n, d))
-    except TypeError:
-        n = len(t)
-        y = np.zeros((n,))
+    n = len(t)
     if verbose is False:
         count = Counter('', 0)
     elif verbose is True:
         count = Counter('RK1', n)
     else:
         count = Counter(verbose, n)
-    y[0] = y0
-    for i in range(n - 1):
-        y[i + 1] = y[i] + (t[i + 1] - t[i]) * f(y[i], t[i])
+    save, resume = saver(checkpoint, 'rk_1', t), restore(resume, 'rk_1', t)
+    i0, y = (0, np.array(y0, dtype=float)) if resume is None else (resume['i'], resume['y'])
+    yield y
+    for i in range(i0, n - 1):
+        y = y + (t[i + 1] - t[i]) * f(y, t[i])
         count(i + 1)
-    return y
+        save(i + 1, lambda: dict(y=y))
+        yield y
 
 
-def rk_2(y0, t, f, verbose=True, **_):
+@streaming
+def rk_2(y0, t, f, verbose=True, checkpoint=None, resume=None, **_):
     """
     RK2 or midpoint method
 
@@ -46,31 +63,34 @@ def rk_2(y0, t, f, verbose=True, **_):
     :param func f: Function with well shaped input and output
     :param verbose: If True or a string, displays a progress bar
     :type verbose: bool or str, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
     :return: numpy.ndarray - The solution, of shape (n, d)
     """
-    try:
-        n, d = len(t), len(y0)
-        y = np.zeros((n, d))
-    except TypeError:
-        n = len(t)
-        y = np.zeros((n,))
+    n = len(t)
     if verbose is False:
         count = Counter('', 0)
     elif verbose is True:
         count = Counter('RK2', n)
     else:
         count = Counter(verbose, n)
-    y[0] = y0
-    for i in range(n - 1):
+    save, resume = saver(checkpoint, 'rk_2', t), restore(resume, 'rk_2', t)
+    i0, y = (0, np.array(y0, dtype=float)) if resume is None else (resume['i'], resume['y'])
+    yield y
+    for i in range(i0, n - 1):
         h = t[i + 1] - t[i]
-        k1 = f(y[i], t[i])
-        k2 = f(y[i] + h * k1 / 2, t[i] + h / 2)
-        y[i + 1] = y[i] + h * k2
+        k1 = f(y, t[i])
+        k2 = f(y + h * k1 / 2, t[i] + h / 2)
+        y = y + h * k2
         count(i + 1)
-    return y
+        save(i + 1, lambda: dict(y=y))
+        yield y
 
 
-def rk_4(y0, t, f, verbose=True, **_):
+@streaming
+def rk_4(y0, t, f, verbose=True, checkpoint=None, resume=None, **_):
     """
     RK4 method
 
@@ -79,34 +99,36 @@ def rk_4(y0, t, f, verbose=True, **_):
     :param func f: Function with well shaped input and output
     :param verbose: If True or a string, displays a progress bar
     :type verbose: bool or str, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
     :return: numpy.ndarray - The solution, of shape (n, d)
     """
-    try:
-        n, d = len(t), len(y0)
-        y = np.zeros((n, d))
-    except TypeError:
-        n = len(t)
-        y = np.zeros((n,))
+    n = len(t)
     if verbose is False:
         count = Counter('', 0)
     elif verbose is True:
         count = Counter('RK4', n)
     else:
         count = Counter(verbose, n)
-    y[0] = y0
-    for i in range(n - 1):
+    save, resume = saver(checkpoint, 'rk_4', t), restore(resume, 'rk_4', t)
+    i0, y = (0, np.array(y0, dtype=float)) if resume is None else (resume['i'], resume['y'])
+    yield y
+    for i in range(i0, n - 1):
         h = t[i + 1] - t[i]
-        k1 = f(y[i], t[i])
-        k2 = f(y[i] + h * k1 / 2, t[i] + h / 2)
-        k3 = f(y[i] + h * k2 / 2, t[i] + h / 2)
-        k4 = f(y[i] + h * k3, t[i] + h)
-        y[i + 1] = y[i] + h * (k1 + 2 * k2 + 2 * k3 + k4) / 6
+        k1 = f(y, t[i])
+        k2 = f(y + h * k1 / 2, t[i] + h / 2)
+        k3 = f(y + h * k2 / 2, t[i] + h / 2)
+        k4 = f(y + h * k3, t[i] + h)
+        y = y + h * (k1 + 2 * k2 + 2 * k3 + k4) / 6
         count(i + 1)
-    return y
+        save(i + 1, lambda: dict(y=y))
+        yield y
 
 
-def rk_butcher(a, b):
-    """
+def rk_butcher(a, b, b_hat=None, order=None):
+    r"""
     Generic explicit s-stage RK method, using a Butcher tableau (*a*, *b*, *c*)
 
     The returned method is explicit, therefore only the strictly lower triangular part of *a* is used.
@@ -114,14 +136,29 @@ def rk_butcher(a, b):
     The *c* array is deduced from the *a* and the *b* array so that the method is consistent:
     :math:`c_{i}=\sum _{k=0}^{i-1}a_{ik}`
 
+    If an embedded *b_hat* array is given, the returned method is adaptive: the time steps are chosen with a PI
+    controller so that the local error estimate :math:`h\sum_i\left(b_i-\hat{b}_i\right)k_i` stays within the
+    ``rtol`` and ``atol`` tolerances, and the solution at the times of ``t`` is given by the cubic Hermite
+    interpolation of the steps. The derivative at the end of each accepted step is reused as the first stage of the
+    next one: an accepted step then costs s - 1 evaluations of ``f`` with a FSAL (first same as last) tableau, whose
+    last stage is this derivative, and s evaluations otherwise.
+
     :param 2D_array a: The *a* array of the Butcher tableau, of shape (s, s)
     :param 2D_array b: The *b* array of the Butcher tableau, of shape (s,)
+    :param b_hat: The *b* array of the embedded method, of shape (s,)
+    :type b_hat: 1D_array or None, optional
+    :param order: The order of the error estimate, that is the lowest order of the two methods. Needed with *b_hat*
+    :type order: int or None, optional
     :return: func - the wanted Runge Kutta method
     """
     q = a.shape[0]
     c = np.array([np.sum(a[i, :i]) for i in range(q)])
 
-    def rk_method(y0, t, f, verbose=True, **_):
+    if b_hat is not None:
+        return _rk_butcher_adaptive(a, b, b_hat, order, c)
+
+    @streaming
+    def rk_method(y0, t, f, verbose=True, checkpoint=None, resume=None, **_):
         """
         RK method from given Butcher tableau
 
@@ -130,36 +167,238 @@ def rk_butcher(a, b):
         :param func f: Function with well shaped input and output
         :param verbose: If True or a string, displays a progress bar
         :type verbose: bool or str, optional
+        :param checkpoint: If given, periodically saves the state of the method
+        :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+        :param resume: If given, the state loaded from a checkpoint, from which the method continues
+        :type resume: dict or None, optional
         :return: numpy.ndarray - The solution, of shape (n, d)
         """
-        try:
-            n, d = len(t), len(y0)
-            y = np.zeros((n, d))
-            p = np.zeros((q, d))
-        except TypeError:
-            n = len(t)
-            y = np.zeros((n,))
-            p = np.zeros((q,))
+        n = len(t)
+        save, resume = saver(checkpoint, 'rk_butcher', t), restore(resume, 'rk_butcher', t)
+        i0, y = (0, np.array(y0, dtype=float)) if resume is None else (resume['i'], resume['y'])
+        p = np.zeros((q,) + y.shape)
         if verbose is False:
             count = Counter('', 0)
         elif verbose is True:
             count = Counter('RK_butcher', n)
         else:
             count = Counter(verbose, n)
-        y[0] = y0
-        for i in range(n - 1):
+        yield y
+        for i in range(i0, n - 1):
             h = t[i + 1] - t[i]
             for j in range(q):
-                if p.ndim > 1:
-                    p[j] = f(y[i] + h * np.sum(a[j, :j, None] * p[:j], axis=0), t[i] + h * c[j])
-                else:
-                    p[j] = f(y[i] + h * np.sum(a[j, :j] * p[:j]), t[i] + h * c[j])
-            if p.ndim > 1:
-                y[i + 1] = y[i] + h * np.sum(b[:, None] * p, axis=0)
-            else:
-                y[i + 1] = y[i] + h * np.sum(b * p)
+                p[j] = f(y + h * np.tensordot(a[j, :j], p[:j], axes=1), t[i] + h * c[j])
+            y = y + h * np.tensordot(b, p, axes=1)
             count(i + 1)
-        return y
+            save(i + 1, lambda: dict(y=y))
+            yield y
+
+    return rk_method
+
+
+SAFETY = 0.9
+"""Safety factor of the adaptive step size controller"""
+
+MIN_FACTOR = 0.2
+"""Minimal factor between two consecutive step sizes"""
+
+MAX_FACTOR = 10.
+"""Maximal factor between two consecutive step sizes"""
+
+ENSEMBLE_WINDOW = 8
+"""Number of output indices the dense outputs of an ensemble may be ahead of its slowest member"""
+
+
+def _rk_butcher_adaptive(a, b, b_hat, order, c):
+    if order is None:
+        raise ValueError('The order of the error estimate is needed with an embedded method')
+    q = a.shape[0]
+    e = b - b_hat
+    fsal = np.allclose(a[-1], b)
+
+    # PI controller exponents
+    alpha = 0.7 / (order + 1)
+    beta = 0.4 / (order + 1)
+
+    @streaming
+    def rk_method(y0, t, f, verbose=True, rtol=1E-3, atol=1E-6, h0=None, ensemble=False, checkpoint=None, resume=None,
+                  **_):
+        """
+        Adaptive RK method from given Butcher tableau and its embedded method
+
+        :param array_like y0: Initial value, may be multi-dimensional of size d
+        :param 1D_array t: Array of increasing output times, of size n
+        :param func f: Function with well shaped input and output
+        :param verbose: If True or a string, displays a progress bar
+        :type verbose: bool or str, optional
+        :param rtol: The relative tolerance on the local error
+        :type rtol: float, optional
+        :param atol: The absolute tolerance on the local error
+        :type atol: float, optional
+        :param h0: The first step size, estimated from ``f(y0, t[0])`` if not given
+        :type h0: float or None, optional
+        :param ensemble: If True, ``y0`` is a stack of m initial conditions of shape (m, d), each with its own step size
+        :type ensemble: bool, optional
+        :param checkpoint: If given, periodically saves the state of the method
+        :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+        :param resume: If given, the state loaded from a checkpoint, from which the method continues
+        :type resume: dict or None, optional
+        :return: numpy.ndarray - The solution, of shape (n, d)
+        """
+        n = len(t)
+        if np.any(np.diff(t) < 0):
+            raise ValueError('The output times of the adaptive RK methods must be increasing')
+        save, resume = saver(checkpoint, 'rk_butcher_adaptive', t), restore(resume, 'rk_butcher_adaptive', t)
+        y_i = np.array(y0, dtype=float)
+        p = np.zeros((q,) + y_i.shape)
+        if verbose is False:
+            count = Counter('', 0)
+        elif verbose is True:
+            count = Counter('RK_butcher', n)
+        else:
+            count = Counter(verbose, n)
+        if ensemble:
+            yield from _ensemble_steps(y_i, p, t, f, count, rtol, atol, h0, save, resume)
+            return
+
+        t_i, t_end, k = t[0], t[-1], 1
+        if resume is None:
+            yield y_i
+            p[0] = f(y_i, t_i)
+            if h0 is None:
+                scale = atol + rtol * abs(y_i)
+                d0, d1 = np.sqrt(np.mean((y_i / scale) ** 2)), np.sqrt(np.mean((p[0] / scale) ** 2))
+                h0 = 1E-6 if d0 < 1E-5 or d1 < 1E-5 else 0.01 * d0 / d1
+            h, err_previous = min(h0, t_end - t_i), 1.
+        else:
+            yield resume['y']
+            t_i, y_i, p[0], h, err_previous = resume['t_i'], resume['y_i'], resume['f_i'], resume['h'], resume['err']
+            k = resume['i'] + 1
+        y_k = None
+        while k < n:
+            h_min = 16 * np.finfo(float).eps * max(abs(t_i), 1)
+            last = t_end - t_i - h < h_min
+            if last:
+                h = t_end - t_i
+            for j in range(1, q):
+                p[j] = f(y_i + h * np.tensordot(a[j, :j], p[:j], axes=1), t_i + h * c[j])
+            y_new = y_i + h * np.tensordot(b, p, axes=1)
+            scale = atol + rtol * np.maximum(abs(y_i), abs(y_new))
+            err = max(np.sqrt(np.mean((h * np.tensordot(e, p, axes=1) / scale) ** 2)), 1E-10)
+
+            if err > 1 and h > h_min:
+                h *= max(MIN_FACTOR, SAFETY * err ** -alpha)
+                continue
+            if err > 1:
+                warnings.warn('\rRK_butcher : The step size is too small to reach the tolerances', stacklevel=2)
+
+            t_new = t_end if last else t_i + h
+            f_new = p[-1] if fsal else f(y_new, t_new)
+
+            # Dense output with the cubic Hermite interpolation
+            while k < n and t[k] <= t_new:
+                theta = (t[k] - t_i) / h
+                y_k = (1 - theta) * y_i + theta * y_new \
+                    + theta * (theta - 1) * ((1 - 2 * theta) * (y_new - y_i) + (theta - 1) * h * p[0]
+                                             + theta * h * f_new)
+                count(k)
+                k += 1
+                yield y_k
+
+            factor = min(MAX_FACTOR, max(MIN_FACTOR, SAFETY * err ** -alpha * err_previous ** beta))
+            t_i, y_i, p[0], err_previous = t_new, y_new, f_new, err
+            h = min(h * factor, t_end - t_i)
+            if y_k is not None:
+                save(k - 1, lambda: dict(y=y_k, t_i=t_i, y_i=y_i, f_i=p[0].copy(), h=h, err=err_previous))
+
+    def _ensemble_steps(y_i, p, t, f, count, rtol, atol, h0, save, resume):
+        """
+        The adaptive RK method on a stack of m initial conditions, each member having its own step size and its own
+        output index ``k``. The last accepted step of each member is kept, and the dense outputs are only computed up
+        to ``ENSEMBLE_WINDOW`` output indices ahead of the slowest member, so that the memory does not grow with n:
+        a member only takes a new step once all the output times of its last step are computed
+        """
+        n, m, t_end = len(t), y_i.shape[0], t[-1]
+        axes, shape = tuple(range(1, y_i.ndim)), (-1,) + (y_i.ndim - 1) * (1,)
+        if resume is None:
+            t_i, k, k_out, pending = np.full(m, t[0]), np.ones(m, dtype=int), 1, {}
+            yield y_i.copy()
+            p[0] = f(y_i, t_i.reshape(shape))
+            if h0 is None:
+                scale = atol + rtol * abs(y_i)
+                d0 = np.sqrt(np.mean((y_i / scale) ** 2, axis=axes))
+                d1 = np.sqrt(np.mean((p[0] / scale) ** 2, axis=axes))
+                h = np.where((d0 < 1E-5) | (d1 < 1E-5), 1E-6, 0.01 * d0 / np.maximum(d1, 1E-5))
+            else:
+                h = np.full(m, float(h0))
+            h, err_previous = np.minimum(h, t_end - t_i), np.ones(m)
+            t_0, y_0, f_0, h_0 = t_i.copy(), y_i.copy(), p[0].copy(), h.copy()
+        else:
+            yield resume['y']
+            t_i, y_i, p[0], h, err_previous = resume['t_i'], resume['y_i'], resume['f_i'], resume['h'], resume['err']
+            t_0, y_0, f_0, h_0 = resume['t_0'], resume['y_0'], resume['f_0'], resume['h_0']
+            k, k_out, pending = resume['k'], resume['i'] + 1, resume['pending']
+        while k_out < n:
+            # Dense output with the cubic Hermite interpolation on the last steps, for the members in the window
+            while True:
+                covered = np.flatnonzero((k < min(n, k_out + ENSEMBLE_WINDOW)) & (t[np.minimum(k, n - 1)] <= t_i))
+                if covered.size == 0:
+                    break
+                k_c, h_c = k[covered], h_0[covered].reshape(shape)
+                theta = ((t[k_c] - t_0[covered]) / h_0[covered]).reshape(shape)
+                y_a, y_b = y_0[covered], y_i[covered]
+                y_k = (1 - theta) * y_a + theta * y_b \
+                    + theta * (theta - 1) * ((1 - 2 * theta) * (y_b - y_a) + (theta - 1) * h_c * f_0[covered]
+                                             + theta * h_c * p[0, covered])
+                for k_cov in np.unique(k_c):
+                    members = k_c == k_cov
+                    pending.setdefault(k_cov, np.zeros(y_i.shape))[covered[members]] = y_k[members]
+                k[covered] += 1
+
+            y_k = None
+            while k_out < n and k.min() > k_out:
+                y_k = pending.pop(k_out)
+                count(k_out)
+                k_out += 1
+                yield y_k
+            if y_k is not None:
+                save(k_out - 1, lambda: dict(y=y_k, t_i=t_i.copy(), y_i=y_i.copy(), f_i=p[0].copy(), h=h.copy(),
+                                             err=err_previous.copy(), t_0=t_0.copy(), y_0=y_0.copy(), f_0=f_0.copy(),
+                                             h_0=h_0.copy(), k=k.copy(), pending=pending.copy()))
+
+            active = np.flatnonzero((k < n) & (t[np.minimum(k, n - 1)] > t_i))
+            if active.size == 0:
+                continue
+            t_a, y_a, h_a, p_a = t_i[active], y_i[active], h[active], p[:, active]
+            h_min = 16 * np.finfo(float).eps * np.maximum(abs(t_a), 1)
+            last = t_end - t_a - h_a < h_min
+            h_a = np.where(last, t_end - t_a, h_a)
+            h[active] = h_a
+            for j in range(1, q):
+                p_a[j] = f(y_a + h_a.reshape(shape) * np.tensordot(a[j, :j], p_a[:j], axes=1),
+                           (t_a + h_a * c[j]).reshape(shape))
+            y_new = y_a + h_a.reshape(shape) * np.tensordot(b, p_a, axes=1)
+            scale = atol + rtol * np.maximum(abs(y_a), abs(y_new))
+            err = np.sqrt(np.mean((h_a.reshape(shape) * np.tensordot(e, p_a, axes=1) / scale) ** 2, axis=axes))
+            err = np.maximum(err, 1E-10)
+
+            rejected = (err > 1) & (h_a > h_min)
+            h[active[rejected]] *= np.maximum(MIN_FACTOR, SAFETY * err[rejected] ** -alpha)
+            if np.any(err[~rejected] > 1):
+                warnings.warn('\rRK_butcher : The step size is too small to reach the tolerances', stacklevel=2)
+            accepted = np.flatnonzero(~rejected)
+            if accepted.size == 0:
+                continue
+            index, t_a, y_a, h_a, err = active[accepted], t_a[accepted], y_a[accepted], h_a[accepted], err[accepted]
+            y_new, p_a = y_new[accepted], p_a[:, accepted]
+            t_new = np.where(last[accepted], t_end, t_a + h_a)
+            f_new = p_a[-1] if fsal else f(y_new, t_new.reshape(shape))
+
+            factor = np.minimum(MAX_FACTOR, np.maximum(MIN_FACTOR, SAFETY * err ** -alpha
+                                                       * err_previous[index] ** beta))
+            t_0[index], y_0[index], f_0[index], h_0[index] = t_a, y_a, p_a[0], h_a
+            t_i[index], y_i[index], p[0, index], err_previous[index] = t_new, y_new, f_new, err
+            h[index] = np.minimum(h_a * factor, t_end - t_new)
 
     return rk_method
 
@@ -172,3 +411,40 @@ A_RK4 = np.array([[0., 0., 0, 0],
 
 B_RK4 = np.array([1. / 6, 1. / 3, 1. / 3, 1. / 6])
 """The *b* array for the RK4 Butcher tableau"""
+
+A_DP54 = np.array([[0., 0., 0., 0., 0., 0., 0.],
+                   [1. / 5, 0., 0., 0., 0., 0., 0.],
+                   [3. / 40, 9. / 40, 0., 0., 0., 0., 0.],
+                   [44. / 45, -56. / 15, 32. / 9, 0., 0., 0., 0.],
+                   [19372. / 6561, -25360. / 2187, 64448. / 6561, -212. / 729, 0., 0., 0.],
+                   [9017. / 3168, -355. / 33, 46732. / 5247, 49. / 176, -5103. / 18656, 0., 0.],
+                   [35. / 384, 0., 500. / 1113, 125. / 192, -2187. / 6784, 11. / 84, 0.]])
+"""The *a* array for the Dormand - Prince 5(4) Butcher tableau"""
+
+B_DP54 = np.array([35. / 384, 0., 500. / 1113, 125. / 192, -2187. / 6784, 11. / 84, 0.])
+"""The *b* array for the Dormand - Prince 5(4) Butcher tableau, of order 5"""
+
+B_HAT_DP54 = np.array([5179. / 57600, 0., 7571. / 16695, 393. / 640, -92097. / 339200, 187. / 2100, 1. / 40])
+"""The embedded *b* array for the Dormand - Prince 5(4) Butcher tableau, of order 4"""
+
+A_BS32 = np.array([[0., 0., 0., 0.],
+                   [1. / 2, 0., 0., 0.],
+                   [0., 3. / 4, 0., 0.],
+                   [2. / 9, 1. / 3, 4. / 9, 0.]])
+"""The *a* array for the Bogacki - Shampine 3(2) Butcher tableau"""
+
+B_BS32 = np.array([2. / 9, 1. / 3, 4. / 9, 0.])
+"""The *b* array for the Bogacki - Shampine 3(2) Butcher tableau, of order 3"""
+
+B_HAT_BS32 = np.array([7. / 24, 1. / 4, 1. / 3, 1. / 8])
+"""The embedded *b* array for the Bogacki - Shampine 3(2) Butcher tableau, of order 2"""
+
+rk_dp54 = rk_butcher(A_DP54, B_DP54, B_HAT_DP54, 4)
+"""Adaptive Dormand - Prince 5(4) method, see :func:`rk_butcher`"""
+
+rk_bs32 = rk_butcher(A_BS32, B_BS32, B_HAT_BS32, 2)
+"""Adaptive Bogacki - Shampine 3(2) method, see :func:`rk_butcher`"""
+
+# Named after the module attributes, so that they can be pickled, for instance to be sent to worker processes
+rk_dp54.__name__ = rk_dp54.__qualname__ = 'rk_dp54'
+rk_bs32.__name__ = rk_bs32.__qualname__ = 'rk_bs32'
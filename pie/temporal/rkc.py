@@ -0,0 +1,273 @@
+r"""
+`Runge - Kutta - Chebyshev <https://doi.org/10.1016/S0377-0427(97)00219-7>`_ methods, from
+`B.P. Sommeijer, L.F. Shampine, J.G. Verwer - RKC: An explicit solver for parabolic PDEs`
+
+These explicit methods are stabilized for the problems whose jacobian has a spectrum close to the negative real axis,
+such as the diffusion: a step of s stages, built from the Chebyshev polynomials, is stable for
+:math:`h\rho \leq \beta s^2`, with :math:`\rho` the spectral radius of the jacobian. The number of stages is chosen at
+each step from :math:`\rho`, so that the cost of a step only grows as :math:`\sqrt{h\rho}`, instead of :math:`h\rho`
+for the classic explicit methods. Each stage costs a single evaluation of f, and the method only keeps a few vectors,
+without any linear algebra.
+
+The spectral radius is given by ``spectral_radius()``, such as the exact one of the linear spatial methods on uniform
+meshes, or estimated with power iterations on the jacobian, every ``RKC_ESTIMATE_EVERY`` steps.
+The jacobian is then only used through its products with vectors, computed with ``jvp``, ``jac``, or by finite
+differences of f.
+"""
+
+import numpy as np
+
+from .checkpoint import restore, saver
+from .stream import streaming
+from ..linalg.sparse import matvec
+from ..misc.counter import Counter
+
+RKC_ESTIMATE_EVERY = 25
+"""The number of steps between two estimations of the spectral radius with power iterations"""
+
+POWER_MAX_ITER = 50
+"""Maximal number of power iterations"""
+
+POWER_TOL = 1E-2
+"""Relative tolerance on the spectral radius estimated with power iterations"""
+
+POWER_SAFETY = 1.2
+"""Safety factor of the spectral radius estimated with power iterations"""
+
+
+def _chebyshev(s, x):
+    """
+    :param int s:
+    :param float x:
+    :return: (numpy.ndarray, numpy.ndarray, numpy.ndarray) - the values at ``x`` of the Chebyshev polynomials of the
+     first kind :math:`T_j`, and of their first and second derivatives, for j = 0 ... s
+    """
+    t, dt, d2t = np.zeros(s + 1), np.zeros(s + 1), np.zeros(s + 1)
+    t[0], t[1], dt[1] = 1, x, 1
+    for j in range(2, s + 1):
+        t[j] = 2 * x * t[j - 1] - t[j - 2]
+        dt[j] = 2 * t[j - 1] + 2 * x * dt[j - 1] - dt[j - 2]
+        d2t[j] = 4 * dt[j - 1] + 2 * x * d2t[j - 1] - d2t[j - 2]
+    return t, dt, d2t
+
+
+def rkc_coefficients(s, order):
+    r"""
+    The coefficients of the s stages RKC method, such that :math:`Y_0 = y`,
+    :math:`Y_1 = y + \tilde{\mu}_1hf\left(Y_0\right)` and
+
+    .. math::
+       Y_j = \left(1 - \mu_j - \nu_j\right)y + \mu_jY_{j-1} + \nu_jY_{j-2} + \tilde{\mu}_jhf\left(Y_{j-1}\right)
+       + \tilde{\gamma}_jhf\left(Y_0\right)
+
+    the stage :math:`Y_j` approximating the solution at :math:`t + c_jh`, and :math:`Y_s` being the new solution.
+    The damping is :math:`\epsilon = 0.05` for the first order, and :math:`\epsilon = 2/13` for the second order
+
+    :param int s: The number of stages, at least 2
+    :param int order: 1 or 2
+    :return: (numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray) - :math:`\mu`,
+     :math:`\nu`, :math:`\tilde{\mu}`, :math:`\tilde{\gamma}` and :math:`c`, of shape (s + 1,)
+    """
+    w0 = 1 + (0.05 if order == 1 else 2. / 13) / s ** 2
+    t, dt, d2t = _chebyshev(s, w0)
+    mu, nu, mu_tilde, gamma_tilde = np.zeros(s + 1), np.zeros(s + 1), np.zeros(s + 1), np.zeros(s + 1)
+    c = np.ones(s + 1)
+    if order == 1:
+        w1 = t[s] / dt[s]
+        b = 1 / t
+        a = np.zeros(s + 1)
+        c[1:] = w1 * dt[1:] / t[1:]
+    else:
+        w1 = dt[s] / d2t[s]
+        b = np.zeros(s + 1)
+        b[2:] = d2t[2:] / dt[2:] ** 2
+        b[:2] = b[2]
+        a = 1 - b * t
+        c[2:] = w1 * d2t[2:] / dt[2:]
+        c[1] = c[2] / dt[2]
+    c[0] = 0
+    mu_tilde[1] = b[1] * w1
+    for j in range(2, s + 1):
+        mu[j] = 2 * b[j] * w0 / b[j - 1]
+        nu[j] = -b[j] / b[j - 2]
+        mu_tilde[j] = 2 * b[j] * w1 / b[j - 1]
+        gamma_tilde[j] = -a[j - 1] * mu_tilde[j]
+    return mu, nu, mu_tilde, gamma_tilde, c
+
+
+def rkc_stages(h_rho, order):
+    r"""
+    :param float h_rho: The product of the step size with the spectral radius of the jacobian
+    :param int order: 1 or 2
+    :return: int - the number of stages for which the RKC method is stable, from the stability bounds
+     :math:`\beta \simeq 1.93` for the first order and :math:`\beta \simeq 0.65` for the second order
+    """
+    return max(2, 1 + int(np.sqrt((0.52 if order == 1 else 1.54) * h_rho + 1)))
+
+
+class _SpectralRadius(object):
+    """
+    Gives the spectral radius of the jacobian, either with ``spectral_radius``, or estimated with power iterations
+    every ``RKC_ESTIMATE_EVERY`` steps, starting from the last estimated eigenvector
+
+    :param func f: Function with well shaped input and output
+    :param jac: The Jacobian of f
+    :type jac: func or None
+    :param jvp: ``jvp(y, t, v)`` computes the Jacobian of f applied to v
+    :type jvp: func or None
+    :param spectral_radius: ``spectral_radius()`` returns the spectral radius, or a bound of it
+    :type spectral_radius: func or None
+    """
+
+    def __init__(self, f, jac, jvp, spectral_radius):
+        self.f = f
+        self.jac = jac
+        self.jvp = jvp
+        self.spectral_radius = spectral_radius
+        self.rho = None
+        self.v = None
+        self.age = 0
+
+    def _jvp(self, y, t, f_y):
+        if self.jvp is not None:
+            return lambda v: self.jvp(y, t, v)
+        if self.jac is not None:
+            jacobian = self.jac(y, t)
+            return lambda v: matvec(jacobian, v)
+
+        def jvp(v):
+            delta = np.sqrt(np.finfo(float).eps) * (1 + np.linalg.norm(y)) / np.linalg.norm(v)
+            return (self.f(y + delta * v, t) - f_y) / delta
+        return jvp
+
+    def __call__(self, y, t, f_y):
+        """
+        :param numpy.ndarray y:
+        :param float t:
+        :param numpy.ndarray f_y: ``f(y, t)``
+        :return: float - the spectral radius of the jacobian at ``(y, t)``
+        """
+        if self.spectral_radius is not None:
+            if self.rho is None:
+                self.rho = self.spectral_radius()
+            return self.rho
+        if self.rho is not None and self.age < RKC_ESTIMATE_EVERY:
+            self.age += 1
+            return self.rho
+
+        jvp = self._jvp(y, t, f_y)
+        v = np.random.default_rng(0).standard_normal(np.shape(y)) if self.v is None else self.v
+        v, rho = v / np.linalg.norm(v), 0.
+        for _ in range(POWER_MAX_ITER):
+            w = jvp(v)
+            rho_new = np.linalg.norm(w)
+            if rho_new == 0:
+                break
+            v = w / rho_new
+            if abs(rho_new - rho) <= POWER_TOL * rho_new:
+                rho = rho_new
+                break
+            rho = rho_new
+        self.rho, self.v, self.age = POWER_SAFETY * rho, v, 1
+        return self.rho
+
+    def state(self):
+        """
+        :return: dict - the last estimation, from which the estimations continue
+        """
+        return dict(rho=self.rho, v=self.v, age=self.age)
+
+    def restore(self, state):
+        """
+        :param dict state: A state given by ``state``
+        """
+        self.rho, self.v, self.age = state['rho'], state['v'], state['age']
+
+
+def _rkc_i(order, y0, t, f, jac, jvp, spectral_radius, verbose, checkpoint, resume):
+    n = len(t)
+    name = 'rkc_{0}'.format(order)
+    save, resume = saver(checkpoint, name, t), restore(resume, name, t)
+    if verbose is False:
+        count = Counter('', 0)
+    elif verbose is True:
+        count = Counter('RKC{0}'.format(order), n)
+    else:
+        count = Counter(verbose, n)
+    radius = _SpectralRadius(f, jac, jvp, spectral_radius)
+
+    if resume is None:
+        i0, y = 0, np.array(y0, dtype=float)
+    else:
+        i0, y = resume['i'], resume['y']
+        radius.restore(resume['spectral_radius'])
+    coefficients = {}
+    yield y
+    for i in range(i0, n - 1):
+        h = t[i + 1] - t[i]
+        f_0 = f(y, t[i])
+        s = rkc_stages(h * radius(y, t[i], f_0), order)
+        if s not in coefficients:
+            coefficients[s] = rkc_coefficients(s, order)
+        mu, nu, mu_tilde, gamma_tilde, c = coefficients[s]
+
+        y_2, y_1 = y, y + mu_tilde[1] * h * f_0
+        for j in range(2, s + 1):
+            y_2, y_1 = y_1, ((1 - mu[j] - nu[j]) * y + mu[j] * y_1 + nu[j] * y_2
+                             + mu_tilde[j] * h * f(y_1, t[i] + c[j - 1] * h) + gamma_tilde[j] * h * f_0)
+        y = y_1
+        count(i + 1)
+        save(i + 1, lambda: dict(y=y, spectral_radius=radius.state()))
+        yield y
+
+
+@streaming
+def rkc_1(y0, t, f, verbose=True, jac=None, jvp=None, spectral_radius=None, checkpoint=None, resume=None, **_):
+    """
+    First order RKC method, with s stages stable up to :math:`h\\rho \\simeq 1.93 s^2`
+
+    :param array_like y0: Initial value, may be multi-dimensional of size d
+    :param 1D_array t: Array of time steps, of size n
+    :param func f: Function with well shaped input and output
+    :param verbose: If True or a string, displays a progress bar
+    :type verbose: bool or str, optional
+    :param jac: If given, the Jacobian of f, used in the power iterations estimating its spectral radius
+    :type jac: func or None, optional
+    :param jvp: If given, ``jvp(y, t, v)`` must compute the Jacobian of f applied to v, and is used instead of ``jac``
+    :type jvp: func or None, optional
+    :param spectral_radius: If given, ``spectral_radius()`` must return the spectral radius of the jacobian, or a
+     bound of it, which is then used instead of the power iterations
+    :type spectral_radius: func or None, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
+    :return: numpy.ndarray - The solution, of shape (n, d)
+    """
+    return _rkc_i(1, y0, t, f, jac, jvp, spectral_radius, verbose, checkpoint, resume)
+
+
+@streaming
+def rkc_2(y0, t, f, verbose=True, jac=None, jvp=None, spectral_radius=None, checkpoint=None, resume=None, **_):
+    """
+    Second order RKC method, with s stages stable up to :math:`h\\rho \\simeq 0.65 s^2`
+
+    :param array_like y0: Initial value, may be multi-dimensional of size d
+    :param 1D_array t: Array of time steps, of size n
+    :param func f: Function with well shaped input and output
+    :param verbose: If True or a string, displays a progress bar
+    :type verbose: bool or str, optional
+    :param jac: If given, the Jacobian of f, used in the power iterations estimating its spectral radius
+    :type jac: func or None, optional
+    :param jvp: If given, ``jvp(y, t, v)`` must compute the Jacobian of f applied to v, and is used instead of ``jac``
+    :type jvp: func or None, optional
+    :param spectral_radius: If given, ``spectral_radius()`` must return the spectral radius of the jacobian, or a
+     bound of it, which is then used instead of the power iterations
+    :type spectral_radius: func or None, optional
+    :param checkpoint: If given, periodically saves the state of the method
+    :type checkpoint: pie.temporal.checkpoint.Checkpoint or None, optional
+    :param resume: If given, the state loaded from a checkpoint, from which the method continues
+    :type resume: dict or None, optional
+    :return: numpy.ndarray - The solution, of shape (n, d)
+    """
+    return _rkc_i(2, y0, t, f, jac, jvp, spectral_radius, verbose, checkpoint, resume)
@@ -0,0 +1,108 @@
+r"""
+The temporal methods are written as generators, yielding the solution at each time of ``t`` while only keeping the
+current state in memory, along with the history window needed by the multistep methods.
+
+The temporal method itself collects the whole solution, of shape (n, d), whereas :func:`iter_solve` streams it,
+so that long integrations run in constant memory:
+
+   >>> for t_i, y_i in iter_solve(pie.temporal.rk_4, y0, t, f, save_every=100):
+   ...     process(t_i, y_i)  # Only the solution every 100 time steps is seen
+   >>>
+"""
+
+import functools
+
+import numpy as np
+
+
+def _start(kwargs):
+    """
+    :param dict kwargs: The keyword arguments of a temporal method
+    :return: int - the index of the first time yielded by the temporal method, which is not zero when resuming
+    """
+    resume = kwargs.get('resume')
+    return 0 if resume is None else resume['i']
+
+
+def streaming(steps):
+    """
+    Decorator making a temporal method from a generator function, which has the same signature and yields the
+    solution at each time of ``t``. The generator function is kept as the ``steps`` attribute of the temporal method.
+    When resuming from a checkpoint, the solution before the checkpoint is left to zero
+
+    :param func steps: The generator function
+    :return: func - the temporal method, returning the solution of shape (n, d)
+    """
+
+    @functools.wraps(steps)
+    def temporal_method(y0, t, f, *args, **kwargs):
+        y = None
+        for i, y_i in enumerate(steps(y0, t, f, *args, **kwargs), _start(kwargs)):
+            if y is None:
+                y = np.zeros((len(t),) + np.shape(y_i))
+            y[i] = y_i
+        return y
+
+    temporal_method.steps = steps
+    return temporal_method
+
+
+def iter_solve(method, y0, t, f, save_every=1, t_out=None, **kwargs):
+    """
+    Lazily solves the equation with a temporal method, keeping only its current state in memory
+
+    :param func method: A temporal method made by :func:`streaming`
+    :param array_like y0: Initial value, may be multi-dimensional of size d
+    :param 1D_array t: Array of time steps, of size n
+    :param func f: Function with well shaped input and output
+    :param save_every: Only yields the solution every ``save_every`` time steps, and at the last time
+    :type save_every: int, optional
+    :param t_out: If given, only yields the solution at these times, which must be times of ``t``
+    :type t_out: 1D_array or None, optional
+    :param kwargs: The keyword arguments of the temporal method
+    :return: generator - yielding the tuples ``(t_i, y_i)``
+    """
+    n = len(t)
+    if t_out is None:
+        def is_output(k): return k % save_every == 0 or k == n - 1
+    else:
+        t_out = np.atleast_1d(t_out)
+        index = np.clip(np.searchsorted(t, t_out), 1, n - 1)
+        index -= t_out - t[index - 1] < t[index] - t_out
+        if np.any(abs(t[index] - t_out) > 1E-10 * abs(t[-1] - t[0])):
+            raise ValueError('The output times must be times of t')
+        index = set(index)
+
+        def is_output(k): return k in index
+    for i, y_i in enumerate(method.steps(y0, t, f, **kwargs), _start(kwargs)):
+        if is_output(i):
+            yield t[i], y_i
+
+
+def solve_into(out, method, y0, t, f, save_every=1, t_out=None, **kwargs):
+    """
+    Solves the equation with a temporal method, writing the solution as it is computed
+
+    :param out: Where to write the solution, either an object with a ``write(t_i, y_i)`` method, such as a
+     ``pie.misc.store.SolutionWriter``, or an array of shape (n_out, d), such as a ``numpy.memmap``, which is then
+     flushed at the end
+    :type out: pie.misc.store.SolutionWriter or numpy.ndarray
+    :param func method: A temporal method made by :func:`streaming`
+    :param array_like y0: Initial value, may be multi-dimensional of size d
+    :param 1D_array t: Array of time steps, of size n
+    :param func f: Function with well shaped input and output
+    :param save_every: Only writes the solution every ``save_every`` time steps, and at the last time
+    :type save_every: int, optional
+    :param t_out: If given, only writes the solution at these times, which must be times of ``t``
+    :type t_out: 1D_array or None, optional
+    :param kwargs: The keyword arguments of the temporal method
+    :return: ``out``
+    """
+    for k, (t_i, y_i) in enumerate(iter_solve(method, y0, t, f, save_every, t_out, **kwargs)):
+        if hasattr(out, 'write'):
+            out.write(t_i, y_i)
+        else:
+            out[k] = y_i
+    if hasattr(out, 'flush'):
+        out.flush()
+    return out
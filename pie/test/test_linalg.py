@@ -0,0 +1,50 @@
+r"""
+This module is used to test the methods implemented in the ``linalg`` module.
+"""
+
+from __future__ import print_function
+
+import numpy as np
+import scipy.linalg
+import scipy.sparse.linalg
+
+from pie.linalg.krylov import expm_krylov_adaptive
+from pie.linalg.phi import phi_action
+
+
+def test_expm_krylov(d, lambda_min, lambda_max, tol, seed=0):
+    r"""
+    Test ``expm_krylov_adaptive`` and the adaptive Krylov ``phi_action`` on the stiff matrix
+    :math:`-\mathrm{diag}(\lambda_{min}, \dots, \lambda_{max}) + \mathcal{N}(0, 1)`, against ``scipy.linalg.expm``,
+    and print the error relatively to the input vector.
+
+    :param int d: The dimension
+    :param float lambda_min: The smallest eigenvalue magnitude of the diagonal part
+    :param float lambda_max: The largest eigenvalue magnitude of the diagonal part
+    :param float tol: The relative tolerance of the Krylov methods
+    :param seed: The seed of the random matrix and vectors
+    :type seed: int, optional
+    """
+    rng = np.random.RandomState(seed)
+    a = -np.diag(np.linspace(lambda_min, lambda_max, d)) + rng.randn(d, d)
+    b = rng.randn(d)
+    expected = scipy.linalg.expm(a).dot(b)
+
+    for name, matrix in (('dense', a), ('sparse', scipy.sparse.csr_matrix(a)),
+                         ('matrix-free', scipy.sparse.linalg.aslinearoperator(a))):
+        error = np.linalg.norm(expm_krylov_adaptive(matrix, b, tol) - expected) / np.linalg.norm(b)
+        print('Error on expm_krylov_adaptive ({0}) :\t {1:0.1E} for a tolerance of {2:0.1E}'.format(name, error, tol))
+        assert error <= 10 * tol
+
+    w = rng.randn(3, d)
+    for h in (0.1, 1.):
+        expected = phi_action(a, h, w)
+        error = np.linalg.norm(phi_action(a, h, w, krylov_tol=tol) - expected) / np.linalg.norm(w)
+        print('Error on phi_action (h = {0}) :\t {1:0.1E} for a tolerance of {2:0.1E}'.format(h, error, tol))
+        assert error <= 10 * tol
+    print()
+
+
+if __name__ == '__main__':
+    test_expm_krylov(d=60, lambda_min=10, lambda_max=600, tol=1E-12)
+    test_expm_krylov(d=200, lambda_min=1, lambda_max=1E4, tol=1E-8)
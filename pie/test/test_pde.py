@@ -5,7 +5,7 @@ import pie.plot
 
 
 def solve(n, x_max, p, conv, diff, dt, t_max, init_cond_function, spatial_method, temporal_method,
-          krylov_subspace_dim=None):
+          krylov_subspace_dim=None, store=None, save_every=1):
     """
     Solve a 1D-PDE
 
@@ -22,9 +22,14 @@ def solve(n, x_max, p, conv, diff, dt, t_max, init_cond_function, spatial_method
     :param pie.temporal._temporal_method temporal_method:
     :param krylov_subspace_dim: If given and the temporal method is exponential, uses the Krylov approximation
     :type krylov_subspace_dim: None or int, optional
-
-    :return: (pie.spatial._SpatialMethod, numpy.ndarray, numpy.ndarray)
-     - the spatial method, the time array and the solution for each computed time
+    :param store: If given, the solution is written in a chunked store at this path, along with its metadata,
+     and read lazily
+    :type store: None or str, optional
+    :param save_every: With ``store``, only stores the solution every ``save_every`` time steps, and at the last time
+    :type save_every: int, optional
+
+    :return: (pie.spatial._SpatialMethod, numpy.ndarray, numpy.ndarray or pie.misc.store.SolutionStore)
+     - the spatial method, the time array and the solution for each computed or stored time
     """
 
     # Spatial
@@ -46,11 +51,19 @@ def solve(n, x_max, p, conv, diff, dt, t_max, init_cond_function, spatial_method
     t = np.append(np.arange(0, t_max, dt), t_max)
 
     # Solving
-    y = temporal_method(y0, t, method.rhs, jac=method.jac, hess=method.hess, krylov_subspace_dim=krylov_subspace_dim,
-                        verbose='{0} + {1} at CFL = {2:0.3f}'
-                        .format(temporal_method.__name__, spatial_method.__name__, cfl))
+    kwargs = dict(jac=method.jac, hess=method.hess, hess_vec=method.hess_vec, jac_phi=method.jac_phi,
+                  jac_solve=method.jac_solve, krylov_subspace_dim=krylov_subspace_dim, jvp=method.jvp,
+                  preconditioner=method.preconditioner, rhs_stiff=method.rhs_stiff, rhs_nonstiff=method.rhs_nonstiff,
+                  stiff_solver=method.stiff_solver, spectral_radius=method.spectral_radius,
+                  verbose='{0} + {1} at CFL = {2:0.3f}'.format(temporal_method.__name__, spatial_method.__name__, cfl))
+    if store is None:
+        return method, t, temporal_method(y0, t, method.rhs, **kwargs)
 
-    return method, t, y
+    with pie.misc.store.SolutionWriter(store, method=temporal_method.__name__, spatial_method=spatial_method.__name__,
+                                       dt=dt, mesh=mesh, p=p, conv=conv, diff=diff, cfl=cfl, x=x) as writer:
+        pie.temporal.stream.solve_into(writer, temporal_method, y0, t, method.rhs, save_every=save_every, **kwargs)
+    y = pie.misc.store.SolutionStore(store)
+    return method, y.t, y
 
 
 def compare(n, x_max, p, conv, diff, dt, t_max, title='', krylov_subspace_dim=None, repeat=True, speed=1):
@@ -160,6 +173,7 @@ TEMPORAL_METHODS = (
     pie.temporal.rk_1,
     # pie.temporal.rk_2,
     # pie.temporal.rk_4,
+    # pie.temporal.rkc_2,
     pie.temporal.bdf_1,
     # pie.temporal.bdf_2,
     # pie.temporal.bdf_4,
@@ -169,6 +183,8 @@ TEMPORAL_METHODS = (
     pie.temporal.rosen_exp_1,
     # pie.temporal.rosen_exp_2,
     # pie.temporal.rosen_exp_3,
+    # pie.temporal.imex_rk_2,  # Burgers only
+    # pie.temporal.sbdf_2,  # Burgers only
 )
 """The temporal methods that are going to be tested"""
 
@@ -185,6 +201,9 @@ SPATIAL_METHODS_BURGERS = (
 """The Burgers spatial methods that are going to be tested in ``compare_burgers``"""
 
 if __name__ == '__main__':
+    # Storing the assembled spatial operators, so that they are only built once for all the temporal methods
+    # pie.spatial.cache.CACHE_DIR = 'pie_cache'
+
     # Difference FD - SD
     compare(n=50, x_max=1, p=2, conv=2, diff=0, dt=1E-3, t_max=1,
             speed=25, repeat=False, krylov_subspace_dim=None, title='FD vs SD')
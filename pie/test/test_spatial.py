@@ -8,6 +8,7 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 import pie
+from pie.linalg.sparse import to_dense
 
 
 def test_rhs(n, x_max, p, conv, diff, plot=False):
@@ -41,19 +42,23 @@ def test_rhs(n, x_max, p, conv, diff, plot=False):
     ax2.plot(x, rhs_expected_burgers, 'k--', lw=3, label='Expected RHS')
 
     for spatial_method in (pie.spatial.FiniteDifferenceMethod,
-                           pie.spatial.SpectralDifferenceMethod):
+                           pie.spatial.SpectralDifferenceMethod,
+                           pie.spatial.FourierMethod):
         method = spatial_method(mesh, p, conv=conv, diff=diff)
-        rhs = method.rhs(y0, 0)
-        err = abs(rhs_expected - rhs)
+        x = method.x
+        rhs = method.rhs(np.sin(k * x), 0)
+        err = abs(-conv * k * np.cos(k * x) - diff * k * k * np.sin(k * x) - rhs)
         print('Error on {0}.rhs :\t {1:0.1E} (mean), {2:0.1E} (max)'
               .format(method.__class__.__name__, np.mean(err), np.max(err)))
         ax1.plot(x, rhs, '--', label=method.__class__.__name__)
 
     for spatial_method in (pie.spatial.burgers.FiniteDifferenceMethodBurgers,
-                           pie.spatial.burgers.SpectralDifferenceMethodBurgers):
+                           pie.spatial.burgers.SpectralDifferenceMethodBurgers,
+                           pie.spatial.burgers.FourierMethodBurgers):
         method = spatial_method(mesh, p, diff=diff)
-        rhs = method.rhs(y0, 0)
-        err = abs(rhs_expected_burgers - rhs)
+        x = method.x
+        rhs = method.rhs(np.sin(k * x), 0)
+        err = abs(-np.sin(k * x) * k * np.cos(k * x) - diff * k * k * np.sin(k * x) - rhs)
         print('Error on {0}.rhs :\t {1:0.1E} (mean), {2:0.1E} (max)'
               .format(method.__class__.__name__, np.mean(err), np.max(err)))
         ax2.plot(x, rhs, '--', label=method.__class__.__name__)
@@ -85,8 +90,10 @@ def test_jac(n, x_max, p, conv, diff, eps=1E-5):
 
     for spatial_method in (pie.spatial.FiniteDifferenceMethod,
                            pie.spatial.SpectralDifferenceMethod,
+                           pie.spatial.FourierMethod,
                            pie.spatial.burgers.FiniteDifferenceMethodBurgers,
-                           pie.spatial.burgers.SpectralDifferenceMethodBurgers):
+                           pie.spatial.burgers.SpectralDifferenceMethodBurgers,
+                           pie.spatial.burgers.FourierMethodBurgers):
         try:
             method = spatial_method(mesh, p, conv=conv, diff=diff)
         except TypeError:
@@ -94,7 +101,7 @@ def test_jac(n, x_max, p, conv, diff, eps=1E-5):
 
         y0 = np.sin(method.x * 2 * np.pi / x_max)
 
-        jac = method.jac(y0, 0)
+        jac = to_dense(method.jac(y0, 0))
         jac_expected = np.zeros(jac.shape)
         for j in range(n * p):
             e_j = np.zeros(n * p)
@@ -108,7 +115,7 @@ def test_jac(n, x_max, p, conv, diff, eps=1E-5):
 
 def test_hess(n, x_max, p, conv, diff, eps=1E-5):
     r"""
-    Test the hess methods of the spatial methods on a sine input and print the error.
+    Test the hess and hess_vec methods of the spatial methods on a sine input and print the error.
     Uses an order 1 approximation of the hessian as a reference value :
     :math:`\frac{\partial^2 f}{\partial x^2}\left(x_0\right)
     \approx\frac{f\left(x_0+\varepsilon\right) - 2f\left(x_0\right) + f\left(x_0-\varepsilon\right)}{\varepsilon^2}`
@@ -125,8 +132,10 @@ def test_hess(n, x_max, p, conv, diff, eps=1E-5):
 
     for spatial_method in (pie.spatial.FiniteDifferenceMethod,
                            pie.spatial.SpectralDifferenceMethod,
+                           pie.spatial.FourierMethod,
                            pie.spatial.burgers.FiniteDifferenceMethodBurgers,
-                           pie.spatial.burgers.SpectralDifferenceMethodBurgers):
+                           pie.spatial.burgers.SpectralDifferenceMethodBurgers,
+                           pie.spatial.burgers.FourierMethodBurgers):
         try:
             method = spatial_method(mesh, p, conv=conv, diff=diff)
         except TypeError:
@@ -148,6 +157,11 @@ def test_hess(n, x_max, p, conv, diff, eps=1E-5):
         err = abs(hess_expected - hess)
         print('Difference between {0}.hess and order 1 approximation :\t {1:0.1E} (mean), {2:0.1E} (max)'
               .format(spatial_method.__name__, np.mean(err), np.max(err)))
+
+        u, v = np.cos(method.x * 2 * np.pi / x_max), np.sin(method.x * 4 * np.pi / x_max)
+        err = abs(np.dot(np.dot(hess_expected, v), u) - method.hess_vec(y0, 0, u, v))
+        print('Difference between {0}.hess_vec and order 1 approximation :\t {1:0.1E} (mean), {2:0.1E} (max)'
+              .format(spatial_method.__name__, np.mean(err), np.max(err)))
     print()
 
 